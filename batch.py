@@ -0,0 +1,103 @@
+from dicomparser.batch import iter_input_files, run_batch
+from dicomparser.hvf import run_hvf_batch
+from dicomparser.shard import parse_shard, shard_files, shard_name, write_shard_summary
+import argparse
+import os
+
+
+def parse_args():
+    """Parse command line arguments for a batch run over many files."""
+    parser = argparse.ArgumentParser(description='Parse and preview many DICOM files.')
+
+    parser.add_argument('--input_folder', '-i', default=None,
+                        help='Folder to walk recursively for input files')
+    parser.add_argument('--input_list', '-l', default=None,
+                        help='Text file with one input path per line')
+    parser.add_argument('--archives', '-a', action='store_true',
+                        help='Read the members of zip/tar files found in the inputs, without extracting them')
+    parser.add_argument('--output_folder', '-o', default=None,
+                        help='Path to the preview output folder (omit to only parse)')
+    parser.add_argument('--manifest', '-m', default=None,
+                        help='Prefix of a rotating .jsonl manifest with one record per file')
+    parser.add_argument('--manifest_gzip', action='store_true',
+                        help='Write the manifest as .jsonl.gz')
+    parser.add_argument('--columnar', '-c', default=None,
+                        help='Folder for Parquet (or CSV without pyarrow) metadata tables')
+    parser.add_argument('--dedup', choices=['uid', 'hash'], default=None,
+                        help='Process each SOPInstanceUID once (uid), or once per UID and Pixel Data/PDF hash (hash)')
+    parser.add_argument('--aliases', default=None,
+                        help='Path to write skipped duplicates as JSON {processed file: [copies]}')
+    parser.add_argument('--write_dicom_header', choices=['text', 'json'], default=None,
+                        help='Also write each whole header as text or as the DICOM JSON model (bulk values referenced, not written)')
+    parser.add_argument('--shard', default=None,
+                        help='Only process shard i/N (0 <= i < N) of the inputs, outputs get a shard-i-of-N suffix')
+    parser.add_argument('--shard_by', choices=['path', 'study'], default='path',
+                        help='Shard by file path, or by StudyInstanceUID to keep studies together')
+    parser.add_argument('--hvf', action='store_true',
+                        help='Only extract HVF objects from visual field files, in parallel')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='Number of worker processes (default: one process, or CPU count with --timeout/--hvf)')
+    parser.add_argument('--timeout', '-t', type=float, default=None,
+                        help='Seconds a file may take before its worker is killed and replaced')
+    parser.add_argument('--quarantine', '-q', default=None,
+                        help='JSON Lines file to append failed/timed out files to, with the error and stage')
+    parser.add_argument('--private_arrays', action='store_true',
+                        help='Also write decoded vendor arrays (thickness maps, cube layers) to {SOP Instance}.npz')
+    parser.add_argument('--study_index', default=None,
+                        help='SQLite file indexing every instance by SOP Instance, Study and Frame of Reference UID')
+    parser.add_argument('--bundles', default=None,
+                        help='Folder to write one {Study Instance}.json bundle per study to, references resolved')
+
+    args = parser.parse_args()
+    if not args.input_folder and not args.input_list:
+        parser.error('one of --input_folder or --input_list is required')
+    if args.shard:
+        try:
+            args.shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+def main():
+    args = parse_args()
+    files = iter_input_files(args.input_folder, args.input_list, archives=args.archives)
+    manifest = args.manifest
+    if args.shard:
+        # Every node walks the same inputs and keeps its own part, outputs are suffixed per shard
+        index, count = args.shard
+        suffix = shard_name(index, count)
+        files = shard_files(files, index, count, by=args.shard_by)
+        if args.columnar:
+            args.columnar = os.path.join(args.columnar, suffix)
+        if args.aliases:
+            base, extension = os.path.splitext(args.aliases)
+            args.aliases = f"{base}-{suffix}{extension}"
+        if args.quarantine:
+            base, extension = os.path.splitext(args.quarantine)
+            args.quarantine = f"{base}-{suffix}{extension}"
+        if args.manifest:
+            manifest = f"{args.manifest}-{suffix}"
+        if args.study_index:
+            base, extension = os.path.splitext(args.study_index)
+            args.study_index = f"{base}-{suffix}{extension}"
+        if args.bundles:
+            # Complete per node with --shard_by study
+            args.bundles = os.path.join(args.bundles, suffix)
+    if args.hvf:
+        summary = run_hvf_batch(files, output_folder=args.output_folder, manifest=manifest, workers=args.workers)
+        print(f"Done: {summary['done']} visual fields, {summary['skipped']} other files, {summary['failed']} failed")
+    else:
+        summary = run_batch(files, output_folder=args.output_folder,
+                            manifest=manifest, manifest_gzip=args.manifest_gzip,
+                            columnar=args.columnar, dedup=args.dedup, aliases=args.aliases,
+                            write_dicom_header={'text': True, 'json': 'json'}.get(args.write_dicom_header, False),
+                            workers=args.workers, timeout=args.timeout, quarantine=args.quarantine,
+                            study_index=args.study_index, bundles=args.bundles,
+                            private_arrays=args.private_arrays)
+        print(f"Done: {summary['done']} parsed, {summary['failed']} failed, {summary['duplicates']} duplicates skipped")
+    if args.shard and args.manifest:
+        # Picked up by merge_shards.py
+        write_shard_summary(args.manifest, index, count, summary)
+
+if __name__ == "__main__":
+    main()
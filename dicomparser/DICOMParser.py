@@ -5,9 +5,8 @@ import base64
 import json
 import numpy as np
 import matplotlib.pyplot as plt
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 
-from pydicom import dcmread
 from pydicom.uid import UID
 from pydicom.uid import UID_dictionary
 from pathlib import Path
@@ -20,7 +19,15 @@ from hvf_extraction_script.utilities.file_utils import File_Utils
 import pymupdf  # PyMuPDF
 from PIL import Image
 
-from oct_converter.readers import Dicom
+from oct_converter.image_types import OCTVolumeWithMetaData
+
+from dicomparser.archive import dcmread_input, is_in_memory
+from dicomparser.deferred import array_summary, dcmread_header
+from dicomparser.private import biometry_record, save_arrays, slice_stacks, tag_key, thickness_maps
+from dicomparser.decode import decode_pixel_array, select_decoder
+from dicomparser.normalize import to_8bit
+from dicomparser.header import write_header_text, write_header_json
+from dicomparser.results import result_from_metadata
 
 
 OPHTHALMOLOGY_SOP_CLASSES = {
@@ -51,14 +58,80 @@ OPHTHALMOLOGY_SOP_CLASSES = {
     ""
 }
 
+# Read for every file, enough to fill extract_common_metadata()
+COMMON_TAGS = ["Manufacturer", "PatientID", "ManufacturerModelName", "Modality", "StudyDate",
+               "SOPClassUID", "SOPInstanceUID", "SeriesDescription"]
+# Read to place an instance in its study (see instance_links() and dicomparser.study)
+LINK_TAGS = ["StudyInstanceUID", "SeriesInstanceUID", "FrameOfReferenceUID"]
+# Sequences whose items (at any depth) name other instances by ReferencedSOPInstanceUID
+REFERENCE_SEQUENCES = ["ReferencedInstanceSequence", "ReferencedImageSequence", "ReferencedSeriesSequence",
+                       "SourceImageSequence", "StudiesContainingOtherReferencedInstancesSequence"]
+# Read to pick the parser class and handler without touching bulk data
+ROUTING_TAGS = ["ManufacturerModelName", "SOPClassUID", "SeriesDescription"]
+# Image Pixel module, needed by any handler that decodes pixel_array
+PIXEL_TAGS = ["SamplesPerPixel", "PhotometricInterpretation", "PlanarConfiguration", "NumberOfFrames",
+              "Rows", "Columns", "BitsAllocated", "BitsStored", "HighBit", "PixelRepresentation",
+              "ExtendedOffsetTable", "ExtendedOffsetTableLengths", "PixelData",
+              # Display window for N-bit data
+              "RescaleSlope", "RescaleIntercept", "WindowCenter", "WindowWidth", "VOILUTSequence"]
+# 'Encapsulated PDF Storage'
+PDF_TAGS = [(0x0042, 0x0011)]
+
+def to_pil(image):
+    """PIL image from an as_array mode ndarray (or a PIL image, unchanged)."""
+    return Image.fromarray(image) if isinstance(image, np.ndarray) else image
+
+
+def iter_bscan_images(bscan_images):
+    """(name, PIL image) for {'bscan1': image, ...} or a (frames, rows, columns) volume."""
+    if isinstance(bscan_images, np.ndarray):
+        for i in range(bscan_images.shape[0]):
+            yield f"bscan{i+1}", Image.fromarray(bscan_images[i])
+    else:
+        yield from bscan_images.items()
+
+
+# One entry of a parser's handler table.
+#   parse/preview: method names called with (metadata) and (output_path, metadata)
+#   tags: top level tags the handler reads, None for the whole header
+#   pixel_data: whether the handler decodes pixel_array
+Handler = namedtuple('Handler', ['parse', 'preview', 'tags', 'pixel_data'], defaults=(None, None, None, False))
+
+
 class DICOMParser:
-    """Base class for parsing DICOM files with a built-in factory method."""
+    """Base class for parsing DICOM files with a built-in factory method.
+
+    Subclasses register per ManufacturerModelName and describe what they do for each
+    (SOP Class, Series Description) in a `handlers` table. A Series Description of
+    None matches any series, a (None, None) key matches any SOP class.
+    """
     
     model_parsers = {}
-
-    def __init__(self, dicom_path):
-        self.dicom_path = Path(dicom_path)
-        self.ds = dcmread(self.dicom_path)
+    # Set by parse(as_array=..., private_arrays=...)
+    as_array = False
+    private_arrays = False
+    # Threads for compressed multi-frame Pixel Data, None for one per CPU
+    decode_workers = None
+    _pixel_array = None
+    # Plugin that decoded the Pixel Data, reported by parse() as 'Pixel Decoder'
+    pixel_decoder = None
+    # create_parser leaves values larger than this (bytes) in the file until a handler
+    # touches them, None reads everything. Not for handlers that decode Pixel Data
+    defer_size = 16 * 1024
+    # Unregistered models only get the common metadata
+    handlers = {
+        (None, None): Handler(None, '_preview_json', tags=[]),
+    }
+    # Add "Series Description" right after the common metadata
+    include_series_description = False
+
+    def __init__(self, dicom_path, ds=None, partial=False):
+        # A path, an archive member, bytes or a seekable binary file object
+        self.source = dicom_path
+        self.dicom_path = None if is_in_memory(dicom_path) else Path(dicom_path)
+        # create_parser hands over the dataset it already read (possibly a subset of the tags)
+        self.ds = ds if ds is not None else dcmread_input(dicom_path)
+        self.partial = ds is not None and partial
         self.manufacturer = self.ds.get("Manufacturer", "Unknown")
         self.patient_id = self.ds.get("PatientID", "Unknown")
         self.model = self.ds.get("ManufacturerModelName", "Unknown")
@@ -66,36 +139,78 @@ class DICOMParser:
         self.study_date = self.ds.get("StudyDate", "Unknown")
         self.sop_class = self.ds.get("SOPClassUID", "Unknown")
         self.sop_instance = self.ds.get("SOPInstanceUID", "Unknown")
+        self.series_description = self.ds.get("SeriesDescription", "Unknown")
+        self.handler = self.find_handler(self.sop_class, self.series_description)
 
     @classmethod
     def register_parser(cls, model_name, parser_class):
         cls.model_parsers[model_name] = parser_class
 
     @classmethod
-    def create_parser(cls, dicom_path):
-        ds = dcmread(dicom_path)
-        model = ds.get("ManufacturerModelName", "Unknown")
+    def find_handler(cls, sop_class, series_description):
+        """Look up the handler for a file, most specific key first."""
+        for key in ((sop_class, series_description), (sop_class, None), (None, None)):
+            handler = cls.handlers.get(key)
+            if handler is not None:
+                return handler
+        return None
+
+    @classmethod
+    def route(cls, model, sop_class, series_description):
+        """(ManufacturerModelName, SOPClassUID, SeriesDescription) -> (parser class, handler)."""
         parser_class = cls.model_parsers.get(model, cls)
-        return parser_class(dicom_path)
+        return parser_class, parser_class.find_handler(sop_class, series_description)
+
+    @staticmethod
+    def read_dataset(dicom_path, handler=None, defer_size=None):
+        """Read only what the handler needs: its declared tags, and pixel data only if it decodes it.
+
+        Without pixel data, values over defer_size bytes (nested ones too) stay on disk
+        until touched, so a handler reporting a few scalars never reads the private payloads.
+        """
+        if handler is None:
+            return dcmread_header(dicom_path, defer_size)
+        tags = None
+        if handler.tags is not None:
+            tags = COMMON_TAGS + LINK_TAGS + REFERENCE_SEQUENCES + list(handler.tags) \
+                + (PIXEL_TAGS if handler.pixel_data else [])
+        if not handler.pixel_data:
+            return dcmread_header(dicom_path, defer_size, specific_tags=tags)
+        return dcmread_input(dicom_path, specific_tags=tags)
+
+    @classmethod
+    def create_parser(cls, dicom_path, read_subset=True):
+        # Header only read to route, then read what the handler declared (or everything).
+        # dicom_path can also be an archive member ('bundle.zip!dir/file.dcm'), bytes
+        # or a seekable binary file object, nothing is written to disk for those
+        header = dcmread_header(dicom_path, cls.defer_size, specific_tags=ROUTING_TAGS)
+        parser_class, handler = cls.route(header.get("ManufacturerModelName", "Unknown"),
+                                          header.get("SOPClassUID", "Unknown"),
+                                          header.get("SeriesDescription", "Unknown"))
+        if not read_subset:
+            return parser_class(dicom_path)
+        ds = cls.read_dataset(dicom_path, handler, parser_class.defer_size)
+        return parser_class(dicom_path, ds=ds, partial=True)
     
     # Common PDF Parser and Previewer to be replaced if not enough
     def _parse_pdf_pages(self):
         # 'Encapsulated PDF Storage'
         pdf_binary = self.ds.get((0x0042, 0x0011)).value
-        pdf_document = pymupdf.open('pdf', pdf_binary)
         png_pages = {}
-        for page_number in range(pdf_document.page_count):
-            page = pdf_document[page_number]
-            pixmap = page.get_pixmap()
-            # print(page.get_text())
-            image = Image.frombytes("RGB", [pixmap.width, pixmap.height], pixmap.samples)
-            buffered = BytesIO()
-            image.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
-            png_pages[f'page_{page_number + 1}'] = {
-                f'page_html_img_base64':f"data:image/png;base64,{img_str}",
-                f'page_PIL':image
-            }
+        # Closed as soon as the pages are rendered, the PIL pages don't reference it
+        with pymupdf.open('pdf', pdf_binary) as pdf_document:
+            for page_number in range(pdf_document.page_count):
+                page = pdf_document[page_number]
+                pixmap = page.get_pixmap()
+                # print(page.get_text())
+                image = Image.frombytes("RGB", [pixmap.width, pixmap.height], pixmap.samples)
+                buffered = BytesIO()
+                image.save(buffered, format="PNG")
+                img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
+                png_pages[f'page_{page_number + 1}'] = {
+                    f'page_html_img_base64':f"data:image/png;base64,{img_str}",
+                    f'page_PIL':image
+                }
         return png_pages
 
     def _preview_pdf_pages(self, output_path, metadata):
@@ -104,21 +219,95 @@ class DICOMParser:
         for page in metadata['png_pages'].keys():
             metadata['png_pages'][page]['page_PIL'].save(os.path.join(sop_path, f"{page}.png"))   
 
+    def _write_detailed_dicom_header_to_file(self, output_path, header_format='text', bulk_threshold=1024):
+        """Dump the whole header to {SOP Instance}.txt, or {SOP Instance}.dcm.json as the DICOM JSON model.
+
+        Written element by element. Values over bulk_threshold bytes are summarized (text)
+        or become BulkDataURIs (json), and are left on disk when the file is re-read.
+        """
+        # A subset read would leave tags out of the dump, re-read it without loading bulk values,
+        # nested ones included, so sequences are walked but their payloads stay on disk
+        ds = dcmread_header(self.source, bulk_threshold, stop_before_pixels=False) if self.partial else self.ds
+        if header_format == 'json':
+            with open(os.path.join(output_path, f"{self.sop_instance}.dcm.json"), "w", encoding='utf-8') as file:
+                # In-memory inputs have no location, refer to the instance itself
+                source_uri = self.dicom_path.resolve().as_uri() if self.dicom_path else f"urn:oid:{self.sop_instance}"
+                write_header_json(ds, file, source_uri, bulk_threshold)
+        else:
+            with open(os.path.join(output_path, f"{self.sop_instance}.txt"), "w", encoding='utf-8') as file:
+                write_header_text(ds, file)
+
+
+    def parse(self, keep_pixel_data=True, as_array=False, private_arrays=False, **options):
+        """keep_pixel_data=False drops Pixel Data / PDF bytes (and decoded arrays) from the parser once parsed.
+
+        as_array=True leaves images as numpy arrays: 'image_PIL' holds the pixel array and
+        'bscan_images' the whole (frames, rows, columns) volume, no PIL copies. Previews
+        convert to PIL one image at a time when saving. private_arrays=True also decodes
+        the vendor arrays that are otherwise only summarized, into 'private_arrays'.
+        """
+        self.as_array = as_array
+        self.private_arrays = private_arrays
+        metadata = self.extract_common_metadata()
+        if self.include_series_description:
+            # Series Description
+            metadata["Series Description"] = self.series_description
+        if self.handler is not None and self.handler.parse is not None:
+            getattr(self, self.handler.parse)(metadata, **options)
+        if self.pixel_decoder:
+            metadata["Pixel Decoder"] = self.pixel_decoder
+        if not keep_pixel_data:
+            self.release_pixel_data()
+        return metadata
 
-    def _write_detailed_dicom_header_to_file(self, output_path):
-        with open(os.path.join(output_path, f"{self.sop_instance}.txt"), "w", encoding='utf-8') as file:
-            file.write(str(self.ds))
-
-
-    def parse(self):
-        raise NotImplementedError("This should be implemented in a subclass.")
+    def parse_result(self, as_array=True, private_arrays=True, **options):
+        """parse() as a compact typed result (PhotoResult, VolumeResult, ...) with numpy image data."""
+        return result_from_metadata(self.parse(as_array=as_array, private_arrays=private_arrays, **options))
 
-    def preview(self, output_path):
-        metadata = self.extract_common_metadata()
-        with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
-            file.write(json.dumps(metadata, indent=4))
+    def preview(self, output_path, write_dicom_header=False, keep_pixel_data=True, as_array=False,
+                private_arrays=False, **options):
+        # write_dicom_header=True for the text dump, 'json' for the DICOM JSON model.
+        # private_arrays (parse only) are written by the JSON preview to {SOP Instance}.npz
+        if write_dicom_header:
+            self._write_detailed_dicom_header_to_file(output_path, 'json' if write_dicom_header == 'json' else 'text')
+        metadata = self.parse(keep_pixel_data=keep_pixel_data, as_array=as_array, private_arrays=private_arrays,
+                              **options)
+        self.write_preview(output_path, metadata, **options)
         return metadata
 
+    def write_preview(self, output_path, metadata, **options):
+        """Write the preview files for metadata already returned by parse()."""
+        if self.handler is not None and self.handler.preview is not None:
+            getattr(self, self.handler.preview)(output_path, metadata, **options)
+
+    def release_pixel_data(self):
+        """Drop bulk values and anything decoded from them, the rest of the header stays usable."""
+        self._pixel_array = None
+        if self.ds is not None:
+            # Deleting Pixel Data also clears pydicom's cached pixel_array
+            for tag in ((0x7FE0, 0x0010), (0x0042, 0x0011)):
+                if tag in self.ds:
+                    del self.ds[tag]
+
+    def get_pixel_array(self):
+        """Decoded Pixel Data, decoded once. Compressed multi-frame data is decoded frame by frame in parallel."""
+        if self._pixel_array is None:
+            self.pixel_decoder = select_decoder(self.ds)
+            self._pixel_array = decode_pixel_array(self.ds, workers=self.decode_workers,
+                                                   decoding_plugin=self.pixel_decoder)
+        return self._pixel_array
+
+    def close(self):
+        """Release the dataset and everything decoded from it. Metadata already returned is kept."""
+        self.release_pixel_data()
+        self.ds = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def extract_common_metadata(self):
         """Extract metadata that applies to all DICOMs."""
         return {
@@ -132,6 +321,29 @@ class DICOMParser:
             "SOP Instance": self.sop_instance,
         }
 
+    def instance_links(self):
+        """Study, series and frame of reference UIDs, plus every SOP Instance this one references."""
+        referenced = []
+
+        def collect(items):
+            for item in items:
+                uid = item.get("ReferencedSOPInstanceUID")
+                if uid and uid not in referenced:
+                    referenced.append(str(uid))
+                for elem in item:
+                    if elem.VR == 'SQ':
+                        collect(elem.value)
+
+        for keyword in REFERENCE_SEQUENCES:
+            if keyword in self.ds:
+                collect(self.ds[keyword].value)
+        return {
+            "Study Instance": self.ds.get("StudyInstanceUID"),
+            "Series Instance": self.ds.get("SeriesInstanceUID"),
+            "Frame of Reference": self.ds.get("FrameOfReferenceUID"),
+            "Referenced Instances": referenced,
+        }
+
     @staticmethod
     def get_bscan_images_from_pixel_array(pixel_arr):
         bscan_count = pixel_arr.shape[0]
@@ -142,12 +354,45 @@ class DICOMParser:
 
         return bscan_images
 
+    def _image(self, arr):
+        # PIL image, or the array itself in as_array mode. N-bit data is mapped to 8 bits first
+        arr = to_8bit(arr, self.ds)
+        return arr if self.as_array else Image.fromarray(arr)
+
+    def _bscans(self, pixel_arr):
+        # {'bscan1': PIL image, ...}, or the whole volume in as_array mode
+        pixel_arr = to_8bit(pixel_arr, self.ds)
+        return pixel_arr if self.as_array else self.get_bscan_images_from_pixel_array(pixel_arr)
+
     @staticmethod
     def save_bscan_images(meta, output_pth):
         sop_path = os.path.join(output_pth, f"{meta['SOP Instance']}")
         if not os.path.exists(sop_path): os.makedirs(sop_path) # make pdf (png) folder
-        for bscan in meta['bscan_images'].keys():
-            meta['bscan_images'][bscan].save(os.path.join(sop_path, f"{bscan}.png"))
+        for bscan, image in iter_bscan_images(meta['bscan_images']):
+            image.save(os.path.join(sop_path, f"{bscan}.png"))
+
+    # Handlers shared by several models
+    def _parse_pdf(self, metadata):
+        # 'Encapsulated PDF Storage'
+        metadata['png_pages'] = self._parse_pdf_pages()
+
+    def _parse_bscans(self, metadata):
+        pixel_array = self.get_pixel_array()
+        metadata['bscan_images'] = self._bscans(pixel_array)
+
+    def _preview_json(self, output_path, metadata):
+        # Decoded private arrays go to {SOP Instance}.npz, the summaries stay in the JSON
+        if metadata.get('private_arrays'):
+            save_arrays(os.path.join(output_path, f"{metadata['SOP Instance']}.npz"), metadata['private_arrays'])
+        metadata = {key: value for key, value in metadata.items() if key != 'private_arrays'}
+        with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
+            file.write(json.dumps(metadata, indent=4))
+
+    def _preview_image(self, output_path, metadata):
+        to_pil(metadata['image_PIL']).save(os.path.join(output_path, f"{metadata['SOP Instance']}.png"))  # To save the image to a file (e.g., PNG format)
+
+    def _preview_bscans(self, output_path, metadata):
+        self.save_bscan_images(meta=metadata, output_pth=output_path)
 
 
 ### Begin Subclasses by manufacturermodelname ###
@@ -162,21 +407,10 @@ class ATLAS_9000(DICOMParser):
         }
     """
 
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            metadata['png_pages'] = self._parse_pdf_pages()
-
-        return metadata
-
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            self._preview_pdf_pages(output_path, metadata)
+    handlers = {
+        # 'Encapsulated PDF Storage'
+        ('1.2.840.10008.5.1.4.1.1.104.1', None): Handler('_parse_pdf', '_preview_pdf_pages', tags=PDF_TAGS),
+    }
 
 
 # The String is from the ManufacturerModelName field in the DICOM file
@@ -185,7 +419,128 @@ DICOMParser.register_parser("ATLAS 9000", ATLAS_9000)
 
 
 
-class CIRRUS_HD_OCT4000(DICOMParser):
+class CIRRUS_HD_OCT(DICOMParser):
+    """Spatial Registration Storage handlers shared by the CIRRUS HD-OCT 4000/5000/6000 parsers.
+    The private (0x0407, ...) and (0x0409, ...) layouts are the same across models.
+    """
+
+    include_series_description = True
+
+    # Spatial Registration Storage, by Series Description
+    MACULAR_THICKNESS = Handler('_parse_macular_thickness', '_preview_json',
+                                tags=["Laterality", "DeviceSerialNumber", "ReferencedInstanceSequence",
+                                      "AcquisitionContextSequence", (0x2201, 0x1000), (0x2201, 0x1002),
+                                      (0x0409, 0x1001), (0x0409, 0x1002), (0x0409, 0x1003)])
+    MACULAR_CUBE = Handler('_parse_layers', '_preview_json',
+                           tags=["Laterality", "DeviceSerialNumber", "AcquisitionContextSequence",
+                                 (0x2201, 0x1000), (0x2201, 0x1002),
+                                 (0x0407, 0x10a0), (0x0407, 0x10a1), (0x0407, 0x10a2), (0x0407, 0x10a3),
+                                 (0x0407, 0x10a6), (0x0407, 0x10a7), (0x0407, 0x10b5)])
+    GLAUCOMA_ANALYSIS = Handler('_parse_glaucoma_analysis', '_preview_json',
+                                tags=["Laterality", "DeviceSerialNumber", "ReferencedInstanceSequence",
+                                      "AcquisitionContextSequence", (0x2201, 0x1000), (0x2201, 0x1002)]
+                                     + [(0x0409, element) for element in range(0x1001, 0x1008)]
+                                     + [(0x0409, element) for element in range(0x10d2, 0x10de)]
+                                     + [(0x0409, 0x10ef)])
+    OPTIC_DISC_CUBE = Handler('_parse_layers', '_preview_json',
+                              tags=["Laterality", "DeviceSerialNumber", "AcquisitionContextSequence",
+                                    (0x2201, 0x1000), (0x2201, 0x1002),
+                                    (0x0407, 0x10a1), (0x0407, 0x10a2), (0x0407, 0x10a3),
+                                    (0x0407, 0x10a6), (0x0407, 0x10a7), (0x0407, 0x10b5)])
+    RASTER_LINES = Handler('_parse_layers', '_preview_json',
+                           tags=["AcquisitionContextSequence", (0x2201, 0x1000), (0x2201, 0x1002),
+                                 (0x0407, 0x10a3), (0x0407, 0x10a5), (0x0407, 0x10a6), (0x0407, 0x10b5)])
+    FIVE_LINE_RASTER = Handler('_parse_layers', '_preview_json',
+                               tags=["AcquisitionContextSequence", (0x2201, 0x1000), (0x2201, 0x1002),
+                                     (0x0407, 0x10a3), (0x0407, 0x10a4), (0x0407, 0x10a6), (0x0407, 0x10b5)])
+    SPATIAL_REGISTRATION = Handler('_parse_spatial_registration', '_preview_json',
+                                   tags=["Laterality", "PositionReferenceIndicator", "DeviceSerialNumber",
+                                         "FrameOfReferenceUID", "SynchronizationFrameOfReferenceUID"])
+    # Any other series, only the common metadata is written
+    SPATIAL_REGISTRATION_JSON = Handler(None, '_preview_json', tags=[])
+
+    # Layer sequences whose first item has no (0x0407, 0x101c) SOP class
+    LAYERS_WITHOUT_SOP_CLASS = {(0x0407, 0x10a0), (0x0407, 0x10a1), (0x0407, 0x10a5)}
+    # Arrays reported after the slices, by layer sequence
+    LAYER_ARRAYS = {(0x0407, 0x10a1): [(0x0407, 0x1015), (0x0407, 0x1016)]}
+
+    def _handler_tags(self, group):
+        # Private tags of one group listed in the handler table, in table order
+        return [tag for tag in self.handler.tags if isinstance(tag, tuple) and tag[0] == group]
+
+    def _add_device(self, metadata):
+        for keyword in ("Laterality", "DeviceSerialNumber"):
+            if keyword in self.handler.tags:
+                metadata[keyword] = self.ds.get(keyword, "Unknown")
+
+    def _add_referenced_instances(self, metadata, purpose=False):
+        references = []
+        for item in self.ds.get("ReferencedInstanceSequence", []):
+            reference = {
+                "ReferencedSOPClassUID": item.ReferencedSOPClassUID,
+                "ReferencedSOPInstance_UID": item.ReferencedSOPInstanceUID
+            }
+            if purpose:
+                reference["CodeMeaning"] = item.PurposeOfReferenceCodeSequence[0].CodeMeaning
+            references.append(reference)
+        metadata["ReferencedInstanceSequence"] = references
+
+    def _add_private_tags(self, metadata):
+        # (0x2201, ...) strings, then a summary of each (0x0409, ...) array
+        for tag in self._handler_tags(0x2201):
+            metadata[tag_key(tag)] = ''.join([i for i in self.ds[tag]])
+        for tag in self._handler_tags(0x0409):
+            metadata[tag_key(tag)] = array_summary(self.ds, tag)
+
+    def _layer_summary(self, tag):
+        item = self.ds[tag].value[0]
+        summary = {"(0x0407, 0x100e)": item[(0x0407, 0x100e)].value}
+        if tag not in self.LAYERS_WITHOUT_SOP_CLASS:
+            summary["(0x0407, 0x101c)"] = OPHTHALMOLOGY_SOP_CLASSES[item[(0x0407, 0x101c)].value]
+        summary["images"] = [array_summary(slice, (0x0407, 0x1006)) for slice in item[(0x0407, 0x1005)].value]
+        for array_tag in self.LAYER_ARRAYS.get(tag, []):
+            summary[tag_key(array_tag)] = array_summary(item, array_tag)
+        return summary
+
+    def _parse_macular_thickness(self, metadata):
+        self._add_device(metadata)
+        self._add_referenced_instances(metadata)
+        self._add_private_tags(metadata)
+        if self.private_arrays:
+            # The maps themselves, as float32 grids
+            metadata['private_arrays'] = thickness_maps(self.ds)
+
+    def _parse_glaucoma_analysis(self, metadata):
+        # 'Glaucoma OU Analysis' and 'Guided Progression Analysis'
+        self._add_device(metadata)
+        self._add_referenced_instances(metadata, purpose=True)
+        self._add_private_tags(metadata)
+
+    def _parse_layers(self, metadata):
+        # Cubes and rasters, one entry per (0x0407, ...) layer sequence in the handler's tags
+        self._add_device(metadata)
+        self._add_private_tags(metadata)
+        layers = self._handler_tags(0x0407)
+        for tag in layers:
+            metadata[tag_key(tag)] = self._layer_summary(tag)
+        if self.private_arrays:
+            # The layers themselves, one (slices, ...) array per sequence
+            metadata['private_arrays'] = slice_stacks(self.ds, layers, self.series_description)
+
+    def _parse_spatial_registration(self, metadata):
+        # Laterality
+        metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
+        # PositionReferenceIndicator
+        metadata["PositionReferenceIndicator"] = self.ds.get("PositionReferenceIndicator", "Unknown")
+        # DeviceSerialNumber
+        metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
+        # FrameOfReferenceUID
+        metadata["FrameOfReferenceUID"] = self.ds.get("FrameOfReferenceUID", "Unknown")
+        # SynchronizationFrameOfReferenceUID
+        metadata["SynchronizationFrameOfReferenceUID"] = self.ds.get("SynchronizationFrameOfReferenceUID", "Unknown")
+
+
+class CIRRUS_HD_OCT4000(CIRRUS_HD_OCT):
     """Parser for {
         'manufacturer': 'Carl Zeiss Meditec',
         'manufacturermodelname': 'CIRRUS HD-OCT 4000',
@@ -194,143 +549,21 @@ class CIRRUS_HD_OCT4000(DICOMParser):
         }
     """
 
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        # Series Description
-        metadata["Series Description"] = self.ds.get("SeriesDescription", "Unknown")
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            metadata['png_pages'] = self._parse_pdf_pages()
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.66':
-            # Spatial Registration Storage
-            if metadata["Series Description"] == 'Macular Thickness':
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # ReferencedInstanceSequence
-                ReferencedInstanceSequence = []
-                for InstanceSequence in self.ds.get("ReferencedInstanceSequence", "Unknown"):
-                    IS = {
-                        "ReferencedSOPClassUID": InstanceSequence.ReferencedSOPClassUID,
-                        "ReferencedSOPInstance_UID": InstanceSequence.ReferencedSOPInstanceUID
-                    }
-                    ReferencedInstanceSequence.append(IS)
-                metadata["ReferencedInstanceSequence"] = ReferencedInstanceSequence
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-                metadata['(0x0409, 0x1001)'] = f"{self.ds[(0x0409,0x1001)].VR}: Array of {len(self.ds[(0x0409,0x1001)].value)} elements"
-                metadata['(0x0409, 0x1002)'] = f"{self.ds[(0x0409,0x1002)].VR}: Array of {len(self.ds[(0x0409,0x1002)].value)} elements"
-                metadata['(0x0409, 0x1003)'] = f"{self.ds[(0x0409,0x1003)].VR}: Array of {len(self.ds[(0x0409,0x1003)].value)} elements"
-            
-            elif metadata["Series Description"] == 'Macular Cube 512x128':
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a0)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a0)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a0)][0][(0x0407, 0x100e)].value, "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a1)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x100e)].value,
-                                                "images":slices,
-                                                "(0x0407, 0x1015)":f"{self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1015)].VR}: Array of {len(self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1015)].value)} elements",
-                                                "(0x0407, 0x1016)":f"{self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1016)].VR}: Array of {len(self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1016)].value)} elements"}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a2)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a3)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a6)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a7)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10b5)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-
-            else:
-                # Series Description
-                metadata["Series Description"] = self.ds.get("SeriesDescription", "Unknown")
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # PositionReferenceIndicator
-                metadata["PositionReferenceIndicator"] = self.ds.get("PositionReferenceIndicator", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # FrameOfReferenceUID
-                metadata["FrameOfReferenceUID"] = self.ds.get("FrameOfReferenceUID", "Unknown")
-                # SynchronizationFrameOfReferenceUID
-                metadata["SynchronizationFrameOfReferenceUID"] = self.ds.get("SynchronizationFrameOfReferenceUID", "Unknown")
-            
-        return metadata
-
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            self._preview_pdf_pages(output_path, metadata)
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.66':
-            # Spatial Registration Storage
-            with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}.json")
-                file.write(json.dumps(metadata, indent=4))
+    handlers = {
+        # 'Encapsulated PDF Storage'
+        ('1.2.840.10008.5.1.4.1.1.104.1', None): Handler('_parse_pdf', '_preview_pdf_pages', tags=PDF_TAGS),
+        # Spatial Registration Storage
+        ('1.2.840.10008.5.1.4.1.1.66', 'Macular Thickness'): CIRRUS_HD_OCT.MACULAR_THICKNESS,
+        ('1.2.840.10008.5.1.4.1.1.66', 'Macular Cube 512x128'): CIRRUS_HD_OCT.MACULAR_CUBE,
+        ('1.2.840.10008.5.1.4.1.1.66', None): CIRRUS_HD_OCT.SPATIAL_REGISTRATION,
+    }
 
 
 # The String is from the ManufacturerModelName field in the DICOM file
 DICOMParser.register_parser("CIRRUS HD-OCT 4000", CIRRUS_HD_OCT4000)
 
 
-class CIRRUS_HD_OCT_5000(DICOMParser):
+class CIRRUS_HD_OCT_5000(CIRRUS_HD_OCT):
     """Parser for {
         'manufacturer': 'Carl Zeiss Meditec',
         'manufacturermodelname': 'CIRRUS HD-OCT 5000',
@@ -343,433 +576,65 @@ class CIRRUS_HD_OCT_5000(DICOMParser):
         }
     """
 
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        # Series Description
-        metadata["Series Description"] = self.ds.get("SeriesDescription", "Unknown")
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.1':
-            # 'Ophthalmic Photography 8 Bit Image Storage'
-            try:
-                pixel_array = self.ds.pixel_array
-            except Exception as e:
-                print("pixel array issue")
-                print(repr(e))
-            
-            image = Image.fromarray(pixel_array)
-            metadata['image_PIL'] = image
-            # Possible Image Kind
-            metadata["Image Type"] = self.ds.get("ChannelDescriptionCodeSequence", "Unknown")[0].CodeMeaning
-            # Laterality
-            metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-            # Bits Allocated
-            metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
-            # Photometric Interpretation
-            metadata["Photometric Interpretation"] = self.ds.get("PhotometricInterpretation", "Unknown")
-            # Pixel Spacing
-            metadata["Pixel Spacing"] = self.ds.get("PixelSpacing", "Unknown")
-            # Private Tags
-            metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':       
-            # 'Encapsulated PDF Storage'     
-            metadata['png_pages'] = self._parse_pdf_pages()
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.4':
-            # 'Ophthalmic Tomography Image Storage'
-            if metadata["Series Description"] == 'RASTER_SINGLE':
-                # RASTER_SINGLE
-                try:
-                    pixel_array = self.ds.pixel_array
-                except Exception as e:
-                    print("pixel array issue")
-                    print(repr(e))
-                image = Image.fromarray(pixel_array)
-                metadata['image_PIL'] = image
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # Bits Allocated
-                metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
-                # Photometric Interpretation
-                metadata["Photometric Interpretation"] = self.ds.get("PhotometricInterpretation", "Unknown")
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-            else:
-                try:
-                    pixel_array = self.ds.pixel_array
-                    # pixel_array = np.transpose(pixel_array, (0, 2, 1))  # Now shape is (128, 512, 1024)
-                except Exception as e:
-                    print("pixel array issue")
-                    print(repr(e))
-                bscan_count = pixel_array.shape[0]
-                bscan_images = {}
-                for i in range(bscan_count):
-                    bscan_image = Image.fromarray(pixel_array[i, :, :])
-                    bscan_images[f"bscan{i+1}"] = bscan_image
-                metadata['bscan_images'] = bscan_images
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.66':
-            # Spatial Registration Storage
-            ## Series Description
-            if metadata["Series Description"] == 'Macular Thickness':
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # ReferencedInstanceSequence
-                ReferencedInstanceSequence = []
-                for InstanceSequence in self.ds.get("ReferencedInstanceSequence", "Unknown"):
-                    IS = {
-                        "ReferencedSOPClassUID": InstanceSequence.ReferencedSOPClassUID,
-                        "ReferencedSOPInstance_UID": InstanceSequence.ReferencedSOPInstanceUID
-                    }
-                    ReferencedInstanceSequence.append(IS)
-                metadata["ReferencedInstanceSequence"] = ReferencedInstanceSequence
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-                metadata['(0x0409, 0x1001)'] = f"{self.ds[(0x0409,0x1001)].VR}: Array of {len(self.ds[(0x0409,0x1001)].value)} elements"
-                metadata['(0x0409, 0x1002)'] = f"{self.ds[(0x0409,0x1002)].VR}: Array of {len(self.ds[(0x0409,0x1002)].value)} elements"
-                metadata['(0x0409, 0x1003)'] = f"{self.ds[(0x0409,0x1003)].VR}: Array of {len(self.ds[(0x0409,0x1003)].value)} elements"
-                
-            elif metadata["Series Description"] == 'Macular Cube 512x128':
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a0)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a0)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a0)][0][(0x0407, 0x100e)].value, "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a1)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x100e)].value,
-                                                "images":slices,
-                                                "(0x0407, 0x1015)":f"{self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1015)].VR}: Array of {len(self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1015)].value)} elements",
-                                                "(0x0407, 0x1016)":f"{self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1016)].VR}: Array of {len(self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1016)].value)} elements"}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a2)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a3)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a6)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a7)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10b5)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-
-            elif metadata["Series Description"] == 'Glaucoma OU Analysis':
-                # self._write_detailed_dicom_header_to_file("/scratch90/QTIM/Active/23-0284/dashboard/Data/forum_all_image_classification/CIRRUS HD-OCT 5000/OPT/Spatial Registration Storage/Glaucoma OU Analysis")
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # ReferencedInstanceSequence
-                ReferencedInstanceSequence = []
-                for InstanceSequence in self.ds.get("ReferencedInstanceSequence", "Unknown"):
-                    IS = {
-                        "ReferencedSOPClassUID": InstanceSequence.ReferencedSOPClassUID,
-                        "ReferencedSOPInstance_UID": InstanceSequence.ReferencedSOPInstanceUID,
-                        "CodeMeaning": InstanceSequence.PurposeOfReferenceCodeSequence[0].CodeMeaning
-                    }
-                    ReferencedInstanceSequence.append(IS)
-                metadata["ReferencedInstanceSequence"] = ReferencedInstanceSequence
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-
-                metadata['(0x0409, 0x1001)'] = f"{self.ds[(0x0409, 0x1001)].VR}: Array of {len(self.ds[(0x0409, 0x1001)].value)} elements"
-                metadata['(0x0409, 0x1002)'] = f"{self.ds[(0x0409, 0x1002)].VR}: Array of {len(self.ds[(0x0409, 0x1002)].value)} elements"
-                metadata['(0x0409, 0x1003)'] = f"{self.ds[(0x0409, 0x1003)].VR}: Array of {len(self.ds[(0x0409, 0x1003)].value)} elements"
-                metadata['(0x0409, 0x1004)'] = f"{self.ds[(0x0409, 0x1004)].VR}: Array of {len(self.ds[(0x0409, 0x1004)].value)} elements"
-                metadata['(0x0409, 0x1005)'] = f"{self.ds[(0x0409, 0x1005)].VR}: Array of {len(self.ds[(0x0409, 0x1005)].value)} elements"
-                metadata['(0x0409, 0x1006)'] = f"{self.ds[(0x0409, 0x1006)].VR}: Array of {len(self.ds[(0x0409, 0x1006)].value)} elements"
-                metadata['(0x0409, 0x1007)'] = f"{self.ds[(0x0409, 0x1007)].VR}: Array of {len(self.ds[(0x0409, 0x1007)].value)} elements"
-
-                metadata['(0x0409, 0x10d2)'] = f"{self.ds[(0x0409, 0x10d2)].VR}: Array of {len(self.ds[(0x0409, 0x10d2)].value)} elements"
-                metadata['(0x0409, 0x10d3)'] = f"{self.ds[(0x0409, 0x10d3)].VR}: Array of {len(self.ds[(0x0409, 0x10d3)].value)} elements"
-                metadata['(0x0409, 0x10d4)'] = f"{self.ds[(0x0409, 0x10d4)].VR}: Array of {len(self.ds[(0x0409, 0x10d4)].value)} elements"
-                metadata['(0x0409, 0x10d5)'] = f"{self.ds[(0x0409, 0x10d5)].VR}: Array of {len(self.ds[(0x0409, 0x10d5)].value)} elements"
-                metadata['(0x0409, 0x10d6)'] = f"{self.ds[(0x0409, 0x10d6)].VR}: Array of {len(self.ds[(0x0409, 0x10d6)].value)} elements"
-                metadata['(0x0409, 0x10d7)'] = f"{self.ds[(0x0409, 0x10d7)].VR}: Array of {len(self.ds[(0x0409, 0x10d7)].value)} elements"
-                metadata['(0x0409, 0x10d8)'] = f"{self.ds[(0x0409, 0x10d8)].VR}: Array of {len(self.ds[(0x0409, 0x10d8)].value)} elements"
-                metadata['(0x0409, 0x10d9)'] = f"{self.ds[(0x0409, 0x10d9)].VR}: Array of {len(self.ds[(0x0409, 0x10d9)].value)} elements"
-                metadata['(0x0409, 0x10da)'] = f"{self.ds[(0x0409, 0x10da)].VR}: Array of {len(self.ds[(0x0409, 0x10da)].value)} elements"
-                metadata['(0x0409, 0x10db)'] = f"{self.ds[(0x0409, 0x10db)].VR}: Array of {len(self.ds[(0x0409, 0x10db)].value)} elements"
-                metadata['(0x0409, 0x10dc)'] = f"{self.ds[(0x0409, 0x10dc)].VR}: Array of {len(self.ds[(0x0409, 0x10dc)].value)} elements"
-                metadata['(0x0409, 0x10dd)'] = f"{self.ds[(0x0409, 0x10dd)].VR}: Array of {len(self.ds[(0x0409, 0x10dd)].value)} elements"
-
-                metadata['(0x0409, 0x10ef)'] = f"{self.ds[(0x0409, 0x10ef)].VR}: Array of {len(self.ds[(0x0409, 0x10ef)].value)} elements"
-            
-            elif metadata["Series Description"] == 'Optic Disc Cube 200x200':
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a1)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x100e)].value,
-                                                "images":slices,
-                                                "(0x0407, 0x1015)":f"{self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1015)].VR}: Array of {len(self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1015)].value)} elements",
-                                                "(0x0407, 0x1016)":f"{self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1016)].VR}: Array of {len(self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1016)].value)} elements"}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a2)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a3)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a6)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a7)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10b5)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-            
-            elif metadata["Series Description"] == 'RASTER_21_LINES' or metadata["Series Description"] == 'HD 5 Line Raster':
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a3)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a5)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a5)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a5)][0][(0x0407, 0x100e)].value,
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a6)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10b5)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-
-            elif metadata["Series Description"] == '5 Line Raster':
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a3)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a4)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a4)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a4)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a4)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a6)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10b5)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-            elif metadata["Series Description"] == 'Guided Progression Analysis':
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                # ReferencedInstanceSequence
-                ReferencedInstanceSequence = []
-                for InstanceSequence in self.ds.get("ReferencedInstanceSequence", "Unknown"):
-                    IS = {
-                        "ReferencedSOPClassUID": InstanceSequence.ReferencedSOPClassUID,
-                        "ReferencedSOPInstance_UID": InstanceSequence.ReferencedSOPInstanceUID,
-                        "CodeMeaning": InstanceSequence.PurposeOfReferenceCodeSequence[0].CodeMeaning
-                    }
-                    ReferencedInstanceSequence.append(IS)
-                metadata["ReferencedInstanceSequence"] = ReferencedInstanceSequence
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-
-                metadata['(0x0409, 0x1001)'] = f"{self.ds[(0x0409, 0x1001)].VR}: Array of {len(self.ds[(0x0409, 0x1001)].value)} elements"
-                metadata['(0x0409, 0x1002)'] = f"{self.ds[(0x0409, 0x1002)].VR}: Array of {len(self.ds[(0x0409, 0x1002)].value)} elements"
-                metadata['(0x0409, 0x1003)'] = f"{self.ds[(0x0409, 0x1003)].VR}: Array of {len(self.ds[(0x0409, 0x1003)].value)} elements"
-                metadata['(0x0409, 0x1004)'] = f"{self.ds[(0x0409, 0x1004)].VR}: Array of {len(self.ds[(0x0409, 0x1004)].value)} elements"
-                metadata['(0x0409, 0x1005)'] = f"{self.ds[(0x0409, 0x1005)].VR}: Array of {len(self.ds[(0x0409, 0x1005)].value)} elements"
-                metadata['(0x0409, 0x1006)'] = f"{self.ds[(0x0409, 0x1006)].VR}: Array of {len(self.ds[(0x0409, 0x1006)].value)} elements"
-                metadata['(0x0409, 0x1007)'] = f"{self.ds[(0x0409, 0x1007)].VR}: Array of {len(self.ds[(0x0409, 0x1007)].value)} elements"
-
-                metadata['(0x0409, 0x10d2)'] = f"{self.ds[(0x0409, 0x10d2)].VR}: Array of {len(self.ds[(0x0409, 0x10d2)].value)} elements"
-                metadata['(0x0409, 0x10d3)'] = f"{self.ds[(0x0409, 0x10d3)].VR}: Array of {len(self.ds[(0x0409, 0x10d3)].value)} elements"
-                metadata['(0x0409, 0x10d4)'] = f"{self.ds[(0x0409, 0x10d4)].VR}: Array of {len(self.ds[(0x0409, 0x10d4)].value)} elements"
-                metadata['(0x0409, 0x10d5)'] = f"{self.ds[(0x0409, 0x10d5)].VR}: Array of {len(self.ds[(0x0409, 0x10d5)].value)} elements"
-                metadata['(0x0409, 0x10d6)'] = f"{self.ds[(0x0409, 0x10d6)].VR}: Array of {len(self.ds[(0x0409, 0x10d6)].value)} elements"
-                metadata['(0x0409, 0x10d7)'] = f"{self.ds[(0x0409, 0x10d7)].VR}: Array of {len(self.ds[(0x0409, 0x10d7)].value)} elements"
-                metadata['(0x0409, 0x10d8)'] = f"{self.ds[(0x0409, 0x10d8)].VR}: Array of {len(self.ds[(0x0409, 0x10d8)].value)} elements"
-                metadata['(0x0409, 0x10d9)'] = f"{self.ds[(0x0409, 0x10d9)].VR}: Array of {len(self.ds[(0x0409, 0x10d9)].value)} elements"
-                metadata['(0x0409, 0x10da)'] = f"{self.ds[(0x0409, 0x10da)].VR}: Array of {len(self.ds[(0x0409, 0x10da)].value)} elements"
-                metadata['(0x0409, 0x10db)'] = f"{self.ds[(0x0409, 0x10db)].VR}: Array of {len(self.ds[(0x0409, 0x10db)].value)} elements"
-                metadata['(0x0409, 0x10dc)'] = f"{self.ds[(0x0409, 0x10dc)].VR}: Array of {len(self.ds[(0x0409, 0x10dc)].value)} elements"
-                metadata['(0x0409, 0x10dd)'] = f"{self.ds[(0x0409, 0x10dd)].VR}: Array of {len(self.ds[(0x0409, 0x10dd)].value)} elements"
-
-                metadata['(0x0409, 0x10ef)'] = f"{self.ds[(0x0409, 0x10ef)].VR}: Array of {len(self.ds[(0x0409, 0x10ef)].value)} elements"
-
-
-        return metadata
-
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
+    handlers = {
         # 'Ophthalmic Photography 8 Bit Image Storage'
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.1':
-            sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-            metadata['image_PIL'].save(os.path.join(output_path, sop_path+".png"))  # To save the image to a file (e.g., PNG format)
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.1', None): Handler('_parse_photo', '_preview_image', pixel_data=True,
+                                                            tags=["ChannelDescriptionCodeSequence", "Laterality",
+                                                                  "PixelSpacing", (0x2201, 0x1000)]),
+        # 'Ophthalmic Photography 16 Bit Image Storage'
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.2', None): Handler('_parse_photo', '_preview_image', pixel_data=True,
+                                                            tags=["ChannelDescriptionCodeSequence", "Laterality",
+                                                                  "PixelSpacing", (0x2201, 0x1000)]),
+        # 'Encapsulated PDF Storage'
+        ('1.2.840.10008.5.1.4.1.1.104.1', None): Handler('_parse_pdf', '_preview_pdf_pages', tags=PDF_TAGS),
+        # 'Ophthalmic Tomography Image Storage'
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.4', 'RASTER_SINGLE'): Handler('_parse_raster_single', '_preview_image', pixel_data=True,
+                                                                       tags=["Laterality", (0x2201, 0x1000)]),
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.4', None): Handler('_parse_bscans', '_preview_bscans', pixel_data=True, tags=[]),
+        # Spatial Registration Storage
+        ('1.2.840.10008.5.1.4.1.1.66', 'Macular Thickness'): CIRRUS_HD_OCT.MACULAR_THICKNESS,
+        ('1.2.840.10008.5.1.4.1.1.66', 'Macular Cube 512x128'): CIRRUS_HD_OCT.MACULAR_CUBE,
+        ('1.2.840.10008.5.1.4.1.1.66', 'Glaucoma OU Analysis'): CIRRUS_HD_OCT.GLAUCOMA_ANALYSIS,
+        ('1.2.840.10008.5.1.4.1.1.66', 'Optic Disc Cube 200x200'): CIRRUS_HD_OCT.OPTIC_DISC_CUBE,
+        ('1.2.840.10008.5.1.4.1.1.66', 'RASTER_21_LINES'): CIRRUS_HD_OCT.RASTER_LINES,
+        ('1.2.840.10008.5.1.4.1.1.66', 'HD 5 Line Raster'): CIRRUS_HD_OCT.RASTER_LINES,
+        ('1.2.840.10008.5.1.4.1.1.66', '5 Line Raster'): CIRRUS_HD_OCT.FIVE_LINE_RASTER,
+        ('1.2.840.10008.5.1.4.1.1.66', 'Guided Progression Analysis'): CIRRUS_HD_OCT.GLAUCOMA_ANALYSIS,
+        ('1.2.840.10008.5.1.4.1.1.66', None): CIRRUS_HD_OCT.SPATIAL_REGISTRATION_JSON,
+    }
+
+    def _parse_photo(self, metadata):
+        # 'Ophthalmic Photography 8 Bit Image Storage'
+        pixel_array = self.get_pixel_array()
         
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            self._preview_pdf_pages(output_path, metadata)
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.4':
-            # 'Ophthalmic Tomography Image Storage'
-            if metadata["Series Description"] == 'RASTER_SINGLE':
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-                metadata['image_PIL'].save(os.path.join(output_path, sop_path+".png"))  # To save the image to a file (e.g., PNG format)
-            else:
-                ## Bscans
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-                if not os.path.exists(sop_path): os.makedirs(sop_path) # make pdf (png) folder
-                for bscan in metadata['bscan_images'].keys():
-                    metadata['bscan_images'][bscan].save(os.path.join(sop_path, f"{bscan}.png"))
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.66':
-            # Spatial Registration Storage
-            # if not os.path.exists(sop_path): os.makedirs(sop_path)
-            with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}.json")
-                file.write(json.dumps(metadata, indent=4))
+        image = self._image(pixel_array)
+        metadata['image_PIL'] = image
+        # Possible Image Kind
+        metadata["Image Type"] = self.ds.get("ChannelDescriptionCodeSequence", "Unknown")[0].CodeMeaning
+        # Laterality
+        metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
+        # Bits Allocated
+        metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
+        # Photometric Interpretation
+        metadata["Photometric Interpretation"] = self.ds.get("PhotometricInterpretation", "Unknown")
+        # Pixel Spacing
+        metadata["Pixel Spacing"] = self.ds.get("PixelSpacing", "Unknown")
+        # Private Tags
+        metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
+
+    def _parse_raster_single(self, metadata):
+        # RASTER_SINGLE
+        pixel_array = self.get_pixel_array()
+        image = self._image(pixel_array)
+        metadata['image_PIL'] = image
+        # Laterality
+        metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
+        # Bits Allocated
+        metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
+        # Photometric Interpretation
+        metadata["Photometric Interpretation"] = self.ds.get("PhotometricInterpretation", "Unknown")
+        # Private Tags
+        metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
 
 
 # The String is from the ManufacturerModelName field in the DICOM file
@@ -777,7 +642,7 @@ DICOMParser.register_parser("CIRRUS HD-OCT 5000", CIRRUS_HD_OCT_5000)
 
 
 
-class CIRRUS_HD_OCT_6000(DICOMParser):
+class CIRRUS_HD_OCT_6000(CIRRUS_HD_OCT):
     """Parser for {
         'manufacturer': 'Carl Zeiss Meditec',
         'manufacturermodelname': 'CIRRUS HD-OCT 6000',
@@ -790,336 +655,60 @@ class CIRRUS_HD_OCT_6000(DICOMParser):
         }
     """
 
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        # Series Description
-        metadata["Series Description"] = self.ds.get("SeriesDescription", "Unknown") # will have SFA\GPA
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.1':
-            # 'Ophthalmic Photography 8 Bit Image Storage'
-            try:
-                pixel_array = self.ds.pixel_array
-            except Exception as e:
-                print("pixel array issue")
-                print(repr(e))
-            image = Image.fromarray(pixel_array)
-            metadata['image_PIL'] = image
-            # Laterality
-            metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-            # Bits Allocated
-            metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
-            # Photometric Interpretation
-            metadata["Photometric Interpretation"] = self.ds.get("PhotometricInterpretation", "Unknown")
-            # Pixel Spacing
-            metadata["Pixel Spacing"] = self.ds.get("PixelSpacing", "Unknown")
-            # Private Tags
-            metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':       
-            # 'Encapsulated PDF Storage'     
-            metadata['png_pages'] = self._parse_pdf_pages()
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.4':
-            # 'Ophthalmic Tomography Image Storage'
-            try:
-                pixel_array = self.ds.pixel_array
-                # pixel_array = np.transpose(pixel_array, (0, 2, 1))  # Now shape is (128, 512, 1024)
-
-            except Exception as e:
-                print("pixel array issue")
-                print(repr(e))
-            bscan_count = pixel_array.shape[0]
-            bscan_images = {}
-            for i in range(bscan_count):
-                bscan_image = Image.fromarray(pixel_array[i, :, :])
-
-                bscan_images[f"bscan{i+1}"] = bscan_image
-            metadata['bscan_images'] = bscan_images
-            en_face_image = Image.fromarray(np.max(pixel_array, axis=1))  # Collapse the depth axis
-            metadata['en_face_image'] = en_face_image
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.66':
-            # Spatial Registration Storage
-            ## Series Description
-            if metadata["Series Description"] == 'Macular Thickness':
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # ReferencedInstanceSequence
-                ReferencedInstanceSequence = []
-                for InstanceSequence in self.ds.get("ReferencedInstanceSequence", "Unknown"):
-                    IS = {
-                        "ReferencedSOPClassUID": InstanceSequence.ReferencedSOPClassUID,
-                        "ReferencedSOPInstance_UID": InstanceSequence.ReferencedSOPInstanceUID
-                    }
-                    ReferencedInstanceSequence.append(IS)
-                metadata["ReferencedInstanceSequence"] = ReferencedInstanceSequence
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-                metadata['(0x0409, 0x1001)'] = f"{self.ds[(0x0409,0x1001)].VR}: Array of {len(self.ds[(0x0409,0x1001)].value)} elements"
-                metadata['(0x0409, 0x1002)'] = f"{self.ds[(0x0409,0x1002)].VR}: Array of {len(self.ds[(0x0409,0x1002)].value)} elements"
-                metadata['(0x0409, 0x1003)'] = f"{self.ds[(0x0409,0x1003)].VR}: Array of {len(self.ds[(0x0409,0x1003)].value)} elements"
-                
-            elif metadata["Series Description"] == 'Macular Cube 512x128':
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a0)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a0)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a0)][0][(0x0407, 0x100e)].value, "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a1)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x100e)].value,
-                                                "images":slices,
-                                                "(0x0407, 0x1015)":f"{self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1015)].VR}: Array of {len(self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1015)].value)} elements",
-                                                "(0x0407, 0x1016)":f"{self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1016)].VR}: Array of {len(self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1016)].value)} elements"}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a2)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a3)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a6)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a7)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10b5)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-            
-            elif metadata["Series Description"] == 'Glaucoma OU Analysis':
-                # self._write_detailed_dicom_header_to_file("/scratch90/QTIM/Active/23-0284/dashboard/Data/forum_all_image_classification/CIRRUS HD-OCT 6000/OPT/Spatial Registration Storage/Glaucoma OU Analysis")
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # ReferencedInstanceSequence
-                ReferencedInstanceSequence = []
-                for InstanceSequence in self.ds.get("ReferencedInstanceSequence", "Unknown"):
-                    IS = {
-                        "ReferencedSOPClassUID": InstanceSequence.ReferencedSOPClassUID,
-                        "ReferencedSOPInstance_UID": InstanceSequence.ReferencedSOPInstanceUID,
-                        "CodeMeaning": InstanceSequence.PurposeOfReferenceCodeSequence[0].CodeMeaning
-                    }
-                    ReferencedInstanceSequence.append(IS)
-                metadata["ReferencedInstanceSequence"] = ReferencedInstanceSequence
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-
-                metadata['(0x0409, 0x1001)'] = f"{self.ds[(0x0409, 0x1001)].VR}: Array of {len(self.ds[(0x0409, 0x1001)].value)} elements"
-                metadata['(0x0409, 0x1002)'] = f"{self.ds[(0x0409, 0x1002)].VR}: Array of {len(self.ds[(0x0409, 0x1002)].value)} elements"
-                metadata['(0x0409, 0x1003)'] = f"{self.ds[(0x0409, 0x1003)].VR}: Array of {len(self.ds[(0x0409, 0x1003)].value)} elements"
-                metadata['(0x0409, 0x1004)'] = f"{self.ds[(0x0409, 0x1004)].VR}: Array of {len(self.ds[(0x0409, 0x1004)].value)} elements"
-                metadata['(0x0409, 0x1005)'] = f"{self.ds[(0x0409, 0x1005)].VR}: Array of {len(self.ds[(0x0409, 0x1005)].value)} elements"
-                metadata['(0x0409, 0x1006)'] = f"{self.ds[(0x0409, 0x1006)].VR}: Array of {len(self.ds[(0x0409, 0x1006)].value)} elements"
-                metadata['(0x0409, 0x1007)'] = f"{self.ds[(0x0409, 0x1007)].VR}: Array of {len(self.ds[(0x0409, 0x1007)].value)} elements"
-
-                metadata['(0x0409, 0x10d2)'] = f"{self.ds[(0x0409, 0x10d2)].VR}: Array of {len(self.ds[(0x0409, 0x10d2)].value)} elements"
-                metadata['(0x0409, 0x10d3)'] = f"{self.ds[(0x0409, 0x10d3)].VR}: Array of {len(self.ds[(0x0409, 0x10d3)].value)} elements"
-                metadata['(0x0409, 0x10d4)'] = f"{self.ds[(0x0409, 0x10d4)].VR}: Array of {len(self.ds[(0x0409, 0x10d4)].value)} elements"
-                metadata['(0x0409, 0x10d5)'] = f"{self.ds[(0x0409, 0x10d5)].VR}: Array of {len(self.ds[(0x0409, 0x10d5)].value)} elements"
-                metadata['(0x0409, 0x10d6)'] = f"{self.ds[(0x0409, 0x10d6)].VR}: Array of {len(self.ds[(0x0409, 0x10d6)].value)} elements"
-                metadata['(0x0409, 0x10d7)'] = f"{self.ds[(0x0409, 0x10d7)].VR}: Array of {len(self.ds[(0x0409, 0x10d7)].value)} elements"
-                metadata['(0x0409, 0x10d8)'] = f"{self.ds[(0x0409, 0x10d8)].VR}: Array of {len(self.ds[(0x0409, 0x10d8)].value)} elements"
-                metadata['(0x0409, 0x10d9)'] = f"{self.ds[(0x0409, 0x10d9)].VR}: Array of {len(self.ds[(0x0409, 0x10d9)].value)} elements"
-                metadata['(0x0409, 0x10da)'] = f"{self.ds[(0x0409, 0x10da)].VR}: Array of {len(self.ds[(0x0409, 0x10da)].value)} elements"
-                metadata['(0x0409, 0x10db)'] = f"{self.ds[(0x0409, 0x10db)].VR}: Array of {len(self.ds[(0x0409, 0x10db)].value)} elements"
-                metadata['(0x0409, 0x10dc)'] = f"{self.ds[(0x0409, 0x10dc)].VR}: Array of {len(self.ds[(0x0409, 0x10dc)].value)} elements"
-                metadata['(0x0409, 0x10dd)'] = f"{self.ds[(0x0409, 0x10dd)].VR}: Array of {len(self.ds[(0x0409, 0x10dd)].value)} elements"
-
-                metadata['(0x0409, 0x10ef)'] = f"{self.ds[(0x0409, 0x10ef)].VR}: Array of {len(self.ds[(0x0409, 0x10ef)].value)} elements"
-                
-            elif metadata["Series Description"] == 'Optic Disc Cube 200x200':
-                # self._write_detailed_dicom_header_to_file('/scratch90/QTIM/Active/23-0284/dashboard/Data/forum_all_image_classification/CIRRUS HD-OCT 6000/OPT/Spatial Registration Storage/Optic Disc Cube 200x200')
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a1)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x100e)].value,
-                                                "images":slices,
-                                                "(0x0407, 0x1015)":f"{self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1015)].VR}: Array of {len(self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1015)].value)} elements",
-                                                "(0x0407, 0x1016)":f"{self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1016)].VR}: Array of {len(self.ds[(0x0407, 0x10a1)][0][(0x0407, 0x1016)].value)} elements"}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a2)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a2)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a3)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a3)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a6)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a6)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10a7)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10a7)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-                slices = []
-                for slice in self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x1005)]:
-                    slice = f"{slice[(0x0407, 0x1006)].VR}: Array of {len(slice[(0x0407, 0x1006)].value)} elements"
-                    slices.append(slice)
-                metadata['(0x0407, 0x10b5)'] = {"(0x0407, 0x100e)":self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x100e)].value,
-                                                "(0x0407, 0x101c)":OPHTHALMOLOGY_SOP_CLASSES[self.ds[(0x0407, 0x10b5)][0][(0x0407, 0x101c)].value],
-                                                "images":slices}
-            elif metadata["Series Description"] == 'Guided Progression Analysis':
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # DeviceSerialNumber
-                metadata["DeviceSerialNumber"] = self.ds.get("DeviceSerialNumber", "Unknown")
-                # Acquisition Context Sequence
-                AcquisitionContextSequence = []
-                for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                    CS = {
-                        "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    AcquisitionContextSequence.append(CS)
-                # ReferencedInstanceSequence
-                ReferencedInstanceSequence = []
-                for InstanceSequence in self.ds.get("ReferencedInstanceSequence", "Unknown"):
-                    IS = {
-                        "ReferencedSOPClassUID": InstanceSequence.ReferencedSOPClassUID,
-                        "ReferencedSOPInstance_UID": InstanceSequence.ReferencedSOPInstanceUID,
-                        "CodeMeaning": InstanceSequence.PurposeOfReferenceCodeSequence[0].CodeMeaning
-                    }
-                    ReferencedInstanceSequence.append(IS)
-                metadata["ReferencedInstanceSequence"] = ReferencedInstanceSequence
-                # Private Tags
-                metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-                metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-
-                metadata['(0x0409, 0x1001)'] = f"{self.ds[(0x0409, 0x1001)].VR}: Array of {len(self.ds[(0x0409, 0x1001)].value)} elements"
-                metadata['(0x0409, 0x1002)'] = f"{self.ds[(0x0409, 0x1002)].VR}: Array of {len(self.ds[(0x0409, 0x1002)].value)} elements"
-                metadata['(0x0409, 0x1003)'] = f"{self.ds[(0x0409, 0x1003)].VR}: Array of {len(self.ds[(0x0409, 0x1003)].value)} elements"
-                metadata['(0x0409, 0x1004)'] = f"{self.ds[(0x0409, 0x1004)].VR}: Array of {len(self.ds[(0x0409, 0x1004)].value)} elements"
-                metadata['(0x0409, 0x1005)'] = f"{self.ds[(0x0409, 0x1005)].VR}: Array of {len(self.ds[(0x0409, 0x1005)].value)} elements"
-                metadata['(0x0409, 0x1006)'] = f"{self.ds[(0x0409, 0x1006)].VR}: Array of {len(self.ds[(0x0409, 0x1006)].value)} elements"
-                metadata['(0x0409, 0x1007)'] = f"{self.ds[(0x0409, 0x1007)].VR}: Array of {len(self.ds[(0x0409, 0x1007)].value)} elements"
-
-                metadata['(0x0409, 0x10d2)'] = f"{self.ds[(0x0409, 0x10d2)].VR}: Array of {len(self.ds[(0x0409, 0x10d2)].value)} elements"
-                metadata['(0x0409, 0x10d3)'] = f"{self.ds[(0x0409, 0x10d3)].VR}: Array of {len(self.ds[(0x0409, 0x10d3)].value)} elements"
-                metadata['(0x0409, 0x10d4)'] = f"{self.ds[(0x0409, 0x10d4)].VR}: Array of {len(self.ds[(0x0409, 0x10d4)].value)} elements"
-                metadata['(0x0409, 0x10d5)'] = f"{self.ds[(0x0409, 0x10d5)].VR}: Array of {len(self.ds[(0x0409, 0x10d5)].value)} elements"
-                metadata['(0x0409, 0x10d6)'] = f"{self.ds[(0x0409, 0x10d6)].VR}: Array of {len(self.ds[(0x0409, 0x10d6)].value)} elements"
-                metadata['(0x0409, 0x10d7)'] = f"{self.ds[(0x0409, 0x10d7)].VR}: Array of {len(self.ds[(0x0409, 0x10d7)].value)} elements"
-                metadata['(0x0409, 0x10d8)'] = f"{self.ds[(0x0409, 0x10d8)].VR}: Array of {len(self.ds[(0x0409, 0x10d8)].value)} elements"
-                metadata['(0x0409, 0x10d9)'] = f"{self.ds[(0x0409, 0x10d9)].VR}: Array of {len(self.ds[(0x0409, 0x10d9)].value)} elements"
-                metadata['(0x0409, 0x10da)'] = f"{self.ds[(0x0409, 0x10da)].VR}: Array of {len(self.ds[(0x0409, 0x10da)].value)} elements"
-                metadata['(0x0409, 0x10db)'] = f"{self.ds[(0x0409, 0x10db)].VR}: Array of {len(self.ds[(0x0409, 0x10db)].value)} elements"
-                metadata['(0x0409, 0x10dc)'] = f"{self.ds[(0x0409, 0x10dc)].VR}: Array of {len(self.ds[(0x0409, 0x10dc)].value)} elements"
-                metadata['(0x0409, 0x10dd)'] = f"{self.ds[(0x0409, 0x10dd)].VR}: Array of {len(self.ds[(0x0409, 0x10dd)].value)} elements"
-
-                metadata['(0x0409, 0x10ef)'] = f"{self.ds[(0x0409, 0x10ef)].VR}: Array of {len(self.ds[(0x0409, 0x10ef)].value)} elements"
-
-
-        return metadata
-
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.1':
-            sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-            metadata['image_PIL'].save(os.path.join(output_path, sop_path+".png"))  # To save the image to a file (e.g., PNG format)
-        
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            self._preview_pdf_pages(output_path, metadata)
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.4':
-            # 'Ophthalmic Tomography Image Storage'
-            ## Bscans
-            sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-            if not os.path.exists(sop_path): os.makedirs(sop_path) # make pdf (png) folder
-            for bscan in metadata['bscan_images'].keys():
-                metadata['bscan_images'][bscan].save(os.path.join(sop_path, f"{bscan}.png"))
-            ## En Face
-            metadata['en_face_image'].save(os.path.join(sop_path, f"en_face_from_max_operation_across_bscans.png"))
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.66':
-            # Spatial Registration Storage
-            with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}.json")
-                file.write(json.dumps(metadata, indent=4))
-
-            
+    handlers = {
+        # 'Ophthalmic Photography 8 Bit Image Storage'
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.1', None): Handler('_parse_photo', '_preview_image', pixel_data=True,
+                                                            tags=["Laterality", "PixelSpacing", (0x2201, 0x1000)]),
+        # 'Ophthalmic Photography 16 Bit Image Storage'
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.2', None): Handler('_parse_photo', '_preview_image', pixel_data=True,
+                                                            tags=["Laterality", "PixelSpacing", (0x2201, 0x1000)]),
+        # 'Encapsulated PDF Storage'
+        ('1.2.840.10008.5.1.4.1.1.104.1', None): Handler('_parse_pdf', '_preview_pdf_pages', tags=PDF_TAGS),
+        # 'Ophthalmic Tomography Image Storage'
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.4', None): Handler('_parse_oct_volume', '_preview_oct_volume', pixel_data=True, tags=[]),
+        # Spatial Registration Storage
+        ('1.2.840.10008.5.1.4.1.1.66', 'Macular Thickness'): CIRRUS_HD_OCT.MACULAR_THICKNESS,
+        ('1.2.840.10008.5.1.4.1.1.66', 'Macular Cube 512x128'): CIRRUS_HD_OCT.MACULAR_CUBE,
+        ('1.2.840.10008.5.1.4.1.1.66', 'Glaucoma OU Analysis'): CIRRUS_HD_OCT.GLAUCOMA_ANALYSIS,
+        ('1.2.840.10008.5.1.4.1.1.66', 'Optic Disc Cube 200x200'): CIRRUS_HD_OCT.OPTIC_DISC_CUBE,
+        ('1.2.840.10008.5.1.4.1.1.66', 'Guided Progression Analysis'): CIRRUS_HD_OCT.GLAUCOMA_ANALYSIS,
+        ('1.2.840.10008.5.1.4.1.1.66', None): CIRRUS_HD_OCT.SPATIAL_REGISTRATION_JSON,
+    }
+
+    def _parse_photo(self, metadata):
+        # 'Ophthalmic Photography 8 Bit Image Storage'
+        pixel_array = self.get_pixel_array()
+        image = self._image(pixel_array)
+        metadata['image_PIL'] = image
+        # Laterality
+        metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
+        # Bits Allocated
+        metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
+        # Photometric Interpretation
+        metadata["Photometric Interpretation"] = self.ds.get("PhotometricInterpretation", "Unknown")
+        # Pixel Spacing
+        metadata["Pixel Spacing"] = self.ds.get("PixelSpacing", "Unknown")
+        # Private Tags
+        metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
+
+    def _parse_oct_volume(self, metadata):
+        # 'Ophthalmic Tomography Image Storage'
+        pixel_array = self.get_pixel_array()
+        # One 8-bit volume for both, so the en face uses the same window as the B-scans
+        pixel_array = to_8bit(pixel_array, self.ds)
+        metadata['bscan_images'] = self._bscans(pixel_array)
+        en_face_image = self._image(np.max(pixel_array, axis=1))  # Collapse the depth axis
+        metadata['en_face_image'] = en_face_image
+
+    def _preview_oct_volume(self, output_path, metadata):
+        # 'Ophthalmic Tomography Image Storage'
+        ## Bscans
+        sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
+        if not os.path.exists(sop_path): os.makedirs(sop_path) # make pdf (png) folder
+        for bscan, image in iter_bscan_images(metadata['bscan_images']):
+            image.save(os.path.join(sop_path, f"{bscan}.png"))
+        ## En Face
+        to_pil(metadata['en_face_image']).save(os.path.join(sop_path, f"en_face_from_max_operation_across_bscans.png"))
 
 
 # The String is from the ManufacturerModelName field in the DICOM file
@@ -1136,39 +725,27 @@ class CLARUS_700(DICOMParser):
         }
     """
 
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.1':
-            # 'Ophthalmic Photography 8 Bit Image Storage'
-            try:
-                pixel_array = self.ds.pixel_array
-            except Exception as e:
-                print("pixel array issue")
-                print(repr(e))
-            arr = pixel_array.astype(np.float32)
-            arr[..., 0] = arr[..., 0] + 1.402 * (arr[..., 2] - 128)
-            arr[..., 1] = arr[..., 0] - 0.344136 * (arr[..., 1] - 128) - 0.714136 * (arr[..., 2] - 128)
-            arr[..., 2] = arr[..., 0] + 1.772 * (arr[..., 1] - 128)
-            arr = np.clip(arr, 0, 255).astype(np.uint8)
-            image = Image.fromarray(arr)
-            metadata['image_PIL'] = image
-            # Bits Allocated
-            metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
-            # Photometric Interpretation
-            metadata["Photometric Interpretation"] = f"RGB from {self.ds.get('PhotometricInterpretation', 'Unknown')}" 
-
-        return metadata
+    handlers = {
+        # 'Ophthalmic Photography 8 Bit Image Storage'
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.1', None): Handler('_parse_photo', '_preview_image', pixel_data=True, tags=[]),
+        # 'Ophthalmic Photography 16 Bit Image Storage'
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.2', None): Handler('_parse_photo', '_preview_image', pixel_data=True, tags=[]),
+    }
 
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        # metadata.keys()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.1':
-            # 'Ophthalmic Photography 8 Bit Image Storage'
-            sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-            metadata['image_PIL'].save(os.path.join(output_path, sop_path+".png"))  # To save the image to a file (e.g., PNG format)
-              
+    def _parse_photo(self, metadata):
+        # 'Ophthalmic Photography 8 Bit Image Storage'
+        pixel_array = self.get_pixel_array()
+        arr = pixel_array.astype(np.float32)
+        arr[..., 0] = arr[..., 0] + 1.402 * (arr[..., 2] - 128)
+        arr[..., 1] = arr[..., 0] - 0.344136 * (arr[..., 1] - 128) - 0.714136 * (arr[..., 2] - 128)
+        arr[..., 2] = arr[..., 0] + 1.772 * (arr[..., 1] - 128)
+        arr = np.clip(arr, 0, 255).astype(np.uint8)
+        image = self._image(arr)
+        metadata['image_PIL'] = image
+        # Bits Allocated
+        metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
+        # Photometric Interpretation
+        metadata["Photometric Interpretation"] = f"RGB from {self.ds.get('PhotometricInterpretation', 'Unknown')}" 
 
 
 # The String is from the ManufacturerModelName field in the DICOM file
@@ -1204,40 +781,25 @@ class FORUMGlaucomaWorkplaceParser(DICOMParser):
         }
     """
 
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.80.1':
-            # 'Ophthalmic Visual Field Static Perimetry Measurements Storage'
-            hvf_dicom = File_Utils.read_dicom_from_file(self.dicom_path);
-            hvf_obj = Hvf_Object.get_hvf_object_from_dicom(hvf_dicom);
-            metadata['HVF Object'] = hvf_obj.serialize_to_json()
-
-
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':            
-            metadata['png_pages'] = self._parse_pdf_pages()
-        
-        # Series Description
-        metadata["Series Description"] = self.ds.get("SeriesDescription", "Unknown") # will have SFA\GPA
+    include_series_description = True # will have SFA\GPA
+    handlers = {
+        # 'Ophthalmic Visual Field Static Perimetry Measurements Storage'
+        ('1.2.840.10008.5.1.4.1.1.80.1', None): Handler('_parse_hvf', '_preview_hvf'),
+        # 'Encapsulated PDF Storage'
+        ('1.2.840.10008.5.1.4.1.1.104.1', None): Handler('_parse_pdf', '_preview_pdf_pages', tags=PDF_TAGS),
+    }
 
-        return metadata
+    def _parse_hvf(self, metadata):
+        # 'Ophthalmic Visual Field Static Perimetry Measurements Storage'
+        # The dataset is already in memory, no need for File_Utils.read_dicom_from_file
+        hvf_obj = Hvf_Object.get_hvf_object_from_dicom(self.ds)
+        metadata['HVF Object'] = hvf_obj.serialize_to_json()
 
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        metadata.keys()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.80.1':
-            # with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
-                # file.write(metadata['HVF Object'])
-            sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}.json")
-            File_Utils.write_string_to_file(metadata['HVF Object'], sop_path)
-            
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-            if not os.path.exists(sop_path): os.makedirs(sop_path) # make pdf (png) folder
-            for page in metadata['png_pages'].keys():
-                metadata['png_pages'][page]['page_PIL'].save(os.path.join(sop_path, f"{page}.png"))
+    def _preview_hvf(self, output_path, metadata):
+        # with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
+            # file.write(metadata['HVF Object'])
+        sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}.json")
+        File_Utils.write_string_to_file(metadata['HVF Object'], sop_path)
 
 
 
@@ -1256,35 +818,20 @@ class HFA_3(DICOMParser):
         }
     """
 
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.66':
-            # Spatial Registration Storage
-            # Laterality
-            metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-            # Acquisition Context Sequence
-            AcquisitionContextSequence = []
-            for ContextSequence in self.ds.get("AcquisitionContextSequence", "Unknown"):
-                CS = {
-                    "CodeMeaning": ContextSequence.ConceptNameCodeSequence[0].CodeMeaning,
-                }
-                AcquisitionContextSequence.append(CS)
-            # Private Tags
-            metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201, 0x1000)]])
-            metadata['(0x0301, 0x1008)'] = f"{self.ds[(0x0301, 0x1008)].VR}: Array of {len(self.ds[(0x0301, 0x1008)].value)} elements"
-
-
-        return metadata
-
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.66':
-            # Spatial Registration Storage
-            with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}.json")
-                file.write(json.dumps(metadata, indent=4))
+    handlers = {
+        # Spatial Registration Storage
+        ('1.2.840.10008.5.1.4.1.1.66', None): Handler('_parse_spatial_registration', '_preview_json',
+                                                      tags=["Laterality", "AcquisitionContextSequence",
+                                                            (0x2201, 0x1000), (0x0301, 0x1008)]),
+    }
+
+    def _parse_spatial_registration(self, metadata):
+        # Spatial Registration Storage
+        # Laterality
+        metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
+        # Private Tags
+        metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201, 0x1000)]])
+        metadata['(0x0301, 0x1008)'] = array_summary(self.ds, (0x0301, 0x1008))
                 
 
 # The String is from the ManufacturerModelName field in the DICOM file
@@ -1301,152 +848,145 @@ class Humphrey_Field_Analyzer_3(DICOMParser):
         }
     """
 
-    def parse(self, attempt_to_extract_dicom_tags_not_pixel_datas=False):
-        metadata = self.extract_common_metadata()
-        # self._write_detailed_dicom_header_to_file("/scratch90/QTIM/Active/23-0284/dashboard/Data/forum_all_image_classification/Humphrey Field Analyzer 3/OP/Ophthalmic Photography 8 Bit Image Storage/Tag not found")
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.1':
-            if not attempt_to_extract_dicom_tags_not_pixel_datas:
-                # 'Ophthalmic Photography 8 Bit Image Storage'
-                try:
-                    pixel_array = self.ds.pixel_array
-                except Exception as e:
-                    print("pixel array issue")
-                    print(repr(e))
-                bscan_count = pixel_array.shape[0]
-                bscan_images = {}
-                for i in range(bscan_count):
-                    bscan_image = Image.fromarray(pixel_array[i, :, :])
-                    bscan_images[f"bscan{i+1}"] = bscan_image
-                metadata['bscan_images'] = bscan_images
-            elif attempt_to_extract_dicom_tags_not_pixel_datas:
-                # BB - I wrote this elif for the purpose of extracting the dicom tags that are not pixel data
-                # Dictionary to accumulate sum and count for each (x, y) coordinate
-                coord_value_map = defaultdict(lambda: {
-                    "raw_sum": 0, "abs_sum": 0, "pattern_sum": 0, "abs_perc_sum": 0, "pattern_perc_sum": 0,
-                    "count": 0
-                })
-                # Iterate over perimetry test points
-                for frame_data in self.ds[(0x0303, 0x1010)].value:
-                    def get_value(tag, default=np.nan):
-                        """Safely get a DICOM tag value, returning NaN if missing."""
-                        elem = frame_data.get(tag)
-                        return elem.value if elem is not None else default
-
-                    x = get_value((0x0303, 0x1013))  # X Coordinate
-                    y = get_value((0x0303, 0x1014))  # Y Coordinate
-                    raw_value = get_value((0x0303, 0x1017))  # Raw Threshold Sensitivity (dB)
-                    abs_value = get_value((0x0303, 0x101d))  # Absolute Value (if available)
-                    pattern_value = get_value((0x0303, 0x101e))  # Pattern Deviation
-                    abs_perc = get_value((0x0303, 0x101a))  # Absolute Percentile
-                    pattern_perc = get_value((0x0303, 0x101c))  # Pattern Percentile
-
-                    # Accumulate sum and count for each (x, y) coordinate
-                    coord_value_map[(x, y)]["raw_sum"] += raw_value
-                    coord_value_map[(x, y)]["abs_sum"] += abs_value
-                    coord_value_map[(x, y)]["pattern_sum"] += pattern_value
-                    coord_value_map[(x, y)]["abs_perc_sum"] += abs_perc
-                    coord_value_map[(x, y)]["pattern_perc_sum"] += pattern_perc
-                    coord_value_map[(x, y)]["count"] += 1  # Track number of occurrences
-
-                # Compute averaged values
-                unique_x_coords, unique_y_coords = [], []
-                unique_raw_values, unique_abs_values = [], []
-                unique_pattern_values, unique_abs_percentile, unique_pattern_percentile = [], [], []
-
-                for (x, y), data in coord_value_map.items():
-                    count = data["count"]
-
-                    unique_x_coords.append(x)
-                    unique_y_coords.append(y)
-                    unique_raw_values.append(data["raw_sum"]) # / count)
-                    unique_abs_values.append(data["abs_sum"]) # / count)
-                    unique_pattern_values.append(data["pattern_sum"]) # / count)
-                    unique_abs_percentile.append(data["abs_perc_sum"] / count)
-                    unique_pattern_percentile.append(data["pattern_perc_sum"] / count)
-
-                # Convert to numpy arrays
-                unique_x_coords = np.array(unique_x_coords)
-                unique_y_coords = np.array(unique_y_coords)
-                unique_raw_values = np.nan_to_num(np.array(unique_raw_values, dtype=np.float64), nan=0)
-                unique_abs_values = np.nan_to_num(np.array(unique_abs_values, dtype=np.float64), nan=0)
-                unique_pattern_values = np.nan_to_num(np.array(unique_pattern_values, dtype=np.float64), nan=0)
-                unique_abs_percentile = np.nan_to_num(np.array(unique_abs_percentile, dtype=np.float64), nan=0)
-                unique_pattern_percentile = np.nan_to_num(np.array(unique_pattern_percentile, dtype=np.float64), nan=0)
-
-                # Plot setup: 3 rows, 2 columns (first row spans both columns)
-                fig, axes = plt.subplots(3, 2, figsize=(12, 16), gridspec_kw={'height_ratios': [1.5, 1, 1]})
-                fig.subplots_adjust(hspace=0.4, wspace=0.3)
-
-                # Function to plot text annotations
-                def plot_text(ax, values, title):
-                    ax.scatter(unique_x_coords, unique_y_coords, color="gray", s=1, alpha=0.1)  # Faint reference points
-                    for x, y, val in zip(unique_x_coords, unique_y_coords, values):
-                        ax.text(x, y, f"{int(val)}", fontsize=10, ha='center', va='bottom', fontweight='bold')
-                    ax.set_xlabel("X Coordinate (Visual Field)")
-                    ax.set_ylabel("Y Coordinate (Visual Field)")
-                    ax.set_title(title)
-                    ax.set_xticks([])
-                    ax.set_yticks([])
-                    ax.grid(True, linestyle='--', alpha=0.5)
-
-                # First row (full width)
-                plot_text(axes[0, 0], unique_raw_values, "Raw Threshold Sensitivity (dB)")
-                axes[0, 1].axis("off")  # Disable the second subplot in the first row
-
-                # Second row
-                plot_text(axes[1, 0], unique_abs_values, "Absolute Values")
-                plot_text(axes[1, 1], unique_pattern_values, "Pattern Deviation")
-
-                # Third row
-                plot_text(axes[2, 0], unique_abs_percentile, "Absolute Percentile")
-                plot_text(axes[2, 1], unique_pattern_percentile, "Pattern Percentile")
-
-                # plt.savefig(".....09.png")
-                # Convert plot to a PIL Image
-                # buf = BytesIO()
-                # plt.savefig(buf, format="PNG", bbox_inches='tight', pad_inches=0.1)
-                # plt.close(fig)
-                # buf.seek(0)
-                # image = Image.open(buf)  # Convert buffer into a PIL image
-                # Extract perimetry data from private tags
-                # 'Ophthalmic Photography 8 Bit Image Storage'
-                # try:
-                #     pixel_array = self.ds.pixel_array
-                # except Exception as e:
-                #     print("pixel array issue")
-                #     print(repr(e))
-                # image = Image.fromarray(pixel_array[1, :, :])  # First frame of 252...this might be even more raw
-                # metadata['image_PIL'] = image
-                self.ds.get("SeriesDescription", "Unknown")
-                # Number of Frames
-                metadata["Number of Frames"] = self.ds.get("NumberOfFrames", "Unknown")
-                # Laterality
-                metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
-                # Bits Allocated
-                metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
-                # Photometric Interpretation
-                metadata["Photometric Interpretation"] = self.ds.get("PhotometricInterpretation", "Unknown")
-
-
-        return metadata
+    handlers = {
+        # 'Ophthalmic Photography 8 Bit Image Storage'
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.1', None): Handler('_parse_photo', '_preview_photo', pixel_data=True,
+                                                            tags=["Laterality", (0x0303, 0x1010)]),
+    }
+
+    def preview(self, output_path, write_dicom_header=False, keep_pixel_data=True, as_array=False,
+                attempt_to_extract_dicom_tags_not_pixel_datas=False, **options):
+        return super().preview(output_path, write_dicom_header=write_dicom_header, keep_pixel_data=keep_pixel_data,
+                               as_array=as_array,
+                               attempt_to_extract_dicom_tags_not_pixel_datas=attempt_to_extract_dicom_tags_not_pixel_datas,
+                               **options)
+
+    def _parse_photo(self, metadata, attempt_to_extract_dicom_tags_not_pixel_datas=False):
+        if not attempt_to_extract_dicom_tags_not_pixel_datas:
+            # 'Ophthalmic Photography 8 Bit Image Storage'
+            pixel_array = self.get_pixel_array()
+            metadata['bscan_images'] = self._bscans(pixel_array)
+        elif attempt_to_extract_dicom_tags_not_pixel_datas:
+            # BB - I wrote this elif for the purpose of extracting the dicom tags that are not pixel data
+            # Dictionary to accumulate sum and count for each (x, y) coordinate
+            coord_value_map = defaultdict(lambda: {
+                "raw_sum": 0, "abs_sum": 0, "pattern_sum": 0, "abs_perc_sum": 0, "pattern_perc_sum": 0,
+                "count": 0
+            })
+            # Iterate over perimetry test points
+            for frame_data in self.ds[(0x0303, 0x1010)].value:
+                def get_value(tag, default=np.nan):
+                    """Safely get a DICOM tag value, returning NaN if missing."""
+                    elem = frame_data.get(tag)
+                    return elem.value if elem is not None else default
+
+                x = get_value((0x0303, 0x1013))  # X Coordinate
+                y = get_value((0x0303, 0x1014))  # Y Coordinate
+                raw_value = get_value((0x0303, 0x1017))  # Raw Threshold Sensitivity (dB)
+                abs_value = get_value((0x0303, 0x101d))  # Absolute Value (if available)
+                pattern_value = get_value((0x0303, 0x101e))  # Pattern Deviation
+                abs_perc = get_value((0x0303, 0x101a))  # Absolute Percentile
+                pattern_perc = get_value((0x0303, 0x101c))  # Pattern Percentile
+
+                # Accumulate sum and count for each (x, y) coordinate
+                coord_value_map[(x, y)]["raw_sum"] += raw_value
+                coord_value_map[(x, y)]["abs_sum"] += abs_value
+                coord_value_map[(x, y)]["pattern_sum"] += pattern_value
+                coord_value_map[(x, y)]["abs_perc_sum"] += abs_perc
+                coord_value_map[(x, y)]["pattern_perc_sum"] += pattern_perc
+                coord_value_map[(x, y)]["count"] += 1  # Track number of occurrences
+
+            # Compute averaged values
+            unique_x_coords, unique_y_coords = [], []
+            unique_raw_values, unique_abs_values = [], []
+            unique_pattern_values, unique_abs_percentile, unique_pattern_percentile = [], [], []
+
+            for (x, y), data in coord_value_map.items():
+                count = data["count"]
+
+                unique_x_coords.append(x)
+                unique_y_coords.append(y)
+                unique_raw_values.append(data["raw_sum"]) # / count)
+                unique_abs_values.append(data["abs_sum"]) # / count)
+                unique_pattern_values.append(data["pattern_sum"]) # / count)
+                unique_abs_percentile.append(data["abs_perc_sum"] / count)
+                unique_pattern_percentile.append(data["pattern_perc_sum"] / count)
+
+            # Convert to numpy arrays
+            unique_x_coords = np.array(unique_x_coords)
+            unique_y_coords = np.array(unique_y_coords)
+            unique_raw_values = np.nan_to_num(np.array(unique_raw_values, dtype=np.float64), nan=0)
+            unique_abs_values = np.nan_to_num(np.array(unique_abs_values, dtype=np.float64), nan=0)
+            unique_pattern_values = np.nan_to_num(np.array(unique_pattern_values, dtype=np.float64), nan=0)
+            unique_abs_percentile = np.nan_to_num(np.array(unique_abs_percentile, dtype=np.float64), nan=0)
+            unique_pattern_percentile = np.nan_to_num(np.array(unique_pattern_percentile, dtype=np.float64), nan=0)
+
+            # Plot setup: 3 rows, 2 columns (first row spans both columns)
+            fig, axes = plt.subplots(3, 2, figsize=(12, 16), gridspec_kw={'height_ratios': [1.5, 1, 1]})
+            fig.subplots_adjust(hspace=0.4, wspace=0.3)
+
+            # Function to plot text annotations
+            def plot_text(ax, values, title):
+                ax.scatter(unique_x_coords, unique_y_coords, color="gray", s=1, alpha=0.1)  # Faint reference points
+                for x, y, val in zip(unique_x_coords, unique_y_coords, values):
+                    ax.text(x, y, f"{int(val)}", fontsize=10, ha='center', va='bottom', fontweight='bold')
+                ax.set_xlabel("X Coordinate (Visual Field)")
+                ax.set_ylabel("Y Coordinate (Visual Field)")
+                ax.set_title(title)
+                ax.set_xticks([])
+                ax.set_yticks([])
+                ax.grid(True, linestyle='--', alpha=0.5)
+
+            # First row (full width)
+            plot_text(axes[0, 0], unique_raw_values, "Raw Threshold Sensitivity (dB)")
+            axes[0, 1].axis("off")  # Disable the second subplot in the first row
+
+            # Second row
+            plot_text(axes[1, 0], unique_abs_values, "Absolute Values")
+            plot_text(axes[1, 1], unique_pattern_values, "Pattern Deviation")
+
+            # Third row
+            plot_text(axes[2, 0], unique_abs_percentile, "Absolute Percentile")
+            plot_text(axes[2, 1], unique_pattern_percentile, "Pattern Percentile")
+
+            # plt.savefig(".....09.png")
+            # Convert plot to a PIL Image
+            # buf = BytesIO()
+            # plt.savefig(buf, format="PNG", bbox_inches='tight', pad_inches=0.1)
+            # plt.close(fig)
+            # buf.seek(0)
+            # image = Image.open(buf)  # Convert buffer into a PIL image
+            # Extract perimetry data from private tags
+            # 'Ophthalmic Photography 8 Bit Image Storage'
+            # try:
+            #     pixel_array = self.ds.pixel_array
+            # except Exception as e:
+            #     print("pixel array issue")
+            #     print(repr(e))
+            # image = Image.fromarray(pixel_array[1, :, :])  # First frame of 252...this might be even more raw
+            # metadata['image_PIL'] = image
+            self.ds.get("SeriesDescription", "Unknown")
+            # Number of Frames
+            metadata["Number of Frames"] = self.ds.get("NumberOfFrames", "Unknown")
+            # Laterality
+            metadata["Laterality"] = self.ds.get("Laterality", "Unknown")
+            # Bits Allocated
+            metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
+            # Photometric Interpretation
+            metadata["Photometric Interpretation"] = self.ds.get("PhotometricInterpretation", "Unknown")
 
-    def preview(self, output_path, attempt_to_extract_dicom_tags_not_pixel_datas=False, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        # metadata.keys()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.1':
-            if not attempt_to_extract_dicom_tags_not_pixel_datas:
-                # 'Ophthalmic Tomography Image Storage'
-                ## Bscans
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-                if not os.path.exists(sop_path): os.makedirs(sop_path) # make pdf (png) folder
-                for bscan in metadata['bscan_images'].keys():
-                    metadata['bscan_images'][bscan].save(os.path.join(sop_path, f"{bscan}.png"))
-            elif attempt_to_extract_dicom_tags_not_pixel_datas:
-                # A PNG of HVF plots derived from tags...extremely experimental...not sure if it will work
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-                metadata['image_PIL'].save(os.path.join(output_path, sop_path+".png"))  # To save the image to a file (e.g., PNG format)
+    def _preview_photo(self, output_path, metadata, attempt_to_extract_dicom_tags_not_pixel_datas=False):
+        if not attempt_to_extract_dicom_tags_not_pixel_datas:
+            # 'Ophthalmic Tomography Image Storage'
+            ## Bscans
+            sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
+            if not os.path.exists(sop_path): os.makedirs(sop_path) # make pdf (png) folder
+            for bscan, image in iter_bscan_images(metadata['bscan_images']):
+                image.save(os.path.join(sop_path, f"{bscan}.png"))
+        elif attempt_to_extract_dicom_tags_not_pixel_datas:
+            # A PNG of HVF plots derived from tags...extremely experimental...not sure if it will work
+            sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
+            to_pil(metadata['image_PIL']).save(os.path.join(output_path, sop_path+".png"))  # To save the image to a file (e.g., PNG format)
         
             
 
@@ -1471,572 +1011,554 @@ class IOLMaster_700(DICOMParser):
         }
     """
 
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.1':
-            # 'Ophthalmic Photography 8 Bit Image Storage'
-            try:
-                pixel_array = self.ds.pixel_array
-            except Exception as e:
-                print("pixel array issue")
-                print(repr(e))
-            image = Image.fromarray(pixel_array)
-            metadata['image_PIL'] = image
-            # Bits Allocated
-            metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
-            # Photometric Interpretation
-            metadata["Photometric Interpretation"] = self.ds.get("PhotometricInterpretation", "Unknown")
-            # Pixel Spacing
-            metadata["Pixel Spacing"] = self.ds.get("PixelSpacing", "Unknown")
-
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.7.2':
-            # Multi-frame True Color Secondary Capture Image Storage"
-            try:
-                pixel_array = self.ds.pixel_array
-            except Exception as e:
-                print("pixel array issue")
-                print(repr(e))
-            bscan_count = pixel_array.shape[0]
-            bscan_images = {}
-            for i in range(bscan_count):
-                bscan_image = Image.fromarray(pixel_array[i, :, :])
-
-                bscan_images[f"bscan{i+1}"] = bscan_image
-            metadata['bscan_images'] = bscan_images
-
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            metadata['png_pages'] = self._parse_pdf_pages()
-
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.78.8':
-            # 'Intraocular Lens Calculations Storage'
-            # Private Tags
-            metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-            # ReferencedInstanceSequence
-            IntraocularLensCalculationsLeftEyeSequence = []
-            for InstanceSequence in self.ds.get("IntraocularLensCalculationsLeftEyeSequence", "Unknown"):
-                IOLPowerSequence = []
-                for Sequence in InstanceSequence.IOLPowerSequence:
-                    SequenceDict = {
-                        "Pre-Selected for Implantation":Sequence.PreSelectedForImplantation,
-                        "IOL Power":Sequence.IOLPower,
-                        "Predicted Refractive Error":Sequence.PredictedRefractiveError,
-                        "Implant Part Number":Sequence.ImplantPartNumber,
-                    }
-                    IOLPowerSequence.append(SequenceDict)
-                LensConstantSequence = []
-                for Sequence in InstanceSequence.LensConstantSequence:
-                    SequenceDict = {
-                        "Code Value": Sequence.ConceptNameCodeSequence[0].CodeValue,
-                        "Code Meaning": Sequence.ConceptNameCodeSequence[0].CodeMeaning,
-                    }
-                    LensConstantSequence.append(SequenceDict)
-                LensThicknessSequence = []
-                for Sequence in InstanceSequence.LensThicknessSequence:
-                    Sequence = InstanceSequence.LensThicknessSequence[0]
-                    SequenceDict = {
-                        "Lens Thickness": Sequence.LensThickness, 
-                        "Code Value": Sequence.SourceOfLensThicknessDataCodeSequence[0].CodeValue,
-                        "Code Meaning": Sequence.SourceOfLensThicknessDataCodeSequence[0].CodeMeaning,
-                    }
-                    LensThicknessSequence.append(SequenceDict)
-                AnteriorChamberDepthSequence = []
-                for Sequence in InstanceSequence.AnteriorChamberDepthSequence:
-                    SequenceDict = {
-                        "Anterior Chamber Depth": Sequence.AnteriorChamberDepth,
-                        "Source of Anterior Chamber Depth Data Code Sequence": {
-                            "Code Value": Sequence.SourceOfAnteriorChamberDepthDataCodeSequence[0].CodeValue,
-                            "Code Meaning": Sequence.SourceOfAnteriorChamberDepthDataCodeSequence[0].CodeMeaning,
-                        }
+    handlers = {
+        # 'Ophthalmic Photography 8 Bit Image Storage'
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.1', None): Handler('_parse_photo', '_preview_image', pixel_data=True,
+                                                            tags=["PixelSpacing"]),
+        # 'Ophthalmic Photography 16 Bit Image Storage'
+        ('1.2.840.10008.5.1.4.1.1.77.1.5.2', None): Handler('_parse_photo', '_preview_image', pixel_data=True,
+                                                            tags=["PixelSpacing"]),
+        # Multi-frame True Color Secondary Capture Image Storage
+        ('1.2.840.10008.5.1.4.1.1.7.2', None): Handler('_parse_bscans', '_preview_bscans', pixel_data=True, tags=[]),
+        # 'Encapsulated PDF Storage'
+        ('1.2.840.10008.5.1.4.1.1.104.1', None): Handler('_parse_pdf', '_preview_pdf_pages', tags=PDF_TAGS),
+        # 'Intraocular Lens Calculations Storage'
+        ('1.2.840.10008.5.1.4.1.1.78.8', None): Handler('_parse_iol_calculations', '_preview_json',
+                                                        tags=[(0x2201, 0x1000), "IntraocularLensCalculationsLeftEyeSequence",
+                                                              "MeasurementLaterality", "ReferencedRefractiveMeasurementsSequence"]),
+        # 'Ophthalmic Axial Measurements Storage'
+        ('1.2.840.10008.5.1.4.1.1.78.7', None): Handler('_parse_axial_measurements', '_preview_json',
+                                                        tags=["OphthalmicAxialMeasurementsRightEyeSequence",
+                                                              "OphthalmicAxialMeasurementsLeftEyeSequence",
+                                                              "MeasurementLaterality"]),
+        # 'Keratometry Measurements Storage'
+        ('1.2.840.10008.5.1.4.1.1.78.3', None): Handler('_parse_keratometry', '_preview_json',
+                                                        tags=[(0x2201, 0x1000), (0x2201, 0x1002),
+                                                              "KeratometryRightEyeSequence", "KeratometryLeftEyeSequence",
+                                                              (0x1201, 0x1001), (0x1201, 0x1002), (0x1201, 0x1008), (0x1201, 0x1009),
+                                                              (0x1201, 0x100f), (0x1201, 0x1010), (0x1201, 0x1018), (0x1201, 0x1019),
+                                                              (0x1203, 0x1001), (0x1203, 0x1002)]),
+    }
+
+    def _parse_photo(self, metadata):
+        # 'Ophthalmic Photography 8 Bit Image Storage'
+        pixel_array = self.get_pixel_array()
+        image = self._image(pixel_array)
+        metadata['image_PIL'] = image
+        # Bits Allocated
+        metadata["Bits Allocated"] = self.ds.get("BitsAllocated", "Unknown")
+        # Photometric Interpretation
+        metadata["Photometric Interpretation"] = self.ds.get("PhotometricInterpretation", "Unknown")
+        # Pixel Spacing
+        metadata["Pixel Spacing"] = self.ds.get("PixelSpacing", "Unknown")
+
+    def _parse_iol_calculations(self, metadata):
+        # 'Intraocular Lens Calculations Storage'
+        # Private Tags
+        metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
+        # ReferencedInstanceSequence
+        IntraocularLensCalculationsLeftEyeSequence = []
+        for InstanceSequence in self.ds.get("IntraocularLensCalculationsLeftEyeSequence", "Unknown"):
+            IOLPowerSequence = []
+            for Sequence in InstanceSequence.IOLPowerSequence:
+                SequenceDict = {
+                    "Pre-Selected for Implantation":Sequence.PreSelectedForImplantation,
+                    "IOL Power":Sequence.IOLPower,
+                    "Predicted Refractive Error":Sequence.PredictedRefractiveError,
+                    "Implant Part Number":Sequence.ImplantPartNumber,
+                }
+                IOLPowerSequence.append(SequenceDict)
+            LensConstantSequence = []
+            for Sequence in InstanceSequence.LensConstantSequence:
+                SequenceDict = {
+                    "Code Value": Sequence.ConceptNameCodeSequence[0].CodeValue,
+                    "Code Meaning": Sequence.ConceptNameCodeSequence[0].CodeMeaning,
+                }
+                LensConstantSequence.append(SequenceDict)
+            LensThicknessSequence = []
+            for Sequence in InstanceSequence.LensThicknessSequence:
+                Sequence = InstanceSequence.LensThicknessSequence[0]
+                SequenceDict = {
+                    "Lens Thickness": Sequence.LensThickness, 
+                    "Code Value": Sequence.SourceOfLensThicknessDataCodeSequence[0].CodeValue,
+                    "Code Meaning": Sequence.SourceOfLensThicknessDataCodeSequence[0].CodeMeaning,
+                }
+                LensThicknessSequence.append(SequenceDict)
+            AnteriorChamberDepthSequence = []
+            for Sequence in InstanceSequence.AnteriorChamberDepthSequence:
+                SequenceDict = {
+                    "Anterior Chamber Depth": Sequence.AnteriorChamberDepth,
+                    "Source of Anterior Chamber Depth Data Code Sequence": {
+                        "Code Value": Sequence.SourceOfAnteriorChamberDepthDataCodeSequence[0].CodeValue,
+                        "Code Meaning": Sequence.SourceOfAnteriorChamberDepthDataCodeSequence[0].CodeMeaning,
                     }
-                    AnteriorChamberDepthSequence.append(SequenceDict)
-                CornealSizeSequence = []
-                for Sequence in InstanceSequence.CornealSizeSequence:
-                    SequenceDict = {
-                        "Corneal Size": Sequence.CornealSize,
-                        "Source of Corneal Size Data Code Sequence": {
-                            "Code Value": Sequence.SourceOfCornealSizeDataCodeSequence[0].CodeValue,
-                            "Code Meaning": Sequence.SourceOfCornealSizeDataCodeSequence[0].CodeMeaning,
-                        }
+                }
+                AnteriorChamberDepthSequence.append(SequenceDict)
+            CornealSizeSequence = []
+            for Sequence in InstanceSequence.CornealSizeSequence:
+                SequenceDict = {
+                    "Corneal Size": Sequence.CornealSize,
+                    "Source of Corneal Size Data Code Sequence": {
+                        "Code Value": Sequence.SourceOfCornealSizeDataCodeSequence[0].CodeValue,
+                        "Code Meaning": Sequence.SourceOfCornealSizeDataCodeSequence[0].CodeMeaning,
                     }
-                    CornealSizeSequence.append(SequenceDict)
-                SteepKeratometricAxisSequence = []
-                for Sequence in InstanceSequence.SteepKeratometricAxisSequence:
-                    SequenceDict = {
-                        "Radius of Curvature": Sequence.RadiusOfCurvature,
-                        "Keratometric Power": Sequence.KeratometricPower,
-                        "Keratometric Axis": Sequence.KeratometricAxis,
+                }
+                CornealSizeSequence.append(SequenceDict)
+            SteepKeratometricAxisSequence = []
+            for Sequence in InstanceSequence.SteepKeratometricAxisSequence:
+                SequenceDict = {
+                    "Radius of Curvature": Sequence.RadiusOfCurvature,
+                    "Keratometric Power": Sequence.KeratometricPower,
+                    "Keratometric Axis": Sequence.KeratometricAxis,
+                }
+                SteepKeratometricAxisSequence.append(SequenceDict)
+            FlatKeratometricAxisSequence = []
+            for Sequence in InstanceSequence.FlatKeratometricAxisSequence:
+                SequenceDict = {
+                    "Radius of Curvature": Sequence.RadiusOfCurvature,
+                    "Keratometric Power": Sequence.KeratometricPower,
+                    "Keratometric Axis": Sequence.KeratometricAxis,
+                }
+                FlatKeratometricAxisSequence.append(SequenceDict)
+            
+            CorneaMeasurementsSequence = []
+            for Sequence in InstanceSequence.CorneaMeasurementsSequence:
+                SteepCornealAxisSequence = []
+                for SteepSequence in Sequence.SteepCornealAxisSequence:
+                    SteepSequenceDict = {
+                        "Radius of Curvature": SteepSequence.RadiusOfCurvature,
+                        "Corneal Power": SteepSequence.CornealPower,
+                        "Corneal Axis": SteepSequence.CornealAxis,
                     }
-                    SteepKeratometricAxisSequence.append(SequenceDict)
-                FlatKeratometricAxisSequence = []
-                for Sequence in InstanceSequence.FlatKeratometricAxisSequence:
-                    SequenceDict = {
-                        "Radius of Curvature": Sequence.RadiusOfCurvature,
-                        "Keratometric Power": Sequence.KeratometricPower,
-                        "Keratometric Axis": Sequence.KeratometricAxis,
+                    SteepCornealAxisSequence.append(SteepSequenceDict)
+
+                FlatCornealAxisSequence = []
+                for FlatSequence in Sequence.FlatCornealAxisSequence:
+                    FlatSequenceDict = {
+                        "Radius of Curvature": FlatSequence.RadiusOfCurvature,
+                        "Corneal Power": FlatSequence.CornealPower,
+                        "Corneal Axis": FlatSequence.CornealAxis,
                     }
-                    FlatKeratometricAxisSequence.append(SequenceDict)
-                
-                CorneaMeasurementsSequence = []
-                for Sequence in InstanceSequence.CorneaMeasurementsSequence:
-                    SteepCornealAxisSequence = []
-                    for SteepSequence in Sequence.SteepCornealAxisSequence:
-                        SteepSequenceDict = {
-                            "Radius of Curvature": SteepSequence.RadiusOfCurvature,
-                            "Corneal Power": SteepSequence.CornealPower,
-                            "Corneal Axis": SteepSequence.CornealAxis,
-                        }
-                        SteepCornealAxisSequence.append(SteepSequenceDict)
-
-                    FlatCornealAxisSequence = []
-                    for FlatSequence in Sequence.FlatCornealAxisSequence:
-                        FlatSequenceDict = {
-                            "Radius of Curvature": FlatSequence.RadiusOfCurvature,
-                            "Corneal Power": FlatSequence.CornealPower,
-                            "Corneal Axis": FlatSequence.CornealAxis,
-                        }
-                        FlatCornealAxisSequence.append(FlatSequenceDict)
-
-                    CorneaMeasurementMethodCodeSequence = []
-                    for MethodSequence in Sequence.CorneaMeasurementMethodCodeSequence:
-                        MethodSequenceDict = {
-                            "Code Value": MethodSequence.CodeValue,
-                            "Code Meaning": MethodSequence.CodeMeaning,
-                        }
-                        CorneaMeasurementMethodCodeSequence.append(MethodSequenceDict)
-
-                    SequenceDict = {
-                        "Keratometer Index": Sequence.KeratometerIndex,
-                        "Source of Cornea Measurement Data Code Sequence": {
-                            "Code Value": Sequence.SourceOfCorneaMeasurementDataCodeSequence[0].CodeValue,
-                            "Code Meaning": Sequence.SourceOfCorneaMeasurementDataCodeSequence[0].CodeMeaning,
-                        },
-                        "Steep Corneal Axis Sequence": SteepCornealAxisSequence,
-                        "Flat Corneal Axis Sequence": FlatCornealAxisSequence,
-                        "Cornea Measurement Method Code Sequence": CorneaMeasurementMethodCodeSequence,
+                    FlatCornealAxisSequence.append(FlatSequenceDict)
+
+                CorneaMeasurementMethodCodeSequence = []
+                for MethodSequence in Sequence.CorneaMeasurementMethodCodeSequence:
+                    MethodSequenceDict = {
+                        "Code Value": MethodSequence.CodeValue,
+                        "Code Meaning": MethodSequence.CodeMeaning,
                     }
-                    CorneaMeasurementsSequence.append(SequenceDict)
-                IS = {
-                    "Ophthalmic Axial Length Sequence": {
-                        "OphthalmicAxialLength": InstanceSequence.OphthalmicAxialLengthSequence[0].OphthalmicAxialLength,
-                        "Source of Ophthalmic Axial Length Code Sequence": InstanceSequence.OphthalmicAxialLengthSequence[0].SourceOfOphthalmicAxialLengthCodeSequence[0].CodeMeaning,
-                        "Ophthalmic Axial Length Selection Method Code Sequence": InstanceSequence.OphthalmicAxialLengthSequence[0].OphthalmicAxialLengthSelectionMethodCodeSequence[0].CodeMeaning,
-                    },
-                    "IOL Formula Code Sequence": {
-                        "Code Value": InstanceSequence.IOLFormulaCodeSequence[0].CodeValue,
-                        "Code Meaning": InstanceSequence.IOLFormulaCodeSequence[0].CodeMeaning,
+                    CorneaMeasurementMethodCodeSequence.append(MethodSequenceDict)
+
+                SequenceDict = {
+                    "Keratometer Index": Sequence.KeratometerIndex,
+                    "Source of Cornea Measurement Data Code Sequence": {
+                        "Code Value": Sequence.SourceOfCorneaMeasurementDataCodeSequence[0].CodeValue,
+                        "Code Meaning": Sequence.SourceOfCorneaMeasurementDataCodeSequence[0].CodeMeaning,
                     },
-                    "Keratometer Index": InstanceSequence.KeratometerIndex,
-                    "Target Refraction": InstanceSequence.TargetRefraction,
-                    "Refractive Procedure Occurred": InstanceSequence.RefractiveProcedureOccurred,
-                    "Surgically Induced Astigmatism Sequence": {
-                        "Cylinder Axis": InstanceSequence.SurgicallyInducedAstigmatismSequence[0].CylinderAxis,
-                        "Cylinder Power": InstanceSequence.SurgicallyInducedAstigmatismSequence[0].CylinderPower,
+                    "Steep Corneal Axis Sequence": SteepCornealAxisSequence,
+                    "Flat Corneal Axis Sequence": FlatCornealAxisSequence,
+                    "Cornea Measurement Method Code Sequence": CorneaMeasurementMethodCodeSequence,
+                }
+                CorneaMeasurementsSequence.append(SequenceDict)
+            IS = {
+                "Ophthalmic Axial Length Sequence": {
+                    "OphthalmicAxialLength": InstanceSequence.OphthalmicAxialLengthSequence[0].OphthalmicAxialLength,
+                    "Source of Ophthalmic Axial Length Code Sequence": InstanceSequence.OphthalmicAxialLengthSequence[0].SourceOfOphthalmicAxialLengthCodeSequence[0].CodeMeaning,
+                    "Ophthalmic Axial Length Selection Method Code Sequence": InstanceSequence.OphthalmicAxialLengthSequence[0].OphthalmicAxialLengthSelectionMethodCodeSequence[0].CodeMeaning,
+                },
+                "IOL Formula Code Sequence": {
+                    "Code Value": InstanceSequence.IOLFormulaCodeSequence[0].CodeValue,
+                    "Code Meaning": InstanceSequence.IOLFormulaCodeSequence[0].CodeMeaning,
+                },
+                "Keratometer Index": InstanceSequence.KeratometerIndex,
+                "Target Refraction": InstanceSequence.TargetRefraction,
+                "Refractive Procedure Occurred": InstanceSequence.RefractiveProcedureOccurred,
+                "Surgically Induced Astigmatism Sequence": {
+                    "Cylinder Axis": InstanceSequence.SurgicallyInducedAstigmatismSequence[0].CylinderAxis,
+                    "Cylinder Power": InstanceSequence.SurgicallyInducedAstigmatismSequence[0].CylinderPower,
+                },
+                "Type of Optical Correction": InstanceSequence.TypeOfOpticalCorrection,
+                "IOL Power Sequence": IOLPowerSequence,
+                "Lens Constant Sequence": LensConstantSequence,
+                "IOL Manufacturer": InstanceSequence.IOLManufacturer,
+                "Implant Name": InstanceSequence.ImplantName,
+                "Keratometry Measurement Type Code Sequence": {
+                    "Code Value": InstanceSequence.KeratometryMeasurementTypeCodeSequence[0].CodeValue,
+                    "Code Meaning": InstanceSequence.KeratometryMeasurementTypeCodeSequence[0].CodeMeaning,
                     },
-                    "Type of Optical Correction": InstanceSequence.TypeOfOpticalCorrection,
-                    "IOL Power Sequence": IOLPowerSequence,
-                    "Lens Constant Sequence": LensConstantSequence,
-                    "IOL Manufacturer": InstanceSequence.IOLManufacturer,
-                    "Implant Name": InstanceSequence.ImplantName,
-                    "Keratometry Measurement Type Code Sequence": {
-                        "Code Value": InstanceSequence.KeratometryMeasurementTypeCodeSequence[0].CodeValue,
-                        "Code Meaning": InstanceSequence.KeratometryMeasurementTypeCodeSequence[0].CodeMeaning,
-                        },
-                    "IOL Power For Exact Emmetropia": InstanceSequence.IOLPowerForExactEmmetropia,
-                    "IOL Power For Exact Target Refraction": InstanceSequence.IOLPowerForExactTargetRefraction,
-                    "CornealSizeSequence" : CornealSizeSequence,
-                    "AnteriorChamberDepthSequence" : AnteriorChamberDepthSequence,
-                    "SteepKeratometricAxisSequence" : SteepKeratometricAxisSequence,
-                    "FlatKeratometricAxisSequence" : FlatKeratometricAxisSequence,
-                    "CorneaMeasurementsSequence" : CorneaMeasurementsSequence,
+                "IOL Power For Exact Emmetropia": InstanceSequence.IOLPowerForExactEmmetropia,
+                "IOL Power For Exact Target Refraction": InstanceSequence.IOLPowerForExactTargetRefraction,
+                "CornealSizeSequence" : CornealSizeSequence,
+                "AnteriorChamberDepthSequence" : AnteriorChamberDepthSequence,
+                "SteepKeratometricAxisSequence" : SteepKeratometricAxisSequence,
+                "FlatKeratometricAxisSequence" : FlatKeratometricAxisSequence,
+                "CorneaMeasurementsSequence" : CorneaMeasurementsSequence,
 
+            }
+            IntraocularLensCalculationsLeftEyeSequence.append(IS)
+        metadata["IntraocularLensCalculationsLeftEyeSequence"] = IntraocularLensCalculationsLeftEyeSequence
+        metadata["Measurement Laterality"] = self.ds.get("MeasurementLaterality", "Unknown")
+        # ReferencedInstanceSequence
+        ReferencedRefractiveMeasurementsSequence = []
+        for InstanceSequence in self.ds.get("ReferencedRefractiveMeasurementsSequence", "Unknown"):
+            IS = {
+                "ReferencedSOPClassUID": OPHTHALMOLOGY_SOP_CLASSES[InstanceSequence.ReferencedSOPClassUID],
+                "ReferencedSOPInstance_UID": InstanceSequence.ReferencedSOPInstanceUID
+            }
+            ReferencedRefractiveMeasurementsSequence.append(IS)
+        metadata["ReferencedRefractiveMeasurementsSequence"] = ReferencedRefractiveMeasurementsSequence
+
+    def _parse_axial_measurements(self, metadata):
+        # 'Ophthalmic Axial Measurements Right Eye Sequence'
+        # Ophthalmic Axial Length Measurements
+        OphthalmicAxialMeasurementsRightEyeSequence = []
+        for InstanceSequence in self.ds.get("OphthalmicAxialMeasurementsRightEyeSequence", "Unknown"):
+            # Pupil Dilated
+            PupilDilated = InstanceSequence.PupilDilated#######################
+            # Lens Status Code Sequence
+            LensStatusCodeSequence = []#######################
+            for Sequence in InstanceSequence.LensStatusCodeSequence:
+                SequenceDict = {
+                    "Code Value": Sequence.CodeValue,
+                    "Coding Scheme Designator": Sequence.CodingSchemeDesignator,
+                    "Code Meaning": Sequence.CodeMeaning,
                 }
-                IntraocularLensCalculationsLeftEyeSequence.append(IS)
-            metadata["IntraocularLensCalculationsLeftEyeSequence"] = IntraocularLensCalculationsLeftEyeSequence
-            metadata["Measurement Laterality"] = self.ds.get("MeasurementLaterality", "Unknown")
-            # ReferencedInstanceSequence
-            ReferencedRefractiveMeasurementsSequence = []
-            for InstanceSequence in self.ds.get("ReferencedRefractiveMeasurementsSequence", "Unknown"):
-                IS = {
-                    "ReferencedSOPClassUID": OPHTHALMOLOGY_SOP_CLASSES[InstanceSequence.ReferencedSOPClassUID],
-                    "ReferencedSOPInstance_UID": InstanceSequence.ReferencedSOPInstanceUID
+                LensStatusCodeSequence.append(SequenceDict)
+
+            # Vitreous Status Code Sequence
+            VitreousStatusCodeSequence = []#######################
+            for Sequence in InstanceSequence.VitreousStatusCodeSequence:
+                SequenceDict = {
+                    "Code Value": Sequence.CodeValue,
+                    "Coding Scheme Designator": Sequence.CodingSchemeDesignator,
+                    "Code Meaning": Sequence.CodeMeaning,
                 }
-                ReferencedRefractiveMeasurementsSequence.append(IS)
-            metadata["ReferencedRefractiveMeasurementsSequence"] = ReferencedRefractiveMeasurementsSequence
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.78.7':
-            # 'Ophthalmic Axial Measurements Right Eye Sequence'
-            # Ophthalmic Axial Length Measurements
-            OphthalmicAxialMeasurementsRightEyeSequence = []
-            for InstanceSequence in self.ds.get("OphthalmicAxialMeasurementsRightEyeSequence", "Unknown"):
-                # Pupil Dilated
-                PupilDilated = InstanceSequence.PupilDilated#######################
-                # Lens Status Code Sequence
-                LensStatusCodeSequence = []#######################
-                for Sequence in InstanceSequence.LensStatusCodeSequence:
-                    SequenceDict = {
-                        "Code Value": Sequence.CodeValue,
-                        "Coding Scheme Designator": Sequence.CodingSchemeDesignator,
-                        "Code Meaning": Sequence.CodeMeaning,
-                    }
-                    LensStatusCodeSequence.append(SequenceDict)
-
-                # Vitreous Status Code Sequence
-                VitreousStatusCodeSequence = []#######################
-                for Sequence in InstanceSequence.VitreousStatusCodeSequence:
-                    SequenceDict = {
-                        "Code Value": Sequence.CodeValue,
-                        "Coding Scheme Designator": Sequence.CodingSchemeDesignator,
-                        "Code Meaning": Sequence.CodeMeaning,
-                    }
-                    VitreousStatusCodeSequence.append(SequenceDict)
-
-                # Ophthalmic Axial Length Measurements Sequence
-                OphthalmicAxialLengthMeasurementsSequence = []#######################
-                Measurement1 = InstanceSequence.OphthalmicAxialLengthMeasurementsSequence[0]
-                Measurement2 = InstanceSequence.OphthalmicAxialLengthMeasurementsSequence[1]
-                for Length in Measurement1.OphthalmicAxialLengthMeasurementsTotalLengthSequence:
-                    # Length = Measurement1.OphthalmicAxialLengthMeasurementsTotalLengthSequence[0]
-                    LengthDict = {
-                        "Ophthalmic Axial Length": Length.OphthalmicAxialLength,
-                        "Ophthalmic Axial Length Measurement ": Length[(0x0022, 0x1140)].value,
+                VitreousStatusCodeSequence.append(SequenceDict)
+
+            # Ophthalmic Axial Length Measurements Sequence
+            OphthalmicAxialLengthMeasurementsSequence = []#######################
+            Measurement1 = InstanceSequence.OphthalmicAxialLengthMeasurementsSequence[0]
+            Measurement2 = InstanceSequence.OphthalmicAxialLengthMeasurementsSequence[1]
+            for Length in Measurement1.OphthalmicAxialLengthMeasurementsTotalLengthSequence:
+                # Length = Measurement1.OphthalmicAxialLengthMeasurementsTotalLengthSequence[0]
+                LengthDict = {
+                    "Ophthalmic Axial Length": Length.OphthalmicAxialLength,
+                    "Ophthalmic Axial Length Measurement ": Length[(0x0022, 0x1140)].value,
+                    "Ophthalmic Axial Length Data Source Code Sequence": {
+                        "Code Value": Length[(0x0022, 0x1225)][0][(0x0022, 0x1150)][0].CodeValue,
+                        "Code Meaning": Length[(0x0022, 0x1225)][0][(0x0022, 0x1150)][0].CodeMeaning,
+                    },
+                    "Ophthalmic Axial Length Data Source":  Length[(0x0022, 0x1225)][0][(0x0022, 0x1159)].value,
+                    "Referenced Ophthalmic Axial Length Measurement QC Image Sequence": {
+                        "Referenced SOP Class UID": OPHTHALMOLOGY_SOP_CLASSES[Length[(0x0022, 0x1330)][0][(0x0008, 0x1150)].value],
+                        "Referenced SOP Instance UID": Length[(0x0022, 0x1330)][0][(0x0008, 0x1155)].value,
+                        "Referenced Frame Number": Length[(0x0022, 0x1330)][0][(0x0008, 0x1160)].value,
+                    },
+                }
+            OphthalmicAxialLengthMeasurementsSequence.append(LengthDict)
+
+            # Loop through the Ophthalmic Axial Length Measurements Segmental Length Sequence
+            for Segment in Measurement2.OphthalmicAxialLengthMeasurementsSegmentalLengthSequence:
+                # Segment = Measurement2.OphthalmicAxialLengthMeasurementsSegmentalLengthSequence[0]#
+                SegmentDict = {
+                    "Ophthalmic Axial Length": Segment.OphthalmicAxialLength,
+                    "Ophthalmic Axial Length Measurement": Segment[(0x0022, 0x1140)].value,
+                    "Ophthalmic Axial Length Measurements Segment Name Code Sequence": {
+                        "Code Value": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodeValue,
+                        "Coding Scheme Designator": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodingSchemeDesignator,
+                        "Code Meaning": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodeMeaning,
+                    },
+                    "Ophthalmic Axial Length Data Source": Segment[(0x0022, 0x1225)][0][(0x0022, 0x1159)].value,
+                }
+
+                # Loop through Optical Ophthalmic Axial Length Measurements Sequence
+                for OpticalMeasurement in Segment.OpticalOphthalmicAxialLengthMeasurementsSequence:
+                    OpticalMeasurement = Segment.OpticalOphthalmicAxialLengthMeasurementsSequence[0]
+                    OpticalMeasurementDict = {
                         "Ophthalmic Axial Length Data Source Code Sequence": {
-                            "Code Value": Length[(0x0022, 0x1225)][0][(0x0022, 0x1150)][0].CodeValue,
-                            "Code Meaning": Length[(0x0022, 0x1225)][0][(0x0022, 0x1150)][0].CodeMeaning,
-                        },
-                        "Ophthalmic Axial Length Data Source":  Length[(0x0022, 0x1225)][0][(0x0022, 0x1159)].value,
-                        "Referenced Ophthalmic Axial Length Measurement QC Image Sequence": {
-                            "Referenced SOP Class UID": OPHTHALMOLOGY_SOP_CLASSES[Length[(0x0022, 0x1330)][0][(0x0008, 0x1150)].value],
-                            "Referenced SOP Instance UID": Length[(0x0022, 0x1330)][0][(0x0008, 0x1155)].value,
-                            "Referenced Frame Number": Length[(0x0022, 0x1330)][0][(0x0008, 0x1160)].value,
+                            "Code Value": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodeValue,
+                            "Coding Scheme Designator": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodingSchemeDesignator,
+                            "Code Meaning": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodeMeaning,
                         },
+                        "Ophthalmic Axial Length Data Source LO": OpticalMeasurement[(0x0022, 0x1159)].value
                     }
-                OphthalmicAxialLengthMeasurementsSequence.append(LengthDict)
-
-                # Loop through the Ophthalmic Axial Length Measurements Segmental Length Sequence
-                for Segment in Measurement2.OphthalmicAxialLengthMeasurementsSegmentalLengthSequence:
-                    # Segment = Measurement2.OphthalmicAxialLengthMeasurementsSegmentalLengthSequence[0]#
-                    SegmentDict = {
-                        "Ophthalmic Axial Length": Segment.OphthalmicAxialLength,
-                        "Ophthalmic Axial Length Measurement": Segment[(0x0022, 0x1140)].value,
-                        "Ophthalmic Axial Length Measurements Segment Name Code Sequence": {
-                            "Code Value": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodeValue,
-                            "Coding Scheme Designator": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodingSchemeDesignator,
-                            "Code Meaning": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodeMeaning,
-                        },
-                        "Ophthalmic Axial Length Data Source": Segment[(0x0022, 0x1225)][0][(0x0022, 0x1159)].value,
+                    SegmentDict["Optical Ophthalmic Axial Length Measurements Sequence"] = OpticalMeasurementDict
+
+                # Append the segment data to the main list
+            OphthalmicAxialLengthMeasurementsSequence.append(SegmentDict)
+
+            # Optical Selected Ophthalmic Axial Length Sequence
+            OpticalSelectedOphthalmicAxialLengthSequence = []#######################
+            for LengthSequence in InstanceSequence.OpticalSelectedOphthalmicAxialLengthSequence:
+                LengthSequence = InstanceSequence.OpticalSelectedOphthalmicAxialLengthSequence[0]
+                LengthSequenceDict = {
+                    "Ophthalmic Axial Length Measurement": LengthSequence[(0x0022, 0x1010)].value,
+                    "Ophthalmic Axial Length": LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1019)].value
+                }
+                OphthalmicAxialLengthQualityMetricSequence = []
+                for QMS in LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1262)]:
+                    QMS = LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1262)][0]
+                    QMSDict = {
+                        "CodeValue": QMS[(0x0040, 0x08ea)][0].CodeValue,
+                        "CodeMeaning": QMS[(0x0040, 0x08ea)][0].CodeMeaning,
                     }
+                    OphthalmicAxialLengthQualityMetricSequence.append(QMSDict)
+                LengthSequenceDict['Ophthalmic Axial Length Quality Metric Sequence'] = OphthalmicAxialLengthQualityMetricSequence
+                OpticalSelectedOphthalmicAxialLengthSequence.append(LengthSequenceDict)   
+              
+            # Finalizing the instance sequence
+            IS = {
+                "Pupil Dilated": PupilDilated,
+                "Lens Status Code Sequence": LensStatusCodeSequence,
+                "Vitreous Status Code Sequence": VitreousStatusCodeSequence,
+                "Ophthalmic Axial Length Measurements Sequence": OphthalmicAxialLengthMeasurementsSequence,
+                "Optical Selected Ophthalmic Axial Length Sequence": OpticalSelectedOphthalmicAxialLengthSequence,
+            }
 
-                    # Loop through Optical Ophthalmic Axial Length Measurements Sequence
-                    for OpticalMeasurement in Segment.OpticalOphthalmicAxialLengthMeasurementsSequence:
-                        OpticalMeasurement = Segment.OpticalOphthalmicAxialLengthMeasurementsSequence[0]
-                        OpticalMeasurementDict = {
-                            "Ophthalmic Axial Length Data Source Code Sequence": {
-                                "Code Value": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodeValue,
-                                "Coding Scheme Designator": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodingSchemeDesignator,
-                                "Code Meaning": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodeMeaning,
-                            },
-                            "Ophthalmic Axial Length Data Source LO": OpticalMeasurement[(0x0022, 0x1159)].value
-                        }
-                        SegmentDict["Optical Ophthalmic Axial Length Measurements Sequence"] = OpticalMeasurementDict
-
-                    # Append the segment data to the main list
-                OphthalmicAxialLengthMeasurementsSequence.append(SegmentDict)
-
-                # Optical Selected Ophthalmic Axial Length Sequence
-                OpticalSelectedOphthalmicAxialLengthSequence = []#######################
-                for LengthSequence in InstanceSequence.OpticalSelectedOphthalmicAxialLengthSequence:
-                    LengthSequence = InstanceSequence.OpticalSelectedOphthalmicAxialLengthSequence[0]
-                    LengthSequenceDict = {
-                        "Ophthalmic Axial Length Measurement": LengthSequence[(0x0022, 0x1010)].value,
-                        "Ophthalmic Axial Length": LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1019)].value
-                    }
-                    OphthalmicAxialLengthQualityMetricSequence = []
-                    for QMS in LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1262)]:
-                        QMS = LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1262)][0]
-                        QMSDict = {
-                            "CodeValue": QMS[(0x0040, 0x08ea)][0].CodeValue,
-                            "CodeMeaning": QMS[(0x0040, 0x08ea)][0].CodeMeaning,
-                        }
-                        OphthalmicAxialLengthQualityMetricSequence.append(QMSDict)
-                    LengthSequenceDict['Ophthalmic Axial Length Quality Metric Sequence'] = OphthalmicAxialLengthQualityMetricSequence
-                    OpticalSelectedOphthalmicAxialLengthSequence.append(LengthSequenceDict)   
-                  
-                # Finalizing the instance sequence
-                IS = {
-                    "Pupil Dilated": PupilDilated,
-                    "Lens Status Code Sequence": LensStatusCodeSequence,
-                    "Vitreous Status Code Sequence": VitreousStatusCodeSequence,
-                    "Ophthalmic Axial Length Measurements Sequence": OphthalmicAxialLengthMeasurementsSequence,
-                    "Optical Selected Ophthalmic Axial Length Sequence": OpticalSelectedOphthalmicAxialLengthSequence,
+            OphthalmicAxialMeasurementsRightEyeSequence.append(IS)
+        #--------------------------
+        OphthalmicAxialMeasurementsLeftEyeSequence = []
+        for InstanceSequence in self.ds.get("OphthalmicAxialMeasurementsLeftEyeSequence", "Unknown"):
+            # Pupil Dilated
+            PupilDilated = InstanceSequence.PupilDilated#######################
+            # Lens Status Code Sequence
+            LensStatusCodeSequence = []#######################
+            for Sequence in InstanceSequence.LensStatusCodeSequence:
+                SequenceDict = {
+                    "Code Value": Sequence.CodeValue,
+                    "Coding Scheme Designator": Sequence.CodingSchemeDesignator,
+                    "Code Meaning": Sequence.CodeMeaning,
+                }
+                LensStatusCodeSequence.append(SequenceDict)
+
+            # Vitreous Status Code Sequence
+            VitreousStatusCodeSequence = []#######################
+            for Sequence in InstanceSequence.VitreousStatusCodeSequence:
+                SequenceDict = {
+                    "Code Value": Sequence.CodeValue,
+                    "Coding Scheme Designator": Sequence.CodingSchemeDesignator,
+                    "Code Meaning": Sequence.CodeMeaning,
+                }
+                VitreousStatusCodeSequence.append(SequenceDict)
+
+            # Ophthalmic Axial Length Measurements Sequence
+            OphthalmicAxialLengthMeasurementsSequence = []#######################
+            Measurement1 = InstanceSequence.OphthalmicAxialLengthMeasurementsSequence[0]
+            Measurement2 = InstanceSequence.OphthalmicAxialLengthMeasurementsSequence[1]
+            for Length in Measurement1.OphthalmicAxialLengthMeasurementsTotalLengthSequence:
+                # Length = Measurement1.OphthalmicAxialLengthMeasurementsTotalLengthSequence[0]
+                LengthDict = {
+                    "Ophthalmic Axial Length": Length.OphthalmicAxialLength,
+                    "Ophthalmic Axial Length Measurement ": Length[(0x0022, 0x1140)].value,
+                    "Ophthalmic Axial Length Data Source Code Sequence": {
+                        "Code Value": Length[(0x0022, 0x1225)][0][(0x0022, 0x1150)][0].CodeValue,
+                        "Code Meaning": Length[(0x0022, 0x1225)][0][(0x0022, 0x1150)][0].CodeMeaning,
+                    },
+                    "Ophthalmic Axial Length Data Source":  Length[(0x0022, 0x1225)][0][(0x0022, 0x1159)].value,
+                    "Referenced Ophthalmic Axial Length Measurement QC Image Sequence": {
+                        "Referenced SOP Class UID": OPHTHALMOLOGY_SOP_CLASSES[Length[(0x0022, 0x1330)][0][(0x0008, 0x1150)].value],
+                        "Referenced SOP Instance UID": Length[(0x0022, 0x1330)][0][(0x0008, 0x1155)].value,
+                        "Referenced Frame Number": Length[(0x0022, 0x1330)][0][(0x0008, 0x1160)].value,
+                    },
+                }
+            OphthalmicAxialLengthMeasurementsSequence.append(LengthDict)
+
+            # Loop through the Ophthalmic Axial Length Measurements Segmental Length Sequence
+            for Segment in Measurement2.OphthalmicAxialLengthMeasurementsSegmentalLengthSequence:
+                # Segment = Measurement2.OphthalmicAxialLengthMeasurementsSegmentalLengthSequence[0]#
+                SegmentDict = {
+                    "Ophthalmic Axial Length": Segment.OphthalmicAxialLength,
+                    "Ophthalmic Axial Length Measurement": Segment[(0x0022, 0x1140)].value,
+                    "Ophthalmic Axial Length Measurements Segment Name Code Sequence": {
+                        "Code Value": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodeValue,
+                        "Coding Scheme Designator": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodingSchemeDesignator,
+                        "Code Meaning": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodeMeaning,
+                    },
+                    "Ophthalmic Axial Length Data Source": Segment[(0x0022, 0x1225)][0][(0x0022, 0x1159)].value,
                 }
 
-                OphthalmicAxialMeasurementsRightEyeSequence.append(IS)
-            #--------------------------
-            OphthalmicAxialMeasurementsLeftEyeSequence = []
-            for InstanceSequence in self.ds.get("OphthalmicAxialMeasurementsLeftEyeSequence", "Unknown"):
-                # Pupil Dilated
-                PupilDilated = InstanceSequence.PupilDilated#######################
-                # Lens Status Code Sequence
-                LensStatusCodeSequence = []#######################
-                for Sequence in InstanceSequence.LensStatusCodeSequence:
-                    SequenceDict = {
-                        "Code Value": Sequence.CodeValue,
-                        "Coding Scheme Designator": Sequence.CodingSchemeDesignator,
-                        "Code Meaning": Sequence.CodeMeaning,
-                    }
-                    LensStatusCodeSequence.append(SequenceDict)
-
-                # Vitreous Status Code Sequence
-                VitreousStatusCodeSequence = []#######################
-                for Sequence in InstanceSequence.VitreousStatusCodeSequence:
-                    SequenceDict = {
-                        "Code Value": Sequence.CodeValue,
-                        "Coding Scheme Designator": Sequence.CodingSchemeDesignator,
-                        "Code Meaning": Sequence.CodeMeaning,
-                    }
-                    VitreousStatusCodeSequence.append(SequenceDict)
-
-                # Ophthalmic Axial Length Measurements Sequence
-                OphthalmicAxialLengthMeasurementsSequence = []#######################
-                Measurement1 = InstanceSequence.OphthalmicAxialLengthMeasurementsSequence[0]
-                Measurement2 = InstanceSequence.OphthalmicAxialLengthMeasurementsSequence[1]
-                for Length in Measurement1.OphthalmicAxialLengthMeasurementsTotalLengthSequence:
-                    # Length = Measurement1.OphthalmicAxialLengthMeasurementsTotalLengthSequence[0]
-                    LengthDict = {
-                        "Ophthalmic Axial Length": Length.OphthalmicAxialLength,
-                        "Ophthalmic Axial Length Measurement ": Length[(0x0022, 0x1140)].value,
+                # Loop through Optical Ophthalmic Axial Length Measurements Sequence
+                for OpticalMeasurement in Segment.OpticalOphthalmicAxialLengthMeasurementsSequence:
+                    OpticalMeasurement = Segment.OpticalOphthalmicAxialLengthMeasurementsSequence[0]
+                    OpticalMeasurementDict = {
                         "Ophthalmic Axial Length Data Source Code Sequence": {
-                            "Code Value": Length[(0x0022, 0x1225)][0][(0x0022, 0x1150)][0].CodeValue,
-                            "Code Meaning": Length[(0x0022, 0x1225)][0][(0x0022, 0x1150)][0].CodeMeaning,
-                        },
-                        "Ophthalmic Axial Length Data Source":  Length[(0x0022, 0x1225)][0][(0x0022, 0x1159)].value,
-                        "Referenced Ophthalmic Axial Length Measurement QC Image Sequence": {
-                            "Referenced SOP Class UID": OPHTHALMOLOGY_SOP_CLASSES[Length[(0x0022, 0x1330)][0][(0x0008, 0x1150)].value],
-                            "Referenced SOP Instance UID": Length[(0x0022, 0x1330)][0][(0x0008, 0x1155)].value,
-                            "Referenced Frame Number": Length[(0x0022, 0x1330)][0][(0x0008, 0x1160)].value,
+                            "Code Value": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodeValue,
+                            "Coding Scheme Designator": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodingSchemeDesignator,
+                            "Code Meaning": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodeMeaning,
                         },
+                        "Ophthalmic Axial Length Data Source LO": OpticalMeasurement[(0x0022, 0x1159)].value
                     }
-                OphthalmicAxialLengthMeasurementsSequence.append(LengthDict)
-
-                # Loop through the Ophthalmic Axial Length Measurements Segmental Length Sequence
-                for Segment in Measurement2.OphthalmicAxialLengthMeasurementsSegmentalLengthSequence:
-                    # Segment = Measurement2.OphthalmicAxialLengthMeasurementsSegmentalLengthSequence[0]#
-                    SegmentDict = {
-                        "Ophthalmic Axial Length": Segment.OphthalmicAxialLength,
-                        "Ophthalmic Axial Length Measurement": Segment[(0x0022, 0x1140)].value,
-                        "Ophthalmic Axial Length Measurements Segment Name Code Sequence": {
-                            "Code Value": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodeValue,
-                            "Coding Scheme Designator": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodingSchemeDesignator,
-                            "Code Meaning": Segment.OphthalmicAxialLengthMeasurementsSegmentNameCodeSequence[0].CodeMeaning,
-                        },
-                        "Ophthalmic Axial Length Data Source": Segment[(0x0022, 0x1225)][0][(0x0022, 0x1159)].value,
-                    }
-
-                    # Loop through Optical Ophthalmic Axial Length Measurements Sequence
-                    for OpticalMeasurement in Segment.OpticalOphthalmicAxialLengthMeasurementsSequence:
-                        OpticalMeasurement = Segment.OpticalOphthalmicAxialLengthMeasurementsSequence[0]
-                        OpticalMeasurementDict = {
-                            "Ophthalmic Axial Length Data Source Code Sequence": {
-                                "Code Value": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodeValue,
-                                "Coding Scheme Designator": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodingSchemeDesignator,
-                                "Code Meaning": OpticalMeasurement.OphthalmicAxialLengthDataSourceCodeSequence[0].CodeMeaning,
-                            },
-                            "Ophthalmic Axial Length Data Source LO": OpticalMeasurement[(0x0022, 0x1159)].value
-                        }
-                        SegmentDict["Optical Ophthalmic Axial Length Measurements Sequence"] = OpticalMeasurementDict
-
-                    # Append the segment data to the main list
-                OphthalmicAxialLengthMeasurementsSequence.append(SegmentDict)
-
-                # Optical Selected Ophthalmic Axial Length Sequence
-                OpticalSelectedOphthalmicAxialLengthSequence = []#######################
-                for LengthSequence in InstanceSequence.OpticalSelectedOphthalmicAxialLengthSequence:
-                    LengthSequence = InstanceSequence.OpticalSelectedOphthalmicAxialLengthSequence[0]
-                    LengthSequenceDict = {
-                        "Ophthalmic Axial Length Measurement": LengthSequence[(0x0022, 0x1010)].value,
-                        "Ophthalmic Axial Length": LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1019)].value
-                    }
-                    OphthalmicAxialLengthQualityMetricSequence = []
-                    for QMS in LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1262)]:
-                        QMS = LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1262)][0]
-                        QMSDict = {
-                            "CodeValue": QMS[(0x0040, 0x08ea)][0].CodeValue,
-                            "CodeMeaning": QMS[(0x0040, 0x08ea)][0].CodeMeaning,
-                        }
-                        OphthalmicAxialLengthQualityMetricSequence.append(QMSDict)
-                    LengthSequenceDict['Ophthalmic Axial Length Quality Metric Sequence'] = OphthalmicAxialLengthQualityMetricSequence
-                    OpticalSelectedOphthalmicAxialLengthSequence.append(LengthSequenceDict)   
-                  
-                # Finalizing the instance sequence
-                IS = {
-                    "Pupil Dilated": PupilDilated,
-                    "Lens Status Code Sequence": LensStatusCodeSequence,
-                    "Vitreous Status Code Sequence": VitreousStatusCodeSequence,
-                    "Ophthalmic Axial Length Measurements Sequence": OphthalmicAxialLengthMeasurementsSequence,
-                    "Optical Selected Ophthalmic Axial Length Sequence": OpticalSelectedOphthalmicAxialLengthSequence,
+                    SegmentDict["Optical Ophthalmic Axial Length Measurements Sequence"] = OpticalMeasurementDict
+
+                # Append the segment data to the main list
+            OphthalmicAxialLengthMeasurementsSequence.append(SegmentDict)
+
+            # Optical Selected Ophthalmic Axial Length Sequence
+            OpticalSelectedOphthalmicAxialLengthSequence = []#######################
+            for LengthSequence in InstanceSequence.OpticalSelectedOphthalmicAxialLengthSequence:
+                LengthSequence = InstanceSequence.OpticalSelectedOphthalmicAxialLengthSequence[0]
+                LengthSequenceDict = {
+                    "Ophthalmic Axial Length Measurement": LengthSequence[(0x0022, 0x1010)].value,
+                    "Ophthalmic Axial Length": LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1019)].value
                 }
-
-                OphthalmicAxialMeasurementsLeftEyeSequence.append(IS)
-
-
-            metadata["OphthalmicAxialMeasurementsRightEyeSequence"] = OphthalmicAxialMeasurementsRightEyeSequence
-            metadata["OphthalmicAxialMeasurementsLeftEyeSequence"] = OphthalmicAxialMeasurementsLeftEyeSequence
-            metadata["Measurement Laterality"] = self.ds.get("MeasurementLaterality", "Unknown")
-            
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.78.3':
-            # 'Keratometry Measurements Storage'
-            # Private Tags
-            metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
-            metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
-            metadata["Keratometry Right Eye Sequence"] = {
-                "Steep Keratometric Axis Sequence": {
-                    "RadiusOfCurvature": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].RadiusOfCurvature,
-                    "KeratometricPower ": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricPower,
-                    "KeratometricAxis": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricAxis,
-
-                },
-                "Flat Keratometric Axis Sequence": {
-                    "RadiusOfCurvature": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].RadiusOfCurvature,
-                    "KeratometricPower ": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricPower,
-                    "KeratometricAxis": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricAxis,
-                },
+                OphthalmicAxialLengthQualityMetricSequence = []
+                for QMS in LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1262)]:
+                    QMS = LengthSequence[(0x0022, 0x1260)][0][(0x0022, 0x1262)][0]
+                    QMSDict = {
+                        "CodeValue": QMS[(0x0040, 0x08ea)][0].CodeValue,
+                        "CodeMeaning": QMS[(0x0040, 0x08ea)][0].CodeMeaning,
+                    }
+                    OphthalmicAxialLengthQualityMetricSequence.append(QMSDict)
+                LengthSequenceDict['Ophthalmic Axial Length Quality Metric Sequence'] = OphthalmicAxialLengthQualityMetricSequence
+                OpticalSelectedOphthalmicAxialLengthSequence.append(LengthSequenceDict)   
+              
+            # Finalizing the instance sequence
+            IS = {
+                "Pupil Dilated": PupilDilated,
+                "Lens Status Code Sequence": LensStatusCodeSequence,
+                "Vitreous Status Code Sequence": VitreousStatusCodeSequence,
+                "Ophthalmic Axial Length Measurements Sequence": OphthalmicAxialLengthMeasurementsSequence,
+                "Optical Selected Ophthalmic Axial Length Sequence": OpticalSelectedOphthalmicAxialLengthSequence,
             }
-            metadata["Keratometry Left Eye Sequence"] = {
-                "Steep Keratometric Axis Sequence": {
-                    "RadiusOfCurvature": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].RadiusOfCurvature,
-                    "KeratometricPower ": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricPower,
-                    "KeratometricAxis": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricAxis,
 
-                },
-                "Flat Keratometric Axis Sequence": {
-                    "RadiusOfCurvature": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].RadiusOfCurvature,
-                    "KeratometricPower ": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricPower,
-                    "KeratometricAxis": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricAxis,
-                },
-            }
-            metadata['(0x1201, 0x1001)'] = {
-                "(0x1201, 0x1003)": self.ds[((0x1201, 0x1001))][0][((0x1201, 0x1003))][0][((0x1201, 0x1005))].value,
-                "(0x1201, 0x1004)": self.ds[((0x1201, 0x1001))][0][((0x1201, 0x1004))][0][((0x1201, 0x1005))].value,
-                "(0x1201, 0x1006)": self.ds[((0x1201, 0x1001))][0][((0x1201, 0x1006))].value,
-                "(0x1201, 0x1007)": self.ds[((0x1201, 0x1001))][0][((0x1201, 0x1007))].value,
-                "(0x1201, 0x101d)": OPHTHALMOLOGY_SOP_CLASSES[self.ds[((0x1201, 0x1001))][0][((0x1201, 0x101d))][0][((0x1201, 0x101e))].value],
+            OphthalmicAxialMeasurementsLeftEyeSequence.append(IS)
+
+
+        metadata["OphthalmicAxialMeasurementsRightEyeSequence"] = OphthalmicAxialMeasurementsRightEyeSequence
+        metadata["OphthalmicAxialMeasurementsLeftEyeSequence"] = OphthalmicAxialMeasurementsLeftEyeSequence
+        metadata["Measurement Laterality"] = self.ds.get("MeasurementLaterality", "Unknown")
+
+    def _parse_keratometry(self, metadata):
+        # 'Keratometry Measurements Storage'
+        # Private Tags
+        metadata['(0x2201, 0x1000)'] = ''.join([i for i in self.ds[(0x2201,0x1000)]])
+        metadata['(0x2201, 0x1002)'] = ''.join([i for i in self.ds[(0x2201,0x1002)]])
+        metadata["Keratometry Right Eye Sequence"] = {
+            "Steep Keratometric Axis Sequence": {
+                "RadiusOfCurvature": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].RadiusOfCurvature,
+                "KeratometricPower ": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricPower,
+                "KeratometricAxis": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricAxis,
+
+            },
+            "Flat Keratometric Axis Sequence": {
+                "RadiusOfCurvature": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].RadiusOfCurvature,
+                "KeratometricPower ": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricPower,
+                "KeratometricAxis": self.ds.get("KeratometryRightEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricAxis,
+            },
+        }
+        metadata["Keratometry Left Eye Sequence"] = {
+            "Steep Keratometric Axis Sequence": {
+                "RadiusOfCurvature": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].RadiusOfCurvature,
+                "KeratometricPower ": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricPower,
+                "KeratometricAxis": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricAxis,
+
+            },
+            "Flat Keratometric Axis Sequence": {
+                "RadiusOfCurvature": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].RadiusOfCurvature,
+                "KeratometricPower ": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricPower,
+                "KeratometricAxis": self.ds.get("KeratometryLeftEyeSequence", "Unknown")[0].SteepKeratometricAxisSequence[0].KeratometricAxis,
+            },
+        }
+        metadata['(0x1201, 0x1001)'] = {
+            "(0x1201, 0x1003)": self.ds[((0x1201, 0x1001))][0][((0x1201, 0x1003))][0][((0x1201, 0x1005))].value,
+            "(0x1201, 0x1004)": self.ds[((0x1201, 0x1001))][0][((0x1201, 0x1004))][0][((0x1201, 0x1005))].value,
+            "(0x1201, 0x1006)": self.ds[((0x1201, 0x1001))][0][((0x1201, 0x1006))].value,
+            "(0x1201, 0x1007)": self.ds[((0x1201, 0x1001))][0][((0x1201, 0x1007))].value,
+            "(0x1201, 0x101d)": OPHTHALMOLOGY_SOP_CLASSES[self.ds[((0x1201, 0x1001))][0][((0x1201, 0x101d))][0][((0x1201, 0x101e))].value],
 
-            }
-            metadata['(0x1201, 0x1002)'] = {
-                "(0x1201, 0x1003)": self.ds[((0x1201, 0x1002))][0][((0x1201, 0x1003))][0][((0x1201, 0x1005))].value,
-                "(0x1201, 0x1004)": self.ds[((0x1201, 0x1002))][0][((0x1201, 0x1004))][0][((0x1201, 0x1005))].value,
-                "(0x1201, 0x1006)": self.ds[((0x1201, 0x1002))][0][((0x1201, 0x1006))].value,
-                "(0x1201, 0x1007)": self.ds[((0x1201, 0x1002))][0][((0x1201, 0x1007))].value,
-                "(0x1201, 0x101d)": OPHTHALMOLOGY_SOP_CLASSES[self.ds[((0x1201, 0x1002))][0][((0x1201, 0x101d))][0][((0x1201, 0x101e))].value],
+        }
+        metadata['(0x1201, 0x1002)'] = {
+            "(0x1201, 0x1003)": self.ds[((0x1201, 0x1002))][0][((0x1201, 0x1003))][0][((0x1201, 0x1005))].value,
+            "(0x1201, 0x1004)": self.ds[((0x1201, 0x1002))][0][((0x1201, 0x1004))][0][((0x1201, 0x1005))].value,
+            "(0x1201, 0x1006)": self.ds[((0x1201, 0x1002))][0][((0x1201, 0x1006))].value,
+            "(0x1201, 0x1007)": self.ds[((0x1201, 0x1002))][0][((0x1201, 0x1007))].value,
+            "(0x1201, 0x101d)": OPHTHALMOLOGY_SOP_CLASSES[self.ds[((0x1201, 0x1002))][0][((0x1201, 0x101d))][0][((0x1201, 0x101e))].value],
 
-            }
-            metadata['(0x1201, 0x1008)'] = {
-                "(0x1201, 0x1007)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x1007))].value,
-                "(0x1201, 0x100a)": {
-                    "(0x1201, 0x1005)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100a))][0][((0x1201, 0x1005))].value,
-                    "(0x1201, 0x100c)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100a))][0][((0x1201, 0x100c))].value,
-                    "(0x1201, 0x100d)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100a))][0][((0x1201, 0x100d))].value,
-                    "(0x1201, 0x100e)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100a))][0][((0x1201, 0x100e))].value,
-                },
-                "(0x1201, 0x100b)": {
-                    "(0x1201, 0x1005)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100b))][0][((0x1201, 0x1005))].value,
-                    "(0x1201, 0x100c)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100b))][0][((0x1201, 0x100c))].value,
-                    "(0x1201, 0x100d)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100b))][0][((0x1201, 0x100d))].value,
-                    "(0x1201, 0x100e)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100b))][0][((0x1201, 0x100e))].value,
-                },
-                "(0x1201, 0x101b)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x101b))].value,
-                "(0x1201, 0x101c)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x101c))].value,
-            }
-            metadata['(0x1201, 0x1009)'] = {
-                "(0x1201, 0x1007)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x1007))].value,
-                "(0x1201, 0x100a)": {
-                    "(0x1201, 0x1005)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100a))][0][((0x1201, 0x1005))].value,
-                    "(0x1201, 0x100c)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100a))][0][((0x1201, 0x100c))].value,
-                    "(0x1201, 0x100d)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100a))][0][((0x1201, 0x100d))].value,
-                    "(0x1201, 0x100e)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100a))][0][((0x1201, 0x100e))].value,
-                },
-                "(0x1201, 0x100b)": {
-                    "(0x1201, 0x1005)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100b))][0][((0x1201, 0x1005))].value,
-                    "(0x1201, 0x100c)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100b))][0][((0x1201, 0x100c))].value,
-                    "(0x1201, 0x100d)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100b))][0][((0x1201, 0x100d))].value,
-                    "(0x1201, 0x100e)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100b))][0][((0x1201, 0x100e))].value,
-                },
-                "(0x1201, 0x101b)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x101b))].value,
-                "(0x1201, 0x101c)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x101c))].value,
-            }
-            metadata['(0x1201, 0x100f)'] = {
-                "(0x1201, 0x1006)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1006))].value,
-                "(0x1201, 0x1011)": {
-                    "(0x1201, 0x1013)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1011))][0][((0x1201, 0x1013))].value,
-                    "(0x1201, 0x1014)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1011))][0][((0x1201, 0x1014))].value,
-                    "(0x1201, 0x1015)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1011))][0][((0x1201, 0x1015))].value,
-                    "(0x1201, 0x1016)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1011))][0][((0x1201, 0x1016))].value,
-                },
-                "(0x1201, 0x1012)": {
-                    "(0x1201, 0x1013)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1012))][0][((0x1201, 0x1013))].value,
-                    "(0x1201, 0x1014)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1012))][0][((0x1201, 0x1014))].value,
-                    "(0x1201, 0x1015)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1012))][0][((0x1201, 0x1015))].value,
-                    "(0x1201, 0x1016)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1012))][0][((0x1201, 0x1016))].value,
-                },
-                "(0x1201, 0x1017)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1017))].value,
-            }
-            metadata['(0x1201, 0x1010)'] = {
-                "(0x1201, 0x1006)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1006))].value,
-                "(0x1201, 0x1011)": {
-                    "(0x1201, 0x1013)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1011))][0][((0x1201, 0x1013))].value,
-                    "(0x1201, 0x1014)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1011))][0][((0x1201, 0x1014))].value,
-                    "(0x1201, 0x1015)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1011))][0][((0x1201, 0x1015))].value,
-                    "(0x1201, 0x1016)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1011))][0][((0x1201, 0x1016))].value,
-                },
-                "(0x1201, 0x1012)": {
-                    "(0x1201, 0x1013)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1012))][0][((0x1201, 0x1013))].value,
-                    "(0x1201, 0x1014)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1012))][0][((0x1201, 0x1014))].value,
-                    "(0x1201, 0x1015)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1012))][0][((0x1201, 0x1015))].value,
-                    "(0x1201, 0x1016)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1012))][0][((0x1201, 0x1016))].value,
-                },
-                "(0x1201, 0x1017)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1017))].value,
-            }
-            metadata['(0x1201, 0x1018)'] = f"{self.ds[(0x1201, 0x1018)][0][(0x1201, 0x101a)].VR}: Array of {len(self.ds[(0x1201, 0x1018)][0][(0x1201, 0x101a)].value)} elements"
-            metadata['(0x1201, 0x1019)'] = f"{self.ds[(0x1201, 0x1019)][0][(0x1201, 0x101a)].VR}: Array of {len(self.ds[(0x1201, 0x1019)][0][(0x1201, 0x101a)].value)} elements"
+        }
+        metadata['(0x1201, 0x1008)'] = {
+            "(0x1201, 0x1007)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x1007))].value,
+            "(0x1201, 0x100a)": {
+                "(0x1201, 0x1005)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100a))][0][((0x1201, 0x1005))].value,
+                "(0x1201, 0x100c)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100a))][0][((0x1201, 0x100c))].value,
+                "(0x1201, 0x100d)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100a))][0][((0x1201, 0x100d))].value,
+                "(0x1201, 0x100e)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100a))][0][((0x1201, 0x100e))].value,
+            },
+            "(0x1201, 0x100b)": {
+                "(0x1201, 0x1005)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100b))][0][((0x1201, 0x1005))].value,
+                "(0x1201, 0x100c)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100b))][0][((0x1201, 0x100c))].value,
+                "(0x1201, 0x100d)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100b))][0][((0x1201, 0x100d))].value,
+                "(0x1201, 0x100e)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x100b))][0][((0x1201, 0x100e))].value,
+            },
+            "(0x1201, 0x101b)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x101b))].value,
+            "(0x1201, 0x101c)": self.ds[((0x1201, 0x1008))][0][((0x1201, 0x101c))].value,
+        }
+        metadata['(0x1201, 0x1009)'] = {
+            "(0x1201, 0x1007)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x1007))].value,
+            "(0x1201, 0x100a)": {
+                "(0x1201, 0x1005)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100a))][0][((0x1201, 0x1005))].value,
+                "(0x1201, 0x100c)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100a))][0][((0x1201, 0x100c))].value,
+                "(0x1201, 0x100d)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100a))][0][((0x1201, 0x100d))].value,
+                "(0x1201, 0x100e)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100a))][0][((0x1201, 0x100e))].value,
+            },
+            "(0x1201, 0x100b)": {
+                "(0x1201, 0x1005)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100b))][0][((0x1201, 0x1005))].value,
+                "(0x1201, 0x100c)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100b))][0][((0x1201, 0x100c))].value,
+                "(0x1201, 0x100d)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100b))][0][((0x1201, 0x100d))].value,
+                "(0x1201, 0x100e)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x100b))][0][((0x1201, 0x100e))].value,
+            },
+            "(0x1201, 0x101b)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x101b))].value,
+            "(0x1201, 0x101c)": self.ds[((0x1201, 0x1009))][0][((0x1201, 0x101c))].value,
+        }
+        metadata['(0x1201, 0x100f)'] = {
+            "(0x1201, 0x1006)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1006))].value,
+            "(0x1201, 0x1011)": {
+                "(0x1201, 0x1013)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1011))][0][((0x1201, 0x1013))].value,
+                "(0x1201, 0x1014)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1011))][0][((0x1201, 0x1014))].value,
+                "(0x1201, 0x1015)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1011))][0][((0x1201, 0x1015))].value,
+                "(0x1201, 0x1016)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1011))][0][((0x1201, 0x1016))].value,
+            },
+            "(0x1201, 0x1012)": {
+                "(0x1201, 0x1013)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1012))][0][((0x1201, 0x1013))].value,
+                "(0x1201, 0x1014)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1012))][0][((0x1201, 0x1014))].value,
+                "(0x1201, 0x1015)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1012))][0][((0x1201, 0x1015))].value,
+                "(0x1201, 0x1016)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1012))][0][((0x1201, 0x1016))].value,
+            },
+            "(0x1201, 0x1017)": self.ds[((0x1201, 0x100f))][0][((0x1201, 0x1017))].value,
+        }
+        metadata['(0x1201, 0x1010)'] = {
+            "(0x1201, 0x1006)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1006))].value,
+            "(0x1201, 0x1011)": {
+                "(0x1201, 0x1013)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1011))][0][((0x1201, 0x1013))].value,
+                "(0x1201, 0x1014)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1011))][0][((0x1201, 0x1014))].value,
+                "(0x1201, 0x1015)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1011))][0][((0x1201, 0x1015))].value,
+                "(0x1201, 0x1016)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1011))][0][((0x1201, 0x1016))].value,
+            },
+            "(0x1201, 0x1012)": {
+                "(0x1201, 0x1013)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1012))][0][((0x1201, 0x1013))].value,
+                "(0x1201, 0x1014)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1012))][0][((0x1201, 0x1014))].value,
+                "(0x1201, 0x1015)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1012))][0][((0x1201, 0x1015))].value,
+                "(0x1201, 0x1016)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1012))][0][((0x1201, 0x1016))].value,
+            },
+            "(0x1201, 0x1017)": self.ds[((0x1201, 0x1010))][0][((0x1201, 0x1017))].value,
+        }
+        metadata['(0x1201, 0x1018)'] = array_summary(self.ds[(0x1201, 0x1018)][0], (0x1201, 0x101a))
+        metadata['(0x1201, 0x1019)'] = array_summary(self.ds[(0x1201, 0x1019)][0], (0x1201, 0x101a))
 
-            metadata['(0x1203, 0x1001)'] = self.ds[(0x1203, 0x1001)][0][(0x1203, 0x100a)][0][(0x1203, 0x100b)].value
-            metadata['(0x1203, 0x1002)'] = self.ds[(0x1203, 0x1002)][0][(0x1203, 0x100a)][0][(0x1203, 0x100b)].value
+        metadata['(0x1203, 0x1001)'] = self.ds[(0x1203, 0x1001)][0][(0x1203, 0x100a)][0][(0x1203, 0x100b)].value
+        metadata['(0x1203, 0x1002)'] = self.ds[(0x1203, 0x1002)][0][(0x1203, 0x100a)][0][(0x1203, 0x100b)].value
+        if self.private_arrays:
+            # The (0x1201, 0x101a) arrays themselves
+            metadata['private_arrays'] = biometry_record(self.ds, [(0x1201, 0x1018), (0x1201, 0x1019)])[1]
 
-        return metadata
+    def biometry(self):
+        """Keratometry private sequences as one flat row (common metadata first) and their arrays.
 
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        # metadata.keys()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.77.1.5.1':
-            sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-            metadata['image_PIL'].save(os.path.join(output_path, sop_path+".png"))  # To save the image to a file (e.g., PNG format)
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.7.2':
-            # Multi-frame True Color Secondary Capture Image Storage"
-            ## Bscans
-            sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}")
-            if not os.path.exists(sop_path): os.makedirs(sop_path) # make pdf (png) folder
-            for bscan in metadata['bscan_images'].keys():
-                metadata['bscan_images'][bscan].save(os.path.join(sop_path, f"{bscan}.png"))
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            self._preview_pdf_pages(output_path, metadata)
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.78.8':
-            # 'Intraocular Lens Calculations Storage'
-            with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}.json")
-                file.write(json.dumps(metadata, indent=4))
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.78.7':
-            # 'Ophthalmic Axial Measurements Right Eye Sequence'
-            with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}.json")
-                file.write(json.dumps(metadata, indent=4))
-        elif metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.78.3':
-            # 'Keratometry Measurements Storage'
-            with open(os.path.join(output_path, f"{metadata['SOP Instance']}.json"), "w") as file:
-                sop_path = os.path.join(output_path, f"{metadata['SOP Instance']}.json")
-                file.write(json.dumps(metadata, indent=4))
+        See dicomparser.private.biometry_record, the row can go straight to ColumnarExporter.add.
+        """
+        record, arrays = biometry_record(self.ds)
+        row = self.extract_common_metadata()
+        row.update(record)
+        return row, arrays
 
 # The String is from the ManufacturerModelName field in the DICOM file
 DICOMParser.register_parser("IOLMaster 700", IOLMaster_700)
@@ -2052,21 +1574,10 @@ class PLEX_ELITE_PE9000(DICOMParser):
         }
     """
 
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            metadata['png_pages'] = self._parse_pdf_pages()
-            
-        return metadata
-
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            self._preview_pdf_pages(output_path, metadata)
+    handlers = {
+        # 'Encapsulated PDF Storage'
+        ('1.2.840.10008.5.1.4.1.1.104.1', None): Handler('_parse_pdf', '_preview_pdf_pages', tags=PDF_TAGS),
+    }
 
 
 # The String is from the ManufacturerModelName field in the DICOM file
@@ -2083,21 +1594,10 @@ class Retina_Workplace(DICOMParser):
         }
     """
 
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            metadata['png_pages'] = self._parse_pdf_pages()
-            
-        return metadata
-
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        if metadata['SOP Class'] == '1.2.840.10008.5.1.4.1.1.104.1':
-            # 'Encapsulated PDF Storage'
-            self._preview_pdf_pages(output_path, metadata)
+    handlers = {
+        # 'Encapsulated PDF Storage'
+        ('1.2.840.10008.5.1.4.1.1.104.1', None): Handler('_parse_pdf', '_preview_pdf_pages', tags=PDF_TAGS),
+    }
 
 
 # The String is from the ManufacturerModelName field in the DICOM file
@@ -2105,27 +1605,31 @@ DICOMParser.register_parser("Retina Workplace", Retina_Workplace)
 
 
 class TopconIMAGEnetOCTParser(DICOMParser):
-    def parse(self):
-        metadata = self.extract_common_metadata()
-        # Get dicom into oct_converter format
-        file = Dicom(self.dicom_path)
-        # Extract OCT Volume
-        oct_volume = (
-            file.read_oct_volume()
-        )  # returns an OCT volume with additional metadata if available
+    handlers = {
+        # Any SOP Class, only the pixel data is needed for the volume
+        (None, None): Handler('_parse_oct_volume', '_preview_bscans', pixel_data=True, tags=[]),
+    }
+    _oct_volume = None
+
+    def release_pixel_data(self):
+        self._oct_volume = None
+        super().release_pixel_data()
+
+    @property
+    def oct_volume(self):
+        """oct_converter volume over the dataset already read, decoded on first use.
+
+        Same as Dicom(path).read_oct_volume() without opening the file again.
+        """
+        if self._oct_volume is None:
+            self._oct_volume = OCTVolumeWithMetaData(volume=self.get_pixel_array())
+        return self._oct_volume
+
+    def _parse_oct_volume(self, metadata):
         # oct_volume.volume.shape is (n_slices, h, w)
         # Get B Scan Images
-        bscan_imgs = self.get_bscan_images_from_pixel_array(oct_volume.volume)
+        bscan_imgs = self._bscans(self.oct_volume.volume)
         # Set metadata
         metadata['bscan_images'] = bscan_imgs
 
-        return metadata
-
-    def preview(self, output_path, write_dicom_header=False):
-        if write_dicom_header:
-            self._write_detailed_dicom_header_to_file(output_path)
-        metadata = self.parse()
-        # TODO: add logic to determine what to do
-        self.save_bscan_images(meta=metadata, output_pth=output_path)
-
 DICOMParser.register_parser("3DOCT-1Maestro2", TopconIMAGEnetOCTParser)
@@ -0,0 +1 @@
+from .DICOMParser import DICOMParser
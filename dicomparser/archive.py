@@ -0,0 +1,201 @@
+import io
+import os
+import struct
+import tarfile
+import zipfile
+
+from pydicom import dcmread
+
+
+# A member of an archive is addressed as 'bundle.zip!dir/file.dcm'
+MEMBER_SEPARATOR = "!"
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+
+def is_archive(path):
+    return str(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def split_member(path):
+    """'bundle.zip!dir/file.dcm' -> ('bundle.zip', 'dir/file.dcm'), (path, None) for anything else."""
+    path = str(path)
+    lower = path.lower()
+    ends = [lower.find(suffix + MEMBER_SEPARATOR) + len(suffix) for suffix in ARCHIVE_SUFFIXES
+            if suffix + MEMBER_SEPARATOR in lower]
+    if not ends:
+        return path, None
+    end = min(ends)
+    return path[:end], path[end + len(MEMBER_SEPARATOR):]
+
+
+def is_archive_member(path):
+    return isinstance(path, (str, os.PathLike)) and split_member(path)[1] is not None
+
+
+def member_path(archive, name):
+    return f"{archive}{MEMBER_SEPARATOR}{name}"
+
+
+class MemberFile(io.RawIOBase):
+    """Read-only, seekable window over [offset, offset + size) of an archive file.
+
+    Each one has its own handle on the archive, so members can be read in parallel.
+    """
+
+    def __init__(self, path, offset, size):
+        self.file = open(path, 'rb')
+        self.name = path
+        self.offset = offset
+        self.size = size
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = min(len(buffer), self.size - self.position)
+        if count <= 0:
+            return 0
+        self.file.seek(self.offset + self.position)
+        count = self.file.readinto(memoryview(buffer)[:count])
+        self.position += count
+        return count
+
+    def seek(self, position, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            position += self.position
+        elif whence == io.SEEK_END:
+            position += self.size
+        self.position = max(0, position)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def close(self):
+        if not self.closed:
+            self.file.close()
+        super().close()
+
+
+class ArchiveIndex:
+    """Member name -> (kind, offset, size) for one zip or tar, to open members at random.
+
+    Stored zip members and members of uncompressed tars are read in place from their
+    offset. Compressed zip members are inflated on open, compressed tars have no
+    random access and are decompressed up to the member.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.members = {}
+        if zipfile.is_zipfile(self.path):
+            self._index_zip()
+        else:
+            self._index_tar()
+
+    def _index_zip(self):
+        with zipfile.ZipFile(self.path) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                # Data offset needs the local header, read on open
+                stored = info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1
+                self.members[info.filename] = ("zip-stored" if stored else "zip", info.header_offset, info.file_size)
+
+    def _index_tar(self):
+        with tarfile.open(self.path) as archive:
+            compressed = not isinstance(archive.fileobj, io.BufferedReader)
+            for info in archive:
+                if info.isfile():
+                    self.members[info.name] = ("tar-compressed" if compressed else "tar", info.offset_data, info.size)
+
+    def names(self):
+        return list(self.members)
+
+    def open(self, name):
+        """Binary, seekable file object for one member."""
+        kind, offset, size = self.members[name]
+        if kind == "zip-stored":
+            with open(self.path, 'rb') as file:
+                file.seek(offset)
+                header = file.read(30)
+            name_length, extra_length = struct.unpack('<HH', header[26:30])
+            return io.BufferedReader(MemberFile(self.path, offset + 30 + name_length + extra_length, size))
+        if kind == "tar":
+            return io.BufferedReader(MemberFile(self.path, offset, size))
+        if kind == "zip":
+            with zipfile.ZipFile(self.path) as archive:
+                return io.BytesIO(archive.read(name))
+        with tarfile.open(self.path) as archive:
+            return io.BytesIO(archive.extractfile(name).read())
+
+
+# Archive path -> (mtime, ArchiveIndex), indexes are built once per process
+_indexes = {}
+
+
+def archive_index(path):
+    path = str(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _indexes.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _indexes[path] = (mtime, ArchiveIndex(path))
+    return cached[1]
+
+
+def iter_archive_members(path):
+    """Yield 'archive!member' paths for every file in an archive."""
+    for name in archive_index(path).names():
+        yield member_path(path, name)
+
+
+def open_input(path):
+    """Binary file object for a file path or an 'archive!member' path."""
+    archive, name = split_member(path)
+    if name is None:
+        return open(path, 'rb')
+    return archive_index(archive).open(name)
+
+
+def input_size(path):
+    archive, name = split_member(path)
+    if name is None:
+        return os.path.getsize(path)
+    return archive_index(archive).members[name][2]
+
+
+def is_in_memory(dicom_input):
+    return isinstance(dicom_input, (bytes, bytearray, memoryview)) or hasattr(dicom_input, 'read')
+
+
+def input_name(dicom_input):
+    """Printable name of an input: the path, or the name of an in-memory input."""
+    if isinstance(dicom_input, (bytes, bytearray, memoryview)):
+        return f"<{len(dicom_input)} bytes>"
+    if hasattr(dicom_input, 'read'):
+        return str(getattr(dicom_input, 'name', '<file object>'))
+    return str(dicom_input)
+
+
+def dcmread_input(dicom_input, **kwargs):
+    """dcmread for a file path, an 'archive!member' path, bytes or a seekable binary file object.
+
+    Members are never extracted to disk. File objects are rewound to where they were,
+    so the same one can be read again (create_parser reads it twice).
+    """
+    if isinstance(dicom_input, (bytes, bytearray, memoryview)):
+        return dcmread(io.BytesIO(dicom_input), **kwargs)
+    if hasattr(dicom_input, 'read'):
+        start = dicom_input.tell()
+        try:
+            return dcmread(dicom_input, **kwargs)
+        finally:
+            dicom_input.seek(start)
+    if not is_archive_member(dicom_input):
+        return dcmread(dicom_input, **kwargs)
+    with open_input(dicom_input) as file:
+        return dcmread(file, **kwargs)
@@ -0,0 +1,171 @@
+import os
+
+from dicomparser.DICOMParser import DICOMParser
+from dicomparser.archive import is_archive, iter_archive_members
+from dicomparser.manifest import ManifestWriter, dumps, metadata_to_record
+from dicomparser.export import ColumnarExporter
+from dicomparser.dedup import Deduplicator
+from dicomparser.pool import TimeoutPool
+from dicomparser.study import SQLiteStudyIndex, StudyIndex
+
+
+def iter_input_files(input_folder=None, input_list=None, archives=False):
+    """Yield input files from a folder tree and/or a text file with one path per line.
+
+    With archives, zip/tar files are replaced by their members ('bundle.zip!dir/file.dcm'),
+    which are read straight from the archive.
+    """
+    def expand(path):
+        if archives and is_archive(path):
+            yield from iter_archive_members(path)
+        else:
+            yield path
+
+    if input_list:
+        with open(input_list) as file:
+            for line in file:
+                if line.strip():
+                    yield from expand(line.strip())
+    if input_folder:
+        for root, dirs, files in os.walk(input_folder):
+            dirs.sort()
+            for name in sorted(files):
+                yield from expand(os.path.join(root, name))
+
+
+def process_file(dicom_file, output_folder=None, write_dicom_header=False, on_stage=None, links=False,
+                 private_arrays=False):
+    """Parse one file, writing its preview (and header dump) when output_folder is given.
+
+    on_stage(name) is called as the file moves through 'read', 'header', 'parse' and
+    'preview', so a failure or hang can be pinned on a stage. links adds the study /
+    series / frame of reference UIDs and referenced instances as 'Instance Links'.
+    private_arrays decodes the vendor arrays, written next to the preview as {SOP Instance}.npz.
+    """
+    on_stage = on_stage or (lambda stage: None)
+    on_stage("read")
+    with DICOMParser.create_parser(dicom_file) as parser: # Factory method selects subclass
+        if output_folder and write_dicom_header:
+            on_stage("header")
+            if not os.path.exists(output_folder): os.makedirs(output_folder)
+            parser._write_detailed_dicom_header_to_file(output_folder, 'json' if write_dicom_header == 'json' else 'text')
+        on_stage("parse")
+        metadata = parser.parse(keep_pixel_data=False, as_array=True, private_arrays=private_arrays)
+        if links:
+            metadata["Instance Links"] = parser.instance_links()
+        if output_folder:
+            on_stage("preview")
+            if not os.path.exists(output_folder): os.makedirs(output_folder)
+            parser.write_preview(output_folder, metadata)
+    return metadata
+
+
+def _process_task(task, on_stage):
+    # Runs in a pool worker, only the compact record (no images) goes back to the parent
+    dicom_file, output_folder, write_dicom_header, links, private_arrays = task
+    return metadata_to_record(process_file(dicom_file, output_folder, write_dicom_header, on_stage, links,
+                                           private_arrays))
+
+
+def _run_sequential(files, output_folder, write_dicom_header, links=False, private_arrays=False):
+    for dicom_file in files:
+        stage = {"name": None}
+        def on_stage(name):
+            stage["name"] = name
+        try:
+            metadata = process_file(dicom_file, output_folder, write_dicom_header, on_stage, links, private_arrays)
+        except Exception as e:
+            yield dicom_file, "failed", repr(e), stage["name"]
+        else:
+            yield dicom_file, "done", metadata, stage["name"]
+
+
+def _run_pool(files, output_folder, write_dicom_header, workers, timeout, links=False, private_arrays=False):
+    pool = TimeoutPool(_process_task, workers=workers, timeout=timeout)
+    tasks = ((dicom_file, output_folder, write_dicom_header, links, private_arrays) for dicom_file in files)
+    for task, status, result, stage in pool.imap_unordered(tasks):
+        yield task[0], status, result, stage
+
+
+def run_batch(files, output_folder=None, manifest=None, manifest_gzip=False, columnar=None,
+              dedup=None, aliases=None, write_dicom_header=False, workers=None, timeout=None,
+              quarantine=None, study_index=None, bundles=None, private_arrays=False):
+    """Process files, recording each in the manifest and/or columnar export.
+
+    dedup='uid' skips files whose SOPInstanceUID was already processed, dedup='hash' also
+    requires the Pixel Data / PDF bytes to match. Skipped copies are written to aliases
+    as {processed file: [copies]}.
+
+    With workers (or a timeout) files are processed in a pool of worker processes, and a
+    file taking longer than timeout seconds has its worker killed and replaced. Failed,
+    timed out and crashed files are appended to quarantine as JSON lines with the error
+    and the stage they were in.
+
+    study_index (a SQLite file, added to across runs) and/or bundles (a folder) index
+    every instance by SOP Instance, Study Instance and Frame of Reference UID as it is
+    done; at the end bundles gets one {Study Instance}.json per study with its
+    instances by series and their references resolved.
+
+    private_arrays also writes each file's decoded vendor arrays (thickness maps, cube
+    layers, ...) to {SOP Instance}.npz in output_folder.
+    """
+    manifest_writer = ManifestWriter(manifest, compress=manifest_gzip) if manifest else None
+    exporter = ColumnarExporter(columnar) if columnar else None
+    deduplicator = Deduplicator(use_hash=(dedup == 'hash')) if dedup else None
+    quarantine_file = open(quarantine, 'ab') if quarantine else None
+    index = None
+    if study_index:
+        index = SQLiteStudyIndex(study_index)
+    elif bundles:
+        index = StudyIndex()
+    links = index is not None
+    done, failed = 0, 0
+
+    def unique_files():
+        for dicom_file in files:
+            try:
+                if deduplicator is not None and deduplicator.check(dicom_file) is not None:
+                    continue
+            except Exception as e:
+                print(f"Dedup check failed: {dicom_file}")
+                print(repr(e))
+            yield dicom_file
+
+    try:
+        if workers or timeout:
+            results = _run_pool(unique_files(), output_folder, write_dicom_header, workers, timeout, links,
+                                private_arrays)
+        else:
+            results = _run_sequential(unique_files(), output_folder, write_dicom_header, links, private_arrays)
+        for dicom_file, status, result, stage in results:
+            if status != "done":
+                print(f"Failed ({status} in {stage}): {dicom_file}")
+                print(result)
+                if quarantine_file is not None:
+                    quarantine_file.write(dumps({"source": str(dicom_file), "status": status,
+                                                 "stage": stage, "error": result}) + b'\n')
+                    quarantine_file.flush()
+                failed += 1
+                continue
+            if manifest_writer is not None:
+                manifest_writer.write_metadata(result, source=str(dicom_file))
+            if exporter is not None:
+                exporter.add(result)
+            if index is not None:
+                index.add(result, source=str(dicom_file))
+            done += 1
+        if index is not None and bundles:
+            print(f"{index.write_bundles(bundles)} study bundles written to {bundles}")
+    finally:
+        if index is not None:
+            index.close()
+        if manifest_writer is not None:
+            manifest_writer.close()
+        if exporter is not None:
+            exporter.close()
+        if quarantine_file is not None:
+            quarantine_file.close()
+        if deduplicator is not None and aliases:
+            deduplicator.write_aliases(aliases)
+    duplicates = deduplicator.duplicate_count() if deduplicator is not None else 0
+    return {"done": done, "failed": failed, "duplicates": duplicates}
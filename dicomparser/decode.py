@@ -0,0 +1,203 @@
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from pydicom.encaps import encapsulate, generate_frames
+from pydicom.pixels import get_decoder
+from pydicom.pixels.encoders import RLELosslessEncoder
+from pydicom.uid import JPEG2000, JPEG2000Lossless, JPEGBaseline8Bit, RLELossless
+
+
+# Transfer Syntax UID -> fastest decoding plugin that passed validation, per process
+_decoder_choice = {}
+# Rows and columns of the synthetic frame decoders are benchmarked on
+SAMPLE_SIZE = 256
+
+
+def frame_count(ds):
+    return int(ds.get("NumberOfFrames", 1) or 1)
+
+
+def decode_options(ds):
+    """Image Pixel module values a decoder needs when given one frame instead of the dataset."""
+    return {
+        "rows": ds.Rows,
+        "columns": ds.Columns,
+        "samples_per_pixel": ds.SamplesPerPixel,
+        "bits_allocated": ds.BitsAllocated,
+        "bits_stored": ds.BitsStored,
+        "pixel_representation": ds.PixelRepresentation,
+        "photometric_interpretation": ds.PhotometricInterpretation,
+        "planar_configuration": ds.get("PlanarConfiguration", 0),
+        "transfer_syntax_uid": ds.file_meta.TransferSyntaxUID,
+        "number_of_frames": 1,
+    }
+
+
+def _agrees(arr, reference, exact=False):
+    # Lossy JPEG decoders may round the IDCT differently, allow that but nothing more
+    if arr.shape != reference.shape or arr.dtype != reference.dtype:
+        return False
+    if exact:
+        return np.array_equal(arr, reference)
+    return np.abs(arr.astype(np.float64) - reference).mean() <= 1.0
+
+
+def sample_array(samples_per_pixel=1, bits_allocated=8, size=SAMPLE_SIZE):
+    """Small synthetic image, a gradient with fixed noise so it compresses like a real one."""
+    peak = 255 if bits_allocated == 8 else 4095
+    y, x = np.mgrid[0:size, 0:size]
+    noise = np.random.default_rng(0).normal(0, peak / 50, (size, size))
+    arr = ((x + y) * peak / (2 * size) + noise).clip(0, peak).astype(np.uint8 if bits_allocated == 8 else np.uint16)
+    if samples_per_pixel == 3:
+        arr = np.stack([arr, arr[::-1], arr[:, ::-1]], axis=-1)
+    return arr
+
+
+def synthetic_sample(transfer_syntax, samples_per_pixel=1, bits_allocated=8):
+    """(encoded frame, decode options, source array or None if lossy) of sample_array() in transfer_syntax.
+
+    RLE Lossless is encoded by pydicom, JPEG Baseline (8-bit) and JPEG 2000 (lossless
+    codestream) by Pillow. None for anything else, or when the encoder isn't installed.
+    """
+    if samples_per_pixel not in (1, 3) or bits_allocated not in (8, 16):
+        return None
+    arr = sample_array(samples_per_pixel, bits_allocated)
+    options = {
+        "rows": arr.shape[0],
+        "columns": arr.shape[1],
+        "samples_per_pixel": samples_per_pixel,
+        "bits_allocated": bits_allocated,
+        "bits_stored": bits_allocated,
+        "pixel_representation": 0,
+        "photometric_interpretation": "MONOCHROME2" if samples_per_pixel == 1 else "RGB",
+        "planar_configuration": 0,
+        "transfer_syntax_uid": transfer_syntax,
+        "number_of_frames": 1,
+    }
+    try:
+        if transfer_syntax == RLELossless:
+            return RLELosslessEncoder.encode(arr, **options), options, arr
+        if transfer_syntax == JPEGBaseline8Bit and bits_allocated == 8:
+            buffer = io.BytesIO()
+            Image.fromarray(arr).save(buffer, format='JPEG', quality=90)
+            if samples_per_pixel == 3:
+                # Pillow writes color JPEG as YCbCr
+                options["photometric_interpretation"] = "YBR_FULL_422"
+            return buffer.getvalue(), options, None
+        if transfer_syntax in (JPEG2000Lossless, JPEG2000) and (samples_per_pixel == 1 or bits_allocated == 8):
+            buffer = io.BytesIO()
+            image = Image.fromarray(arr) if bits_allocated == 8 else Image.fromarray(arr, mode='I;16')
+            image.save(buffer, format='JPEG2000', no_jp2=True, irreversible=False, mct=0)
+            return buffer.getvalue(), options, arr
+    except Exception as e:
+        print(f"Could not encode a {transfer_syntax.name} sample: {e!r}")
+    return None
+
+
+def select_decoder(ds, repeats=3):
+    """Name of the fastest decoding plugin installed for ds's transfer syntax.
+
+    The first time a transfer syntax is seen (so during the first such file's parse),
+    every available plugin (pylibjpeg, gdcm, pillow, pydicom's own) decodes a small
+    synthetic frame in that transfer syntax, with ds's samples per pixel and bits
+    allocated, `repeats` times. Lossless samples must decode to exactly the source
+    image, the lossy JPEG one must agree with what pydicom decodes by default
+    (decoding_plugin=''). Plugins that fail or disagree are dropped. Transfer syntaxes
+    with no encoder here (JPEG Lossless, JPEG-LS, ...) are benchmarked on ds's first
+    frame instead. The choice is cached for the rest of the process. Uncompressed data
+    is always "native".
+    """
+    transfer_syntax = ds.file_meta.TransferSyntaxUID
+    if not transfer_syntax.is_encapsulated:
+        # Native data is read straight into numpy, nothing to choose
+        return "native"
+    if transfer_syntax in _decoder_choice:
+        return _decoder_choice[transfer_syntax]
+    decoder = get_decoder(transfer_syntax)
+    plugins = list(decoder.available_plugins)
+    if len(plugins) < 2:
+        choice = plugins[0] if plugins else ''
+        _decoder_choice[transfer_syntax] = choice
+        return choice
+
+    sample = synthetic_sample(transfer_syntax, ds.get("SamplesPerPixel", 1), ds.get("BitsAllocated", 8))
+    if sample is not None:
+        frame, options, reference = sample
+        src, kwargs = encapsulate([frame]), options
+    else:
+        src, kwargs, reference = ds, {"index": 0}, None
+    exact = reference is not None
+    if reference is None:
+        try:
+            reference, _ = decoder.as_array(src, decoding_plugin='', **kwargs)
+        except Exception as e:
+            print(f"Default decoder failed on {transfer_syntax.name}: {e!r}")
+            _decoder_choice[transfer_syntax] = ''
+            return ''
+
+    timings = {}
+    for plugin in plugins:
+        try:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                arr, _ = decoder.as_array(src, decoding_plugin=plugin, **kwargs)
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            print(f"Decoder {plugin} failed on {transfer_syntax.name}: {e!r}")
+            continue
+        if not _agrees(arr, reference, exact):
+            print(f"Decoder {plugin} gives a different image on {transfer_syntax.name}, skipped")
+            continue
+        timings[plugin] = elapsed
+    choice = min(timings, key=timings.get) if timings else ''
+    _decoder_choice[transfer_syntax] = choice
+    return choice
+
+
+def decoder_choices():
+    """{transfer syntax name: plugin} for every transfer syntax decoded so far."""
+    return {uid.name: plugin for uid, plugin in _decoder_choice.items()}
+
+
+def decode_pixel_array(ds, workers=None, decoding_plugin=''):
+    """Pixel Data as one ndarray, compressed multi-frame data decoded a frame per thread.
+
+    Uncompressed data is left to ds.pixel_array. decoding_plugin picks the plugin for
+    compressed data, '' lets pydicom choose (see select_decoder()). Multi-frame data
+    is split into its encapsulated frames up front and the frames decoded in a
+    thread pool into a preallocated (frames, rows, columns[, samples]) array, the
+    JPEG / JPEG 2000 / RLE decoders spend most of their time outside the GIL.
+    """
+    transfer_syntax = ds.file_meta.TransferSyntaxUID
+    frames = frame_count(ds)
+    workers = workers or os.cpu_count() or 1
+    if not transfer_syntax.is_encapsulated:
+        return ds.pixel_array
+
+    decoder = get_decoder(transfer_syntax)
+    if frames < 2 or workers < 2:
+        arr, _ = decoder.as_array(ds, decoding_plugin=decoding_plugin)
+        return arr
+    options = decode_options(ds)
+    encoded = list(generate_frames(ds.PixelData, number_of_frames=frames))
+
+    def decode(i):
+        arr, _ = decoder.as_array(encapsulate([encoded[i]]), decoding_plugin=decoding_plugin, **options)
+        return arr
+
+    first = decode(0)
+    volume = np.empty((frames,) + first.shape, dtype=first.dtype)
+    volume[0] = first
+
+    def decode_into(i):
+        volume[i] = decode(i)
+
+    with ThreadPoolExecutor(max_workers=min(workers, frames - 1)) as executor:
+        # list() so a failed frame raises here
+        list(executor.map(decode_into, range(1, frames)))
+    return volume
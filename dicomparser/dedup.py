@@ -0,0 +1,104 @@
+import json
+import hashlib
+from collections import defaultdict
+
+from pydicom.encaps import generate_fragments
+from pydicom.filereader import read_partial
+from pydicom.tag import Tag
+
+from dicomparser.archive import open_input
+
+
+# Bulk values that identify the content of an instance: Pixel Data, Encapsulated Document (PDF)
+BULK_TAGS = (Tag(0x7FE0, 0x0010), Tag(0x0042, 0x0011))
+UNDEFINED_LENGTH = 0xFFFFFFFF
+
+
+def read_instance_uid(dicom_path):
+    """SOPInstanceUID from the leading group 0008 elements only."""
+    with open_input(dicom_path) as file:
+        ds = read_partial(file, stop_when=lambda tag, VR, length: tag.group > 0x0008,
+                          specific_tags=[Tag("SOPInstanceUID")])
+    return str(ds.get("SOPInstanceUID", "Unknown"))
+
+
+def content_hash(dicom_path, chunk_size=1024 * 1024):
+    """Streaming hash of the Pixel Data or PDF bytes, None when the file has neither.
+
+    The header is read up to the bulk element, which is then hashed in chunks (or
+    fragment by fragment when encapsulated) without loading it whole.
+    """
+    with open_input(dicom_path) as file:
+        bulk = {}
+
+        def stop_at_bulk(tag, VR, length):
+            if tag in BULK_TAGS:
+                bulk.update(length=length, offset=file.tell())
+                return True
+            return False
+
+        read_partial(file, stop_when=stop_at_bulk, specific_tags=[Tag("SOPInstanceUID")])
+        if not bulk:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        file.seek(bulk["offset"])
+        if bulk["length"] == UNDEFINED_LENGTH:
+            # Encapsulated Pixel Data: Basic Offset Table then one item per fragment
+            for fragment in generate_fragments(file):
+                digest.update(fragment)
+        else:
+            remaining = bulk["length"]
+            while remaining > 0:
+                chunk = file.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+        return digest.hexdigest()
+
+
+class Deduplicator:
+    """Track which files are copies of an instance already seen.
+
+    Files are grouped by SOPInstanceUID. With use_hash, files sharing a UID are only
+    treated as copies when their Pixel Data / PDF hashes also match; hashes are only
+    computed once a UID repeats, so unique files cost a single small header read.
+    """
+
+    def __init__(self, use_hash=False):
+        self.use_hash = use_hash
+        self.seen = {}  # uid -> {hash or None: canonical path}
+        self.aliases = defaultdict(list)  # canonical path -> duplicate paths
+
+    def check(self, dicom_path):
+        """Return the canonical path if dicom_path duplicates a file already seen, else None."""
+        dicom_path = str(dicom_path)
+        uid = read_instance_uid(dicom_path)
+        if uid == "Unknown":
+            return None
+        if uid not in self.seen:
+            self.seen[uid] = {None: dicom_path}
+            return None
+        copies = self.seen[uid]
+        if not self.use_hash:
+            canonical = copies[None]
+        else:
+            if None in copies:
+                # First repeat of this UID, hash the file seen first
+                first = copies.pop(None)
+                copies[content_hash(first)] = first
+            digest = content_hash(dicom_path)
+            if digest not in copies:
+                copies[digest] = dicom_path
+                print(f"Same SOPInstanceUID, different content: {dicom_path}")
+                return None
+            canonical = copies[digest]
+        self.aliases[canonical].append(dicom_path)
+        return canonical
+
+    def duplicate_count(self):
+        return sum(len(paths) for paths in self.aliases.values())
+
+    def write_aliases(self, output_path):
+        with open(output_path, "w") as file:
+            file.write(json.dumps(self.aliases, indent=4))
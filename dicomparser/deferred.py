@@ -0,0 +1,247 @@
+import io
+import struct
+
+from pydicom.dataelem import DataElement, RawDataElement
+from pydicom.dataset import Dataset
+from pydicom.filereader import read_partial
+from pydicom.sequence import Sequence
+from pydicom.tag import Tag
+
+from dicomparser.archive import dcmread_input, is_archive_member, open_input
+
+
+# Explicit VRs with 2 reserved bytes and a 4 byte length
+LONG_VRS = {b'OB', b'OD', b'OF', b'OL', b'OV', b'OW', b'SQ', b'SV', b'UC', b'UN', b'UR', b'UT', b'UV'}
+UNDEFINED_LENGTH = 0xFFFFFFFF
+ITEM = 0xFFFEE000
+ITEM_END = 0xFFFEE00D
+SEQUENCE_END = 0xFFFEE0DD
+PIXEL_DATA = 0x7FE00010
+SPECIFIC_CHARACTER_SET = 0x00080005
+# Values are counted from the length alone for these
+BYTE_VRS = ('OB', 'OD', 'OF', 'OL', 'OV', 'OW', 'UN')
+VR_SIZES = {'AT': 4, 'FL': 4, 'FD': 8, 'SL': 4, 'SS': 2, 'SV': 8, 'UL': 4, 'US': 2, 'UV': 8}
+
+
+class NotDeferrable(Exception):
+    """The file has something the header walker doesn't handle, read it with dcmread instead."""
+
+
+class _OwnPosition:
+    """A file object read from its own position, putting the underlying one back after every read.
+
+    Deferred values of a caller's file object are loaded through this, so loading them
+    never moves the file object the caller holds (and may read again).
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.position = fp.tell()
+
+    def _at_position(self, read, *args):
+        saved = self.fp.tell()
+        self.fp.seek(self.position)
+        try:
+            return read(*args)
+        finally:
+            self.position = self.fp.tell()
+            self.fp.seek(saved)
+
+    def read(self, size=-1):
+        return self._at_position(self.fp.read, size)
+
+    def readinto(self, buffer):
+        return self._at_position(self.fp.readinto, buffer)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            saved = self.fp.tell()
+            offset += self.fp.seek(0, io.SEEK_END)
+            self.fp.seek(saved)
+        self.position = offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def __getattr__(self, name):
+        # name, closed, ...
+        return getattr(self.fp, name)
+
+
+def _stop_at_body(tag, VR, length):
+    return True
+
+
+class _Walker:
+    """Walks element headers of an Explicit VR Little Endian body, nested sequences included.
+
+    Values up to defer_size bytes are read, larger ones are left in the file as
+    RawDataElements without a value, which pydicom reads when the element is first
+    accessed (the same as dcmread(defer_size=...) does, but also inside sequences).
+    """
+
+    def __init__(self, fp, ds, defer_size):
+        self.fp = fp
+        self.ds = ds
+        self.defer_size = defer_size
+
+    def _header(self):
+        header = self.fp.read(8)
+        if len(header) < 8:
+            return None, None, None
+        group, element = struct.unpack('<HH', header[:4])
+        tag = group << 16 | element
+        if group == 0xFFFE:
+            return tag, None, struct.unpack('<L', header[4:])[0]
+        vr = header[4:6]
+        if vr in LONG_VRS:
+            return tag, vr, struct.unpack('<L', self.fp.read(4))[0]
+        return tag, vr, struct.unpack('<H', header[6:])[0]
+
+    def read_elements(self, dataset, end=None, tags=None, stop_before_pixels=False, keep=True):
+        """Elements up to end (or up to the item delimiter when end is None) into dataset."""
+        while end is None or self.fp.tell() < end:
+            start = self.fp.tell()
+            tag, vr, length = self._header()
+            if tag is None or tag == ITEM_END:
+                return
+            if tag == PIXEL_DATA and stop_before_pixels:
+                self.fp.seek(start)
+                return
+            if vr is None:
+                raise NotDeferrable(f"Unexpected item tag {tag:08X}")
+            value_tell = self.fp.tell()
+            wanted = keep and (tags is None or tag in tags)
+            if vr == b'SQ' or (vr == b'UN' and length == UNDEFINED_LENGTH):
+                if vr == b'UN':
+                    # Implicit VR inside, not walked
+                    raise NotDeferrable(f"UN sequence {tag:08X}")
+                if not wanted and length != UNDEFINED_LENGTH:
+                    self.fp.seek(length, io.SEEK_CUR)
+                    continue
+                items = self.read_items(length, keep=wanted)
+                if wanted:
+                    dataset.add(DataElement(Tag(tag), 'SQ', Sequence(items), value_tell,
+                                            is_undefined_length=length == UNDEFINED_LENGTH))
+                continue
+            if length == UNDEFINED_LENGTH:
+                # Encapsulated Pixel Data and the like
+                raise NotDeferrable(f"Undefined length {vr.decode()} {tag:08X}")
+            if not wanted:
+                self.fp.seek(length, io.SEEK_CUR)
+                continue
+            if length > self.defer_size and tag != SPECIFIC_CHARACTER_SET:
+                value = None
+                self.fp.seek(length, io.SEEK_CUR)
+            else:
+                value = self.fp.read(length)
+            # Stored raw (as dcmread does), converted by pydicom on first access
+            dataset._dict[Tag(tag)] = RawDataElement(Tag(tag), vr.decode(), length, value, value_tell, False, True)
+
+    def read_items(self, length, keep=True):
+        end = None if length == UNDEFINED_LENGTH else self.fp.tell() + length
+        items = []
+        while end is None or self.fp.tell() < end:
+            tag, vr, item_length = self._header()
+            if tag is None or tag == SEQUENCE_END:
+                break
+            if tag != ITEM:
+                raise NotDeferrable(f"Expected an item, got {tag:08X}")
+            item_end = None if item_length == UNDEFINED_LENGTH else self.fp.tell() + item_length
+            if not keep:
+                if item_end is None:
+                    self.read_elements(None, keep=False)
+                else:
+                    self.fp.seek(item_end)
+                continue
+            item = Dataset()
+            # Where pydicom looks for deferred values
+            item.filename, item.buffer = self.ds.filename, self.ds.buffer
+            item.fileobj_type, item.timestamp = self.ds.fileobj_type, self.ds.timestamp
+            self.read_elements(item, item_end)
+            items.append(item)
+        return items
+
+
+def read_deferred(fp, defer_size, specific_tags=None, stop_before_pixels=True, from_buffer=False):
+    """Read a dataset from fp leaving every value over defer_size bytes in the file, at any depth.
+
+    Returns None when the transfer syntax isn't Explicit VR Little Endian, use
+    dcmread(defer_size=...) for those. fp must stay readable (or be a named file that
+    stays in place) for deferred values to load. With from_buffer they are only ever
+    read from fp, never by reopening fp.name (an archive member's name is the archive's).
+    """
+    start = fp.tell()
+    ds = read_partial(fp, stop_when=_stop_at_body)
+    if from_buffer:
+        ds.filename, ds.buffer, ds.fileobj_type = None, fp, type(fp)
+    transfer_syntax = ds.file_meta.get("TransferSyntaxUID")
+    if transfer_syntax is None or transfer_syntax.is_implicit_VR or not transfer_syntax.is_little_endian \
+            or transfer_syntax.is_deflated:
+        fp.seek(start)
+        return None
+    tags = None if specific_tags is None else {int(Tag(tag)) for tag in specific_tags} | {SPECIFIC_CHARACTER_SET}
+    try:
+        _Walker(fp, ds, defer_size).read_elements(ds, tags=tags, stop_before_pixels=stop_before_pixels)
+    except NotDeferrable:
+        fp.seek(start)
+        return None
+    return ds
+
+
+def array_summary(ds, tag):
+    """'VR: Array of N elements' for an element of ds, without loading it if it was deferred."""
+    raw = ds.get_item(tag, keep_deferred=True)
+    if isinstance(raw, RawDataElement) and raw.VR in BYTE_VRS:
+        return f"{raw.VR}: Array of {raw.length} elements"
+    if isinstance(raw, RawDataElement) and raw.VR in VR_SIZES:
+        return f"{raw.VR}: Array of {raw.length // VR_SIZES[raw.VR]} elements"
+    elem = ds[tag]
+    return f"{elem.VR}: Array of {len(elem.value)} elements"
+
+
+def dcmread_deferred(dicom_input, defer_size, specific_tags=None, stop_before_pixels=True):
+    """read_deferred for a path, an 'archive!member' path, bytes or a file object, None for anything it can't defer.
+
+    Deferred values of a path are read again from the path, bytes are kept in memory.
+    Archive members and file objects stay open on the dataset (ds.buffer) and deferred
+    values are read from them, so a file object must not be closed while its dataset
+    is in use. File objects are left where they were, loading a deferred value included,
+    so the same one can be read again as with dcmread_input.
+    """
+    if isinstance(dicom_input, (bytes, bytearray, memoryview)):
+        fp = io.BytesIO(dicom_input)
+        return read_deferred(fp, defer_size, specific_tags, stop_before_pixels)
+    if hasattr(dicom_input, 'read'):
+        return read_deferred(_OwnPosition(dicom_input), defer_size, specific_tags, stop_before_pixels,
+                             from_buffer=True)
+    if is_archive_member(dicom_input):
+        fp = open_input(dicom_input)
+        ds = read_deferred(fp, defer_size, specific_tags, stop_before_pixels, from_buffer=True)
+        if ds is None:
+            fp.close()
+        return ds
+    with open(dicom_input, 'rb') as fp:
+        # fp is closed by the time values are loaded, pydicom reopens fp.name then
+        return read_deferred(fp, defer_size, specific_tags, stop_before_pixels)
+
+
+def dcmread_header(dicom_input, defer_size=None, specific_tags=None, stop_before_pixels=True):
+    """Everything before Pixel Data (or the whole file), from a path, an 'archive!member' path, bytes or a file object.
+
+    Values over defer_size bytes (inside sequences too) are read only when touched,
+    see dcmread_deferred. Anything but Explicit VR Little Endian is read by dcmread,
+    deferring only top level values and only for plain paths and bytes.
+    """
+    if defer_size is not None:
+        ds = dcmread_deferred(dicom_input, defer_size, specific_tags, stop_before_pixels)
+        if ds is not None:
+            return ds
+    # dcmread would reopen a member's archive or a file object's name to load deferred values
+    deferrable = isinstance(dicom_input, (bytes, bytearray, memoryview)) \
+        or not (hasattr(dicom_input, 'read') or is_archive_member(dicom_input))
+    return dcmread_input(dicom_input, stop_before_pixels=stop_before_pixels, specific_tags=specific_tags,
+                         defer_size=defer_size if deferrable else None)
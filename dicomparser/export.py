@@ -0,0 +1,198 @@
+import os
+import csv
+import json
+from collections import defaultdict
+
+from dicomparser.manifest import IMAGE_KEYS, dumps, read_manifest
+
+# Parquet if installed, chunked CSV otherwise
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+# Columns every table starts with, in this order
+COMMON_COLUMNS = ["Manufacturer", "Patient ID", "Model", "Modality", "Study Date",
+                  "SOP Class", "SOP Class Description", "SOP Instance", "Series Description"]
+
+
+def flatten_metadata(metadata):
+    """Turn one parse()/manifest record into a flat row of scalars.
+
+    Rendered images are dropped, "Unknown" becomes null and anything nested
+    (Pixel Spacing, sequences, private tag dicts) is stored as a JSON string.
+    """
+    row = {}
+    for key, value in metadata.items():
+        if key in IMAGE_KEYS:
+            continue
+        if isinstance(value, str):
+            row[key] = None if value == "Unknown" else str(value)
+        elif value is None or isinstance(value, (bool, int, float)):
+            row[key] = value
+        else:
+            row[key] = dumps(value).decode('utf-8')
+    return row
+
+
+def _safe_name(name):
+    return str(name).replace(os.sep, '_').replace('\\', '_').strip() or "Unknown"
+
+
+class ColumnarExporter:
+    """Batch flat metadata rows into Parquet (or CSV) files, one table per (model, SOP class).
+
+    Layout is {output_folder}/{Model}/{SOP Class Description}/part-00000.parquet plus a
+    schema.json with every column seen for that table (and its type, for Parquet).
+    Column types carry over from batch to batch (widened to double or text when a later
+    batch doesn't fit), and on close parts written before a column appeared or widened
+    are rewritten to the final schema, so all parts of a table read as one.
+    """
+
+    def __init__(self, output_folder, batch_size=10000, file_format=None):
+        self.output_folder = str(output_folder)
+        self.batch_size = batch_size
+        self.file_format = file_format or ('parquet' if pa is not None else 'csv')
+        if self.file_format == 'parquet' and pa is None:
+            raise ImportError("pyarrow is required for parquet export")
+        self.batches = defaultdict(list)
+        self.schemas = defaultdict(dict)  # column -> arrow type (None until known), in column order
+        self.folders = {}  # group -> folder, once written to
+
+    def _group(self, row):
+        sop = row.get("SOP Class Description") or row.get("SOP Class") or "Unknown"
+        return (_safe_name(row.get("Model") or "Unknown"), _safe_name(sop))
+
+    def add(self, metadata):
+        row = flatten_metadata(metadata)
+        group = self._group(row)
+        for column in row:
+            self.schemas[group].setdefault(column, None)
+        self.batches[group].append(row)
+        if len(self.batches[group]) >= self.batch_size:
+            self._flush_group(group)
+
+    def _columns(self, group):
+        columns = [c for c in COMMON_COLUMNS if c in self.schemas[group]]
+        return columns + [c for c in self.schemas[group] if c not in COMMON_COLUMNS]
+
+    def _next_part_path(self, folder):
+        part = 0
+        while os.path.exists(os.path.join(folder, f"part-{part:05d}.{self.file_format}")):
+            part += 1
+        return os.path.join(folder, f"part-{part:05d}.{self.file_format}")
+
+    def _flush_group(self, group):
+        rows = self.batches.pop(group, [])
+        if not rows:
+            return
+        folder = os.path.join(self.output_folder, *group)
+        if not os.path.exists(folder): os.makedirs(folder)
+        if group not in self.folders and self.file_format == 'parquet':
+            self._load_schema(group, folder)
+        self.folders[group] = folder
+        columns = self._columns(group)
+        path = self._next_part_path(folder)
+        if self.file_format == 'parquet':
+            table = _arrow_table(rows, columns, self.schemas[group])
+            for field in table.schema:
+                if not pa.types.is_null(field.type):
+                    self.schemas[group][field.name] = field.type
+            pq.write_table(table, path)
+        else:
+            with open(path, "w", newline='', encoding='utf-8') as file:
+                writer = csv.DictWriter(file, fieldnames=columns)
+                writer.writeheader()
+                writer.writerows(rows)
+        self._write_schema(group)
+
+    def _load_schema(self, group, folder):
+        # Parts from an earlier run into the same folder, their types are the starting point
+        path = os.path.join(folder, "schema.json")
+        if not os.path.exists(path):
+            return
+        with open(path) as file:
+            for column, type_name in json.load(file).items():
+                known = self.schemas[group].get(column)
+                self.schemas[group][column] = known if known is not None or type_name is None \
+                    else pa.type_for_alias(type_name)
+
+    def _write_schema(self, group):
+        columns = self._columns(group)
+        schema = columns if self.file_format != 'parquet' else \
+            {c: None if self.schemas[group][c] is None else str(self.schemas[group][c]) for c in columns}
+        with open(os.path.join(self.folders[group], "schema.json"), "w") as file:
+            file.write(json.dumps(schema, indent=4))
+
+    def _conform(self, group):
+        """Rewrite parts of a table that don't match its final schema (missing or narrower columns)."""
+        columns = self._columns(group)
+        schema = pa.schema([(c, self.schemas[group][c] or pa.null()) for c in columns])
+        folder = self.folders[group]
+        for name in sorted(os.listdir(folder)):
+            if not name.endswith('.parquet'):
+                continue
+            path = os.path.join(folder, name)
+            try:
+                if pq.read_schema(path).equals(schema):
+                    continue
+                table = pq.read_table(path)
+                arrays = [table.column(c).cast(schema.field(c).type) if c in table.column_names
+                          else pa.nulls(table.num_rows, schema.field(c).type) for c in columns]
+                pq.write_table(pa.Table.from_arrays(arrays, schema=schema), path)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                print(f"Could not conform {path} to the table schema")
+                print(repr(e))
+
+    def flush(self):
+        for group in list(self.batches):
+            self._flush_group(group)
+
+    def close(self):
+        self.flush()
+        if self.file_format == 'parquet':
+            for group in self.folders:
+                self._conform(group)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _as_text(values):
+    return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+
+def _column_array(values, known=None):
+    """Arrow array of one column's values in the type the column has so far, widened if they don't fit."""
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed types across exams, keep the column as text
+        return _as_text(values)
+    if known is None or pa.types.is_null(known) or array.type == known:
+        return array
+    if pa.types.is_null(array.type):
+        return array.cast(known)
+    numeric = (pa.types.is_integer, pa.types.is_floating)
+    if any(f(array.type) for f in numeric) and any(f(known) for f in numeric):
+        return array.cast(pa.float64())
+    # Same text as earlier parts get when conformed to a text column
+    return array.cast(pa.string())
+
+
+def _arrow_table(rows, columns, types=None):
+    types = types or {}
+    arrays = [_column_array([row.get(column) for row in rows], types.get(column)) for column in columns]
+    return pa.Table.from_arrays(arrays, names=columns)
+
+
+def export_manifest(manifest_prefix, output_folder, **kwargs):
+    """Convert an existing JSON Lines manifest into columnar files."""
+    with ColumnarExporter(output_folder, **kwargs) as exporter:
+        for record in read_manifest(manifest_prefix):
+            exporter.add(record)
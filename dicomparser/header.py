@@ -0,0 +1,72 @@
+import json
+
+from pydicom.datadict import dictionary_description, dictionary_has_tag, dictionary_VR
+
+
+def _is_deferred(raw):
+    # Read with defer_size: value left on disk, only its offset and length are known.
+    # Sequences are always loaded and walked, only their bulk values stay on disk
+    return raw is not None and raw.value is None and getattr(raw, 'value_tell', None) is not None \
+        and raw.length and _raw_vr(raw) != 'SQ'
+
+
+def _raw_vr(raw):
+    if raw.VR:
+        return raw.VR
+    return dictionary_VR(raw.tag) if dictionary_has_tag(raw.tag) else 'UN'
+
+
+def _raw_name(raw):
+    return dictionary_description(raw.tag) if dictionary_has_tag(raw.tag) else 'Private tag data'
+
+
+def bulk_data_uri(source_uri, raw):
+    return f"{source_uri}?offset={raw.value_tell}&length={raw.length}"
+
+
+def write_header_text(ds, file, indent=''):
+    """Write ds element by element in the same layout as str(ds), without building the whole string.
+
+    Values deferred by dcmread(defer_size=...) are never loaded, a one line summary
+    with their size in bytes and offset is written instead.
+    """
+    if indent == '' and getattr(ds, 'file_meta', None):
+        file.write("Dataset.file_meta -------------------------------\n")
+        for elem in ds.file_meta:
+            file.write(f"{elem}\n")
+        file.write("-------------------------------------------------\n")
+    for tag in ds.keys():
+        raw = ds.get_item(tag, keep_deferred=True)
+        if _is_deferred(raw):
+            file.write(f"{indent}{raw.tag} {_raw_name(raw):<35} {_raw_vr(raw)}: {raw.length} bytes "
+                       f"(not loaded, offset {raw.value_tell})\n")
+            continue
+        elem = ds[tag]
+        if elem.VR == 'SQ':
+            file.write(f"{indent}{elem.tag}  {elem.name}  {len(elem.value)} item(s) ---- \n")
+            for item in elem.value:
+                write_header_text(item, file, indent + '   ')
+                file.write(f"{indent}   ---------\n")
+        else:
+            file.write(f"{indent}{elem}\n")
+
+
+def write_header_json(ds, file, source_uri, bulk_threshold=1024):
+    """Write ds as the DICOM JSON model, one element at a time.
+
+    Values over bulk_threshold bytes become BulkDataURI entries. Top-level values
+    deferred by dcmread(defer_size=...) point at their byte range in the source file;
+    bulk values inside sequences point at the source file and tag.
+    """
+    def bulk_handler(elem):
+        return f"{source_uri}#{int(elem.tag):08X}"
+
+    file.write("{")
+    for i, tag in enumerate(ds.keys()):
+        raw = ds.get_item(tag, keep_deferred=True)
+        if _is_deferred(raw):
+            value = {"vr": _raw_vr(raw), "BulkDataURI": bulk_data_uri(source_uri, raw)}
+        else:
+            value = ds[tag].to_json_dict(bulk_handler, bulk_threshold)
+        file.write(("," if i else "") + f'\n"{int(tag):08X}":' + json.dumps(value))
+    file.write("\n}\n")
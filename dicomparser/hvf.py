@@ -0,0 +1,64 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from hvf_extraction_script.hvf_data.hvf_object import Hvf_Object
+from hvf_extraction_script.utilities.file_utils import File_Utils
+
+from dicomparser.archive import dcmread_input, input_name
+from dicomparser.DICOMParser import ROUTING_TAGS
+from dicomparser.manifest import ManifestWriter
+
+
+# 'Ophthalmic Visual Field Static Perimetry Measurements Storage'
+HVF_SOP_CLASS = '1.2.840.10008.5.1.4.1.1.80.1'
+
+
+def extract_hvf(dicom_path):
+    """(path, SOP Instance, HVF JSON, error) for one file, HVF JSON is None for other SOP classes.
+
+    dicom_path can also be bytes or a seekable binary file object.
+
+    Only the routing tags are read for files that aren't visual fields, and the header
+    (no pixel data) is read once for those that are.
+    """
+    try:
+        header = dcmread_input(dicom_path, stop_before_pixels=True, specific_tags=ROUTING_TAGS)
+        if header.get("SOPClassUID") != HVF_SOP_CLASS:
+            return input_name(dicom_path), None, None, None
+        ds = dcmread_input(dicom_path, stop_before_pixels=True)
+        hvf_obj = Hvf_Object.get_hvf_object_from_dicom(ds)
+        return input_name(dicom_path), str(ds.get("SOPInstanceUID", "Unknown")), hvf_obj.serialize_to_json(), None
+    except Exception as e:
+        return input_name(dicom_path), None, None, repr(e)
+
+
+def run_hvf_batch(files, output_folder=None, manifest=None, workers=None):
+    """Extract HVF objects from many files with a pool of long-lived worker processes.
+
+    Workers import the HVF extraction code once and stay up for the whole run. Each
+    visual field is written as {SOP Instance}.json (same as preview) and/or appended to
+    the manifest; other SOP classes are skipped.
+    """
+    if output_folder and not os.path.exists(output_folder): os.makedirs(output_folder)
+    manifest_writer = ManifestWriter(manifest) if manifest else None
+    done, skipped, failed = 0, 0, 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for dicom_file, sop_instance, hvf_json, error in executor.map(extract_hvf, files, chunksize=16):
+                if error is not None:
+                    print(f"Failed: {dicom_file}")
+                    print(error)
+                    failed += 1
+                    continue
+                if hvf_json is None:
+                    skipped += 1
+                    continue
+                if output_folder:
+                    File_Utils.write_string_to_file(hvf_json, os.path.join(output_folder, f"{sop_instance}.json"))
+                if manifest_writer is not None:
+                    manifest_writer.write({"SOP Instance": sop_instance, "HVF Object": hvf_json, "source": dicom_file})
+                done += 1
+    finally:
+        if manifest_writer is not None:
+            manifest_writer.close()
+    return {"done": done, "skipped": skipped, "failed": failed}
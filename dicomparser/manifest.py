@@ -0,0 +1,149 @@
+import os
+import re
+import gzip
+import json
+import numpy as np
+from PIL import Image
+
+from pydicom.dataset import Dataset
+from pydicom.multival import MultiValue
+from pydicom.valuerep import PersonName
+
+# Fast encoder if installed, stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Keys of parse() output that hold rendered images (or decoded arrays) rather than metadata
+IMAGE_KEYS = ('image_PIL', 'bscan_images', 'en_face_image', 'png_pages', 'private_arrays')
+
+
+def json_default(obj):
+    """Encode numpy and pydicom values that json/orjson can't handle natively."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (MultiValue, tuple, set)):
+        return list(obj)
+    if isinstance(obj, int):
+        return int(obj)  # pydicom IS
+    if isinstance(obj, float):
+        return float(obj)  # pydicom DSfloat
+    if isinstance(obj, str):
+        return str(obj)  # pydicom UID and friends
+    if isinstance(obj, PersonName):
+        return str(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return f"bytes: {len(obj)}"
+    if isinstance(obj, Dataset):
+        return {str(elem.tag): elem.repval for elem in obj}
+    if isinstance(obj, Image.Image):
+        return f"{obj.mode} image {obj.width}x{obj.height}"
+    return str(obj)
+
+
+def dumps(obj):
+    """Compact single-line JSON as bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=json_default, separators=(',', ':')).encode('utf-8')
+
+
+def metadata_to_record(metadata, **extra):
+    """Drop rendered images from parse() output, keeping counts, so it fits on one line."""
+    record = {}
+    for key, value in metadata.items():
+        if key in IMAGE_KEYS:
+            if isinstance(value, dict):
+                record[key] = len(value)
+            elif key == 'bscan_images' and isinstance(value, np.ndarray):
+                record[key] = value.shape[0]  # as_array mode volume
+            else:
+                record[key] = 1
+        else:
+            record[key] = value
+    record.update(extra)
+    return record
+
+
+class ManifestWriter:
+    """Append one compact JSON record per parsed file to a rotating .jsonl (or .jsonl.gz) file.
+
+    Files are named {prefix}-{part:05d}.jsonl and a new part is started once the current
+    one grows past max_bytes on disk (compressed bytes for .gz parts, which trail by what
+    the compressor still holds, at most a few hundred KiB). Safe to reopen from a later
+    run, it keeps appending to the last part.
+    """
+
+    def __init__(self, prefix, max_bytes=256 * 1024 * 1024, compress=False):
+        self.prefix = str(prefix)
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.extension = '.jsonl.gz' if compress else '.jsonl'
+        folder = os.path.dirname(self.prefix)
+        if folder and not os.path.exists(folder): os.makedirs(folder)
+        self.part = 0
+        while os.path.exists(self._part_path(self.part + 1)):
+            self.part += 1
+        self.file = None
+        self._open()
+
+    def _part_path(self, part):
+        return f"{self.prefix}-{part:05d}{self.extension}"
+
+    def _open(self):
+        self.path = self._part_path(self.part)
+        if self.compress:
+            self.file = gzip.open(self.path, 'ab')
+        else:
+            self.file = open(self.path, 'ab')
+        self.size = self._disk_size()
+
+    def _disk_size(self):
+        # Bytes in the part file so far, the gzip file object counts uncompressed bytes
+        return self.file.fileobj.tell() if self.compress else self.file.tell()
+
+    def write(self, record):
+        line = dumps(record) + b'\n'
+        if self.size and self.size + (0 if self.compress else len(line)) > self.max_bytes:
+            self.file.close()
+            self.part += 1
+            self._open()
+        self.file.write(line)
+        self.size = self._disk_size()
+
+    def write_metadata(self, metadata, **extra):
+        self.write(metadata_to_record(metadata, **extra))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_manifest(prefix):
+    """Yield every record from all parts written under prefix."""
+    folder = os.path.dirname(str(prefix)) or '.'
+    name = os.path.basename(str(prefix))
+    # Only this prefix's own parts, not 'prefix-shard-0-of-2-00000.jsonl' and the like
+    part_name = re.compile(re.escape(name) + r'-\d{5}\.jsonl(\.gz)?$')
+    parts = sorted(f for f in os.listdir(folder) if part_name.match(f))
+    for part in parts:
+        path = os.path.join(folder, part)
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,95 @@
+from functools import lru_cache
+
+import numpy as np
+
+from pydicom.multival import MultiValue
+
+
+def _first(value):
+    return value[0] if isinstance(value, (list, tuple, MultiValue)) else value
+
+
+def window_from_dataset(ds):
+    """(center, width) of the first VOI window in ds, None when there is none."""
+    center, width = ds.get("WindowCenter"), ds.get("WindowWidth")
+    if center is None or width is None:
+        return None
+    return float(_first(center)), float(_first(width))
+
+
+def percentile_window(arr, slope=1.0, intercept=0.0, percentiles=(0.5, 99.5), sample_size=1 << 18):
+    """(center, width) clipping arr at the given percentiles, from an evenly strided sample.
+
+    Rounded to whole stored values so similar volumes share a lookup table.
+    """
+    flat = arr.reshape(-1)
+    low, high = np.percentile(flat[::max(1, flat.size // sample_size)], percentiles)
+    low, high = round(low) * slope + intercept, round(high) * slope + intercept
+    return (low + high) / 2 + 0.5, max(high - low, 1) + 1
+
+
+@lru_cache(maxsize=64)
+def display_lut(bits, signed, bits_stored, slope, intercept, center, width, invert=False, voi_lut=None):
+    """uint8 table indexed by every `bits`-wide stored value (read as unsigned).
+
+    Applies the Modality rescale, then the VOI LUT (voi_lut=(first mapped value, lut
+    bits, data bytes)) or the linear window of PS3.3 C.11.2.1.2, MONOCHROME1 inverted.
+    """
+    size = 1 << bits
+    stored = np.arange(size, dtype=np.int64)
+    if signed:
+        stored = np.where(stored >= size >> 1, stored - size, stored)
+    # Values above BitsStored never occur, clamping keeps the table monotonic anyway
+    stored = np.clip(stored, -(1 << (bits_stored - 1)) if signed else 0, (1 << bits_stored) - 1)
+    if voi_lut is not None:
+        first, lut_bits, data = voi_lut
+        table = np.frombuffer(data, dtype=np.uint16 if lut_bits > 8 else np.uint8)
+        x = stored if (slope, intercept) == (1.0, 0.0) else np.round(stored * slope + intercept).astype(np.int64)
+        out = table[np.clip(x - first, 0, len(table) - 1)].astype(np.float64) * 255 / ((1 << lut_bits) - 1)
+    else:
+        x = stored * slope + intercept
+        out = ((x - (center - 0.5)) / max(width - 1, 1) + 0.5) * 255
+    lut = np.round(np.clip(out, 0, 255)).astype(np.uint8)
+    if invert:
+        lut = 255 - lut
+    lut.flags.writeable = False
+    return lut
+
+
+def _voi_lut(ds):
+    # First item of VOI LUT Sequence as a hashable (first mapped value, bits, data) key
+    sequence = ds.get("VOILUTSequence")
+    if not sequence:
+        return None
+    item = sequence[0]
+    _, first, lut_bits = item.LUTDescriptor
+    data = item.LUTData
+    if not isinstance(data, (bytes, bytearray)):
+        data = np.asarray(data, dtype=np.uint16 if lut_bits > 8 else np.uint8).tobytes()
+    return int(first), int(lut_bits), bytes(data)
+
+
+def to_8bit(arr, ds, percentiles=(0.5, 99.5)):
+    """8-bit display copy of arr (one frame or a whole volume) in a single np.take pass.
+
+    The VOI LUT or window in ds is used when there is one, otherwise arr is clipped at
+    the given percentiles. Lookup tables are cached per (BitsStored, window, ...).
+    8-bit data is returned unchanged.
+    """
+    if arr.dtype == np.uint8:
+        return arr
+    slope = float(ds.get("RescaleSlope", 1) or 1)
+    intercept = float(ds.get("RescaleIntercept", 0) or 0)
+    invert = ds.get("PhotometricInterpretation") == "MONOCHROME1"
+    if arr.dtype.kind not in "iu" or arr.dtype.itemsize > 2:
+        # Float or 32-bit data, too wide for a table
+        center, width = window_from_dataset(ds) or percentile_window(arr, 1.0, 0.0, percentiles)
+        out = np.clip(((arr - (center - 0.5)) / max(width - 1, 1) + 0.5) * 255, 0, 255).astype(np.uint8)
+        return 255 - out if invert else out
+    bits = arr.dtype.itemsize * 8
+    bits_stored = min(int(ds.get("BitsStored", bits) or bits), bits)
+    voi_lut = _voi_lut(ds)
+    window = None if voi_lut else window_from_dataset(ds) or percentile_window(arr, slope, intercept, percentiles)
+    center, width = window or (None, None)
+    lut = display_lut(bits, arr.dtype.kind == "i", bits_stored, slope, intercept, center, width, invert, voi_lut)
+    return np.take(lut, arr.view(np.uint16 if bits == 16 else np.uint8))
@@ -0,0 +1,144 @@
+import time
+import signal
+import multiprocessing
+from multiprocessing.connection import wait
+
+
+def _worker_loop(conn, function):
+    # Ctrl-C goes to the whole process group, let the parent decide how to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    def on_stage(stage):
+        conn.send(("stage", stage))
+
+    while True:
+        task = conn.recv()
+        if task is None:
+            return
+        try:
+            result = function(task, on_stage)
+        except Exception as e:
+            conn.send(("failed", repr(e)))
+        else:
+            conn.send(("done", result))
+
+
+class _Worker:
+    def __init__(self, context, function):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn, function), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None
+        self.stage = None
+        self.started = None
+
+    def submit(self, task):
+        self.task = task
+        self.stage = "queued"
+        self.started = time.monotonic()
+        self.conn.send(task)
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join(5)
+        self.conn.close()
+
+
+class TimeoutPool:
+    """Worker processes that each run function(task, on_stage) on one task at a time.
+
+    A task still running after timeout seconds gets its worker killed and replaced,
+    so one pathological file can't stall the pool. Workers report the stage they are
+    in through on_stage, which is returned with every failure.
+    """
+
+    def __init__(self, function, workers=None, timeout=None):
+        self.function = function
+        self.workers = workers or multiprocessing.cpu_count()
+        self.timeout = timeout
+        self.context = multiprocessing.get_context()
+
+    def start(self):
+        """Start the workers. They stay up (warm) between tasks until close()."""
+        self.idle = [_Worker(self.context, self.function) for _ in range(self.workers)]
+        self.busy = {}  # conn -> worker
+
+    def free(self):
+        """Number of idle workers, submit() needs one."""
+        return len(self.idle)
+
+    def pending(self):
+        return len(self.busy)
+
+    def submit(self, task):
+        worker = self.idle.pop()
+        worker.submit(task)
+        self.busy[worker.conn] = worker
+
+    def poll(self, timeout=None):
+        """Wait up to timeout seconds for tasks to finish and yield them as (task, status, result, stage).
+
+        status is 'done', 'failed', 'timeout' or 'crashed'. For 'done' result is the
+        function's return value, otherwise the error as a string.
+        """
+        if not self.busy:
+            return
+        wait_for = timeout
+        if self.timeout is not None:
+            now = time.monotonic()
+            until_timeout = max(0, min(w.started + self.timeout for w in self.busy.values()) - now)
+            wait_for = until_timeout if wait_for is None else min(wait_for, until_timeout)
+        for conn in wait(list(self.busy), timeout=wait_for):
+            worker = self.busy[conn]
+            try:
+                while conn.poll():
+                    kind, value = conn.recv()
+                    if kind == "stage":
+                        worker.stage = value
+                        continue
+                    del self.busy[conn]
+                    self.idle.append(worker)
+                    yield worker.task, kind, value, worker.stage
+                    break
+            except (EOFError, OSError):
+                # Worker died (segfault in a decoder, OOM kill): replace it
+                del self.busy[conn]
+                worker.stop(kill=True)
+                self.idle.append(_Worker(self.context, self.function))
+                yield worker.task, "crashed", f"worker exited with code {worker.process.exitcode}", worker.stage
+        if self.timeout is not None:
+            now = time.monotonic()
+            for conn, worker in list(self.busy.items()):
+                if now - worker.started > self.timeout:
+                    del self.busy[conn]
+                    worker.stop(kill=True)
+                    self.idle.append(_Worker(self.context, self.function))
+                    yield worker.task, "timeout", f"no result after {self.timeout}s", worker.stage
+
+    def close(self):
+        for worker in self.idle + list(self.busy.values()):
+            worker.stop(kill=worker.conn in self.busy)
+        self.idle, self.busy = [], {}
+
+    def imap_unordered(self, tasks):
+        """Yield (task, status, result, stage) for every task, see poll()."""
+        tasks = iter(tasks)
+        self.start()
+        try:
+            while True:
+                while self.idle:
+                    task = next(tasks, None)
+                    if task is None:
+                        break
+                    self.submit(task)
+                if not self.busy:
+                    return
+                yield from self.poll()
+        finally:
+            self.close()
@@ -0,0 +1,217 @@
+import re
+
+import numpy as np
+
+from pydicom.dataelem import RawDataElement
+from pydicom.tag import Tag
+
+from dicomparser.archive import input_name
+from dicomparser.deferred import dcmread_header
+from dicomparser.results import plain
+
+
+# CIRRUS 'Macular Thickness' maps
+THICKNESS_TAGS = ((0x0409, 0x1001), (0x0409, 0x1002), (0x0409, 0x1003))
+THICKNESS_DTYPE = np.dtype('<f4')
+# Number of values -> (rows, columns) of the scan patterns' maps, square maps are found
+# on their own and anything else stays 1-D
+MAP_SHAPES = {128 * 512: (128, 512), 200 * 200: (200, 200)}
+# CIRRUS cube / raster layers: (0407,10a0..10b5) -> item -> (0407,1005) slices -> (0407,1006)
+SLICE_ITEMS = (0x0407, 0x1005)
+SLICE_DATA = (0x0407, 0x1006)
+SLICE_DTYPE = np.dtype('<u2')
+# IOLMaster 700 keratometry private sequences, flattened by biometry_record()
+IOL_SEQUENCES = ((0x1201, 0x1001), (0x1201, 0x1002), (0x1201, 0x1008), (0x1201, 0x1009), (0x1201, 0x100f),
+                 (0x1201, 0x1010), (0x1201, 0x1018), (0x1201, 0x1019), (0x1203, 0x1001), (0x1203, 0x1002))
+IOL_ARRAY = (0x1201, 0x101a)
+# Numeric VRs read as is, OB/UN payloads as IOL_ARRAY_DTYPE
+IOL_ARRAY_DTYPE = np.dtype('<f4')
+VR_DTYPES = {'FL': '<f4', 'OF': '<f4', 'FD': '<f8', 'OD': '<f8', 'SL': '<i4', 'UL': '<u4', 'OL': '<u4',
+             'SS': '<i2', 'US': '<u2', 'OW': '<u2', 'SV': '<i8', 'UV': '<u8', 'OV': '<u8'}
+
+
+def tag_key(tag):
+    """(0x0409, 0x1001) -> '(0x0409, 0x1001)', the key parse() uses for private tags."""
+    tag = Tag(tag)
+    return f"(0x{tag.group:04x}, 0x{tag.element:04x})"
+
+
+def map_shape(count, shapes=MAP_SHAPES):
+    if count in shapes:
+        return shapes[count]
+    side = int(round(count ** 0.5))
+    return (side, side) if side * side == count else (count,)
+
+
+def decode_array(value, dtype, shape=None):
+    """Bytes of a private OB/OW value as an ndarray, a view on the bytes (read-only, no copy)."""
+    arr = np.frombuffer(value, dtype=dtype, count=len(value) // dtype.itemsize)
+    return arr.reshape(shape) if shape is not None else arr
+
+
+def thickness_maps(ds, dtype=THICKNESS_DTYPE):
+    """'(0x0409, 0x1001)' ... -> 2-D thickness grid for each map present in ds."""
+    maps = {}
+    for tag in THICKNESS_TAGS:
+        if tag in ds:
+            value = ds[tag].value
+            maps[tag_key(tag)] = decode_array(value, dtype, map_shape(len(value) // dtype.itemsize))
+    return maps
+
+
+def value_length(ds, tag):
+    """Bytes in ds[tag]'s value, from the header if it is still raw (deferred or not yet converted)."""
+    raw = ds.get_item(tag, keep_deferred=True)
+    if isinstance(raw, RawDataElement):
+        return raw.length
+    # Already converted, e.g. read by pydicom from an implicit VR or UN item
+    return len(raw.value) if raw.value is not None else 0
+
+
+def read_value_into(ds, tag, out):
+    """Copy the bytes of ds[tag] into out's buffer, straight from the file if it was deferred."""
+    raw = ds.get_item(tag, keep_deferred=True)
+    buffer = memoryview(out).cast('B')
+    if raw.value is not None:
+        buffer[:] = raw.value[:len(buffer)]
+    elif ds.buffer is not None and not getattr(ds.buffer, 'closed', False):
+        ds.buffer.seek(raw.value_tell)
+        ds.buffer.readinto(buffer)
+    else:
+        with open(ds.filename, 'rb') as file:
+            file.seek(raw.value_tell)
+            file.readinto(buffer)
+
+
+def scan_width(series_description):
+    """A-scans per B-scan from 'Macular Cube 512x128' / 'Optic Disc Cube 200x200', None if not there."""
+    match = re.search(r'(\d+)x(\d+)', str(series_description))
+    return int(match.group(1)) if match else None
+
+
+def slice_stack(ds, tag, dtype=SLICE_DTYPE, width=None):
+    """The (0x0407, 0x1006) slices of one layer sequence as one (slices, values) array.
+
+    Allocated once and filled slice by slice, deferred slices are read from the file
+    straight into their row. With width (A-scans per B-scan) dividing the slice size,
+    the stack is (slices, rows, width). None when the slices differ in size.
+    """
+    slices = ds[tag].value[0][SLICE_ITEMS].value
+    lengths = {value_length(item, SLICE_DATA) for item in slices}
+    if len(lengths) != 1:
+        print(f"{tag_key(tag)} slices differ in size: {sorted(lengths)}")
+        return None
+    count = lengths.pop() // dtype.itemsize
+    shape = (count // width, width) if width and count % width == 0 else (count,)
+    stack = np.empty((len(slices),) + shape, dtype=dtype)
+    for i, item in enumerate(slices):
+        raw = item.get_item(SLICE_DATA, keep_deferred=True)
+        if raw.value is not None:
+            stack[i] = decode_array(raw.value, dtype, shape)
+        else:
+            read_value_into(item, SLICE_DATA, stack[i])
+    return stack
+
+
+def slice_stacks(ds, tags, series_description=None, dtype=SLICE_DTYPE):
+    """'(0x0407, 0x10a0)' ... -> slice_stack() for each layer sequence present in ds."""
+    width = scan_width(series_description)
+    stacks = {}
+    for tag in tags:
+        if tag in ds and len(ds[tag].value) and SLICE_ITEMS in ds[tag].value[0]:
+            stack = slice_stack(ds, tag, dtype, width)
+            if stack is not None:
+                stacks[tag_key(tag)] = stack
+    return stacks
+
+
+def save_arrays(path, arrays):
+    """Write {'(0x0407, 0x10a0)': array, ...} to one .npz, arrays named like '0407_10a0'."""
+    np.savez(path, **{re.sub(r'\(0x(\w+), 0x(\w+)\)', r'\1_\2', key): value for key, value in arrays.items()})
+
+
+def _decode_element(dataset, tag, raw, dtype):
+    dtype = np.dtype(VR_DTYPES.get(raw.VR, dtype))
+    if raw.value is None:
+        arr = np.empty(raw.length // dtype.itemsize, dtype=dtype)
+        read_value_into(dataset, tag, arr)
+        return arr
+    if isinstance(raw.value, (bytes, bytearray)):
+        return decode_array(raw.value, dtype)
+    # Already converted by pydicom (MultiValue of numbers)
+    return np.asarray(raw.value, dtype=dtype)
+
+
+def _flatten_sequence(items, key, record, arrays, dtype):
+    for i, item in enumerate(items):
+        _flatten(item, key if len(items) == 1 else f"{key}[{i}]", record, arrays, dtype)
+
+
+def _flatten(dataset, prefix, record, arrays, dtype):
+    # Every element is visited once, nested items get their path as the key
+    for tag in dataset.keys():
+        if tag.is_private_creator:
+            continue
+        key = f"{prefix}.{tag_key(tag)}" if prefix else tag_key(tag)
+        raw = dataset.get_item(tag, keep_deferred=True)
+        if tag == IOL_ARRAY:
+            arrays[key] = _decode_element(dataset, tag, raw, dtype)
+            record[f"{key} length"] = int(arrays[key].size)
+            continue
+        value = dataset[tag].value
+        if dataset[tag].VR == 'SQ':
+            _flatten_sequence(value, key, record, arrays, dtype)
+        else:
+            record[key] = plain(value)
+
+
+def biometry_record(ds, tags=IOL_SEQUENCES, dtype=IOL_ARRAY_DTYPE):
+    """IOLMaster 700 private sequences as one flat record plus their (1201,101a) arrays.
+
+    Each sequence is walked once. Record keys are tag paths like
+    '(0x1201, 0x1008).(0x1201, 0x100a).(0x1201, 0x1005)' ('[i]' after sequences with more
+    than one item) with plain Python scalars, ready for ColumnarExporter. The arrays come
+    back by the same keys as numpy arrays (np.frombuffer views on the value bytes), their
+    sizes are in the record as '... length'.
+    """
+    record, arrays = {}, {}
+    for tag in tags:
+        if tag in ds:
+            _flatten_sequence(ds[tag].value, tag_key(tag), record, arrays, dtype)
+    return record, arrays
+
+
+def stack_thickness_maps(dicom_inputs, tag=THICKNESS_TAGS[0], dtype=THICKNESS_DTYPE, defer_size=1024):
+    """One (exams, rows, columns) array of the same map from many Macular Thickness objects.
+
+    The stack is allocated once (shape taken from the first file) and each map is read
+    from its file straight into its row. Files without the map or with a different
+    shape are skipped. Returns the stack and one {source, SOP Instance, Laterality} per row.
+    """
+    dicom_inputs = list(dicom_inputs)
+    stack = None
+    index = []
+    tags = list(THICKNESS_TAGS) + ["SOPInstanceUID", "Laterality"]
+    for dicom_input in dicom_inputs:
+        try:
+            ds = dcmread_header(dicom_input, defer_size, specific_tags=tags)
+            raw = ds.get_item(tag, keep_deferred=True)
+            if raw is None:
+                print(f"No {tag_key(tag)}: {input_name(dicom_input)}")
+                continue
+            shape = map_shape(value_length(ds, tag) // dtype.itemsize)
+            if stack is None:
+                stack = np.empty((len(dicom_inputs),) + shape, dtype=dtype)
+            if shape != stack.shape[1:]:
+                print(f"{tag_key(tag)} is {shape}, not {stack.shape[1:]}: {input_name(dicom_input)}")
+                continue
+            read_value_into(ds, tag, stack[len(index)])
+        except Exception as e:
+            print(f"Failed: {input_name(dicom_input)}")
+            print(repr(e))
+            continue
+        index.append({"source": input_name(dicom_input), "SOP Instance": ds.get("SOPInstanceUID", "Unknown"),
+                      "Laterality": ds.get("Laterality", "Unknown")})
+    if stack is None:
+        return np.empty((0,), dtype=dtype), index
+    return stack[:len(index)], index
@@ -0,0 +1,184 @@
+import numpy as np
+
+from pydicom.dataset import Dataset
+from pydicom.multival import MultiValue
+from pydicom.valuerep import PersonName
+
+from dicomparser.manifest import IMAGE_KEYS, dumps
+
+
+def plain(value):
+    """pydicom values -> plain Python (str/int/float/list/dict), "Unknown" -> None."""
+    if value is None or isinstance(value, (bool, np.ndarray)):
+        return value
+    if isinstance(value, str):
+        return None if value == "Unknown" else str(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, PersonName):
+        return str(value)
+    if isinstance(value, (list, tuple, MultiValue)):
+        return [plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): plain(v) for k, v in value.items()}
+    if isinstance(value, Dataset):
+        return {str(elem.tag): elem.repval for elem in value}
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return str(value)
+
+
+def as_array(image):
+    """PIL image or ndarray -> ndarray (no copy for ndarrays)."""
+    if image is None or isinstance(image, np.ndarray):
+        return image
+    return np.asarray(image)
+
+
+def as_volume(frames):
+    """{'bscan1': image, ...} or an ndarray -> one (frames, rows, columns[, samples]) ndarray."""
+    if frames is None or isinstance(frames, np.ndarray):
+        return frames
+    return np.stack([as_array(frame) for frame in frames.values()])
+
+
+class ParseResult:
+    """Compact parse() output: common metadata as slots, everything else in `extra`.
+
+    Subclasses per SOP class add their own slots; `fields` maps slot -> parse() key.
+    """
+
+    fields = (("manufacturer", "Manufacturer"), ("patient_id", "Patient ID"), ("model", "Model"),
+              ("modality", "Modality"), ("study_date", "Study Date"), ("sop_class", "SOP Class"),
+              ("sop_class_description", "SOP Class Description"), ("sop_instance", "SOP Instance"),
+              ("series_description", "Series Description"))
+    arrays = ()
+    __slots__ = ("manufacturer", "patient_id", "model", "modality", "study_date", "sop_class",
+                 "sop_class_description", "sop_instance", "series_description", "extra")
+
+    @classmethod
+    def from_metadata(cls, metadata):
+        result = cls.__new__(cls)
+        used = set(IMAGE_KEYS)
+        for slot, key in cls.fields:
+            setattr(result, slot, plain(metadata.get(key)))
+            used.add(key)
+        result._set_arrays(metadata)
+        result.extra = {key: plain(value) for key, value in metadata.items() if key not in used}
+        return result
+
+    def _set_arrays(self, metadata):
+        pass
+
+    def to_dict(self, include_arrays=False):
+        """Slots as a dict, arrays as {shape, dtype} unless include_arrays."""
+        out = {}
+        for slot, key in self.fields:
+            out[key] = getattr(self, slot)
+        for slot in self.arrays:
+            value = getattr(self, slot)
+            if value is not None and not include_arrays:
+                value = {"shape": list(value.shape), "dtype": str(value.dtype)}
+            out[slot] = value
+        out.update(self.extra)
+        return out
+
+    def to_json(self, include_arrays=False):
+        """Compact JSON bytes (orjson when installed, arrays serialized natively)."""
+        return dumps(self.to_dict(include_arrays))
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.model} {self.sop_instance}>"
+
+
+class PhotoResult(ParseResult):
+    """'Ophthalmic Photography 8 Bit Image Storage' and 16 Bit"""
+
+    fields = ParseResult.fields + (("laterality", "Laterality"), ("bits_allocated", "Bits Allocated"),
+                                   ("photometric_interpretation", "Photometric Interpretation"),
+                                   ("pixel_spacing", "Pixel Spacing"), ("image_type", "Image Type"))
+    arrays = ("image",)
+    __slots__ = ("laterality", "bits_allocated", "photometric_interpretation", "pixel_spacing",
+                 "image_type", "image")
+
+    def _set_arrays(self, metadata):
+        # Humphrey Field Analyzer 3 photos come back as B-scans
+        image = metadata.get('image_PIL')
+        if image is None and metadata.get('bscan_images') is not None:
+            image = as_volume(metadata['bscan_images'])
+        self.image = as_array(image)
+
+
+class VolumeResult(ParseResult):
+    """'Ophthalmic Tomography Image Storage' and multi-frame secondary captures"""
+
+    fields = ParseResult.fields + (("laterality", "Laterality"), ("number_of_frames", "Number of Frames"))
+    arrays = ("volume", "en_face")
+    __slots__ = ("laterality", "number_of_frames", "volume", "en_face")
+
+    def _set_arrays(self, metadata):
+        self.volume = as_volume(metadata.get('bscan_images'))
+        self.en_face = as_array(metadata.get('en_face_image'))
+
+
+class PDFResult(ParseResult):
+    """'Encapsulated PDF Storage', one RGB array per rendered page"""
+
+    __slots__ = ("pages",)
+
+    def _set_arrays(self, metadata):
+        pages = metadata.get('png_pages') or {}
+        self.pages = [as_array(page['page_PIL']) for page in pages.values()]
+
+    def to_dict(self, include_arrays=False):
+        out = super().to_dict(include_arrays)
+        out["pages"] = (list(self.pages) if include_arrays
+                        else [{"shape": list(page.shape), "dtype": str(page.dtype)} for page in self.pages])
+        return out
+
+
+class VisualFieldResult(ParseResult):
+    """'Ophthalmic Visual Field Static Perimetry Measurements Storage'"""
+
+    fields = ParseResult.fields + (("hvf", "HVF Object"),)
+    __slots__ = ("hvf",)
+
+
+class MeasurementResult(ParseResult):
+    """Spatial Registration, axial / keratometry / IOL measurements: laterality plus `extra`,
+    decoded private arrays by tag in `private_arrays`"""
+
+    fields = ParseResult.fields + (("laterality", "Laterality"),)
+    __slots__ = ("laterality", "private_arrays")
+
+    def _set_arrays(self, metadata):
+        self.private_arrays = dict(metadata.get('private_arrays') or {})
+
+    def to_dict(self, include_arrays=False):
+        out = super().to_dict(include_arrays)
+        out["private_arrays"] = {tag: value if include_arrays else {"shape": list(value.shape), "dtype": str(value.dtype)}
+                                 for tag, value in self.private_arrays.items()}
+        return out
+
+
+RESULT_CLASSES = {
+    '1.2.840.10008.5.1.4.1.1.77.1.5.1': PhotoResult,
+    '1.2.840.10008.5.1.4.1.1.77.1.5.2': PhotoResult,
+    '1.2.840.10008.5.1.4.1.1.77.1.5.4': VolumeResult,
+    '1.2.840.10008.5.1.4.1.1.7.2': VolumeResult,
+    '1.2.840.10008.5.1.4.1.1.104.1': PDFResult,
+    '1.2.840.10008.5.1.4.1.1.80.1': VisualFieldResult,
+    '1.2.840.10008.5.1.4.1.1.66': MeasurementResult,
+    '1.2.840.10008.5.1.4.1.1.78.3': MeasurementResult,
+    '1.2.840.10008.5.1.4.1.1.78.7': MeasurementResult,
+    '1.2.840.10008.5.1.4.1.1.78.8': MeasurementResult,
+}
+
+
+def result_from_metadata(metadata):
+    """Pick the result class for parse() output by its SOP Class."""
+    return RESULT_CLASSES.get(metadata.get("SOP Class"), ParseResult).from_metadata(metadata)
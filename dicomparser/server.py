@@ -0,0 +1,260 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import unquote, urlsplit
+
+from dicomparser.DICOMParser import DICOMParser, to_pil
+from dicomparser.manifest import dumps, metadata_to_record
+
+
+class RenderCache:
+    """LRU of rendered bytes, bounded in memory and optionally spilled to a bounded folder.
+
+    Entries evicted from memory are kept on disk (when folder is set) until the disk
+    budget is used up, oldest first. The disk tier survives restarts.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, folder=None, max_disk_bytes=2 * 1024 ** 3):
+        self.max_bytes = max_bytes
+        self.folder = folder
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()  # key -> bytes
+        self.memory_bytes = 0
+        self.disk = OrderedDict()  # file name -> size
+        self.disk_bytes = 0
+        self.lock = threading.Lock()
+        if folder:
+            if not os.path.exists(folder): os.makedirs(folder)
+            # Least recently written first
+            for entry in sorted(os.scandir(folder), key=lambda entry: entry.stat().st_mtime):
+                self.disk[entry.name] = entry.stat().st_size
+                self.disk_bytes += entry.stat().st_size
+
+    @staticmethod
+    def _file_name(key):
+        return hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+            name = self._file_name(key)
+            if name not in self.disk:
+                return None
+            self.disk.move_to_end(name)
+        try:
+            with open(os.path.join(self.folder, name), 'rb') as file:
+                data = file.read()
+        except OSError:
+            return None
+        self.put(key, data, spill=False)
+        return data
+
+    def put(self, key, data, spill=True):
+        evicted = []
+        with self.lock:
+            if key in self.memory:
+                self.memory_bytes -= len(self.memory.pop(key))
+            self.memory[key] = data
+            self.memory_bytes += len(data)
+            while self.memory_bytes > self.max_bytes and len(self.memory) > 1:
+                old_key, old_data = self.memory.popitem(last=False)
+                self.memory_bytes -= len(old_data)
+                evicted.append((old_key, old_data))
+        if self.folder:
+            if spill:
+                # Write through so renders survive a restart
+                evicted.append((key, data))
+            for old_key, old_data in evicted:
+                self._spill(old_key, old_data)
+
+    def _spill(self, key, data):
+        name = self._file_name(key)
+        with self.lock:
+            if name in self.disk:
+                self.disk.move_to_end(name)
+                return
+        with open(os.path.join(self.folder, name), 'wb') as file:
+            file.write(data)
+        with self.lock:
+            self.disk[name] = len(data)
+            self.disk_bytes += len(data)
+            while self.disk_bytes > self.max_disk_bytes and len(self.disk) > 1:
+                old_name, size = self.disk.popitem(last=False)
+                self.disk_bytes -= size
+                try:
+                    os.remove(os.path.join(self.folder, old_name))
+                except OSError:
+                    pass
+
+
+def _png(image):
+    buffered = BytesIO()
+    to_pil(image).save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+def list_renders(metadata):
+    """Names of everything renderable for parse() output, as used in /render URLs."""
+    names = []
+    if metadata.get('image_PIL') is not None:
+        names.append("image")
+    if metadata.get('en_face_image') is not None:
+        names.append("en_face")
+    bscans = metadata.get('bscan_images')
+    if bscans is not None:
+        count = bscans.shape[0] if hasattr(bscans, 'shape') else len(bscans)
+        names.extend(f"bscan/{i + 1}" for i in range(count))
+    for i in range(len(metadata.get('png_pages') or {})):
+        names.append(f"page/{i + 1}")
+    return names
+
+
+def render(metadata, name):
+    """PNG bytes of one image out of parse() output, None when there is no such image."""
+    kind, _, number = name.partition("/")
+    if kind == "image" and metadata.get('image_PIL') is not None:
+        return _png(metadata['image_PIL'])
+    if kind == "en_face" and metadata.get('en_face_image') is not None:
+        return _png(metadata['en_face_image'])
+    if not number.isdigit():
+        return None
+    index = int(number) - 1
+    if kind == "bscan" and metadata.get('bscan_images') is not None:
+        bscans = metadata['bscan_images']
+        if hasattr(bscans, 'shape'):
+            return _png(bscans[index]) if 0 <= index < bscans.shape[0] else None
+        image = bscans.get(f"bscan{index + 1}")
+        return _png(image) if image is not None else None
+    if kind == "page":
+        page = (metadata.get('png_pages') or {}).get(f"page_{index + 1}")
+        return _png(page['page_PIL']) if page is not None else None
+    return None
+
+
+class PreviewService:
+    """Parse files under root on demand and render their images, caching both.
+
+    Parsed files (arrays included) are kept for the last `parsed_files` files, so
+    paging through the B-scans of one volume parses it once.
+    """
+
+    def __init__(self, root, cache=None, parsed_files=4):
+        self.root = os.path.realpath(root)
+        self.cache = cache or RenderCache()
+        self.parsed_files = parsed_files
+        self.parsed = OrderedDict()  # (path, mtime) -> metadata
+        self.lock = threading.Lock()
+
+    def resolve(self, relative_path):
+        """Absolute path of a file under root, None if it is outside root or missing."""
+        path = os.path.realpath(os.path.join(self.root, relative_path.lstrip("/")))
+        if path != self.root and not path.startswith(self.root + os.sep):
+            return None
+        return path if os.path.exists(path) else None
+
+    def parse(self, path):
+        key = (path, os.stat(path).st_mtime_ns)
+        with self.lock:
+            if key in self.parsed:
+                self.parsed.move_to_end(key)
+                return self.parsed[key]
+        with DICOMParser.create_parser(path) as parser:
+            metadata = parser.parse(keep_pixel_data=False, as_array=True)
+        with self.lock:
+            self.parsed[key] = metadata
+            while len(self.parsed) > self.parsed_files:
+                self.parsed.popitem(last=False)
+        return metadata
+
+    def info(self, path):
+        metadata = self.parse(path)
+        record = metadata_to_record(metadata)
+        record["renders"] = list_renders(metadata)
+        return record
+
+    def render(self, path, name):
+        key = (path, os.stat(path).st_mtime_ns, name)
+        data = self.cache.get(key)
+        if data is None:
+            data = render(self.parse(path), name)
+            if data is not None:
+                self.cache.put(key, data)
+        return data
+
+    def listing(self, path):
+        entries = []
+        for entry in sorted(os.scandir(path), key=lambda entry: entry.name):
+            if not entry.name.startswith('.'):
+                entries.append({"name": entry.name, "folder": entry.is_dir()})
+        return entries
+
+
+class PreviewRequestHandler(BaseHTTPRequestHandler):
+    """GET /files/<folder>       JSON listing of a folder under root
+    GET /info/<file>          parse() record plus the names of its renders
+    GET /render/<file>/<name> PNG of one render: image, en_face, bscan/<n> or page/<n>
+    """
+
+    service = None
+
+    def do_GET(self):
+        route, _, rest = unquote(urlsplit(self.path).path).lstrip("/").partition("/")
+        try:
+            if route == "files":
+                path = self.service.resolve(rest)
+                if path is None or not os.path.isdir(path):
+                    return self.send_error(404)
+                return self._send(dumps(self.service.listing(path)), "application/json")
+            if route == "info":
+                path = self.service.resolve(rest)
+                if path is None or not os.path.isfile(path):
+                    return self.send_error(404)
+                return self._send(dumps(self.service.info(path)), "application/json")
+            if route == "render":
+                # <file>/<name>, name is image, en_face, bscan/<n> or page/<n>
+                parts = rest.rsplit("/", 2)
+                if len(parts) == 3 and parts[1] in ("bscan", "page"):
+                    file_path, name = parts[0], f"{parts[1]}/{parts[2].removesuffix('.png')}"
+                else:
+                    file_path, _, name = rest.rpartition("/")
+                    name = name.removesuffix(".png")
+                path = self.service.resolve(file_path)
+                if path is None or not os.path.isfile(path):
+                    return self.send_error(404)
+                data = self.service.render(path, name)
+                if data is None:
+                    return self.send_error(404, f"No {name} in this file")
+                return self._send(data, "image/png")
+            self.send_error(404)
+        except Exception as e:
+            print(f"Failed: {self.path}")
+            print(repr(e))
+            self.send_error(500, repr(e))
+
+    def _send(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(root, host="127.0.0.1", port=8000, cache_bytes=256 * 1024 * 1024, cache_folder=None,
+          cache_disk_bytes=2 * 1024 ** 3):
+    """Serve renders of the files under root until interrupted. Nothing leaves the machine
+    unless host is set to a public interface."""
+    cache = RenderCache(cache_bytes, cache_folder, cache_disk_bytes)
+    handler = type("Handler", (PreviewRequestHandler,), {"service": PreviewService(root, cache)})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Serving {root} on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping")
+    finally:
+        server.server_close()
@@ -0,0 +1,90 @@
+import os
+import json
+import hashlib
+
+from pydicom.filereader import read_partial
+from pydicom.tag import Tag
+
+from dicomparser.archive import open_input
+from dicomparser.manifest import ManifestWriter, read_manifest
+
+
+def parse_shard(shard):
+    """'i/N' -> (i, N), with 0 <= i < N."""
+    try:
+        index, count = (int(part) for part in shard.split('/'))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {shard!r}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"shard index must be in 0..N-1, got {shard!r}")
+    return index, count
+
+
+def shard_name(index, count):
+    return f"shard-{index}-of-{count}"
+
+
+def shard_of(key, count):
+    """Stable shard for a key, the same on every node and Python version (unlike hash())."""
+    digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % count
+
+
+def read_study_uid(dicom_path):
+    """StudyInstanceUID from the leading elements only (nothing past group 0020)."""
+    with open_input(dicom_path) as file:
+        ds = read_partial(file, stop_when=lambda tag, VR, length: tag.group > 0x0020,
+                          specific_tags=[Tag("StudyInstanceUID")])
+    return ds.get("StudyInstanceUID", None)
+
+
+def shard_key(dicom_path, by='path'):
+    if by == 'study':
+        try:
+            study_uid = read_study_uid(dicom_path)
+            if study_uid:
+                return str(study_uid)
+        except Exception:
+            pass  # unreadable files are sharded by path, they fail in whichever shard gets them
+    return os.path.normpath(str(dicom_path))
+
+
+def shard_files(files, index, count, by='path'):
+    """Keep the files that belong to shard index of count.
+
+    Every node walks the same inputs and keeps its own part, so no coordinator is
+    needed. by='study' keeps all instances of a study (and their duplicates) together.
+    """
+    for dicom_file in files:
+        if shard_of(shard_key(dicom_file, by), count) == index:
+            yield dicom_file
+
+
+def write_shard_summary(manifest_prefix, index, count, summary):
+    with open(f"{manifest_prefix}-{shard_name(index, count)}.summary.json", "w") as file:
+        file.write(json.dumps(summary, indent=4))
+
+
+def merge_shards(manifest_prefix, count, output_prefix, compress=False):
+    """Combine the per-shard manifests and summaries of a sharded run.
+
+    Records of {manifest_prefix}-shard-i-of-N go into one manifest at output_prefix and
+    the summaries are added up into {output_prefix}.summary.json. Shards without a
+    summary (not finished, or not started) are listed under "missing_shards".
+    """
+    merged = {"shards": count, "missing_shards": []}
+    with ManifestWriter(output_prefix, compress=compress) as writer:
+        for index in range(count):
+            shard_prefix = f"{manifest_prefix}-{shard_name(index, count)}"
+            summary_path = f"{shard_prefix}.summary.json"
+            if not os.path.exists(summary_path):
+                merged["missing_shards"].append(index)
+            else:
+                with open(summary_path) as file:
+                    for key, value in json.load(file).items():
+                        merged[key] = merged.get(key, 0) + value
+            for record in read_manifest(shard_prefix):
+                writer.write(record)
+    with open(f"{output_prefix}.summary.json", "w") as file:
+        file.write(json.dumps(merged, indent=4))
+    return merged
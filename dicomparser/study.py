@@ -0,0 +1,196 @@
+import os
+import json
+import sqlite3
+from collections import defaultdict
+
+from dicomparser.manifest import dumps, metadata_to_record, read_manifest
+
+
+def _links(record):
+    links = record.get("Instance Links") or {}
+    return (links.get("Study Instance"), links.get("Series Instance"), links.get("Frame of Reference"),
+            list(links.get("Referenced Instances") or []))
+
+
+class StudyIndex:
+    """Parsed instances by SOPInstanceUID, StudyInstanceUID and FrameOfReferenceUID, in memory.
+
+    Records are parse() / manifest records carrying 'Instance Links' (batch adds them
+    with a study index, or see DICOMParser.instance_links). References are resolved
+    with dict lookups, so a study bundle costs one lookup per instance in it, whatever
+    order the files came in.
+    """
+
+    def __init__(self):
+        self.instances = {}  # SOP Instance -> record
+        self.studies = defaultdict(list)  # Study Instance -> [SOP Instance]
+        self.frames = defaultdict(list)  # Frame of Reference -> [SOP Instance]
+        self.references = {}  # SOP Instance -> [referenced SOP Instance]
+        self.referrers = defaultdict(list)  # SOP Instance -> [SOP Instances referencing it]
+
+    def add(self, record, source=None):
+        record = metadata_to_record(record)
+        if source is not None:
+            record["source"] = str(source)
+        sop_instance = record.get("SOP Instance")
+        if not sop_instance or sop_instance == "Unknown":
+            return
+        if sop_instance in self.instances:
+            # Seen before (a copy), keep the first
+            return
+        study, series, frame, referenced = _links(record)
+        self._store(sop_instance, study, series, frame, referenced, record)
+
+    def _store(self, sop_instance, study, series, frame, referenced, record):
+        self.instances[sop_instance] = record
+        if study:
+            self.studies[study].append(sop_instance)
+        if frame:
+            self.frames[frame].append(sop_instance)
+        self.references[sop_instance] = referenced
+        for uid in referenced:
+            self.referrers[uid].append(sop_instance)
+
+    def add_manifest(self, prefix):
+        """Index a manifest written with Instance Links (batch.py --study_index/--bundles)."""
+        for record in read_manifest(prefix):
+            self.add(record)
+
+    def get(self, sop_instance):
+        return self.instances.get(sop_instance)
+
+    def referenced(self, sop_instance):
+        """SOP Instances ds's ReferencedInstanceSequence / ReferencedImageSequence point at."""
+        return self.references.get(sop_instance, [])
+
+    def referenced_by(self, sop_instance):
+        return self.referrers.get(sop_instance, [])
+
+    def study_instances(self, study):
+        return self.studies.get(study, [])
+
+    def frame_instances(self, frame):
+        return self.frames.get(frame, [])
+
+    def study_uids(self):
+        return list(self.studies)
+
+    def resolve(self, sop_instance):
+        """(found records by SOP Instance, missing SOP Instances) for what sop_instance references."""
+        found, missing = {}, []
+        for uid in self.referenced(sop_instance):
+            record = self.get(uid)
+            if record is None:
+                missing.append(uid)
+            else:
+                found[uid] = record
+        return found, missing
+
+    def bundle(self, study):
+        """Everything indexed for one study (a patient visit): its instances with their
+        records, grouped by series and frame of reference, what each references and which of
+        those aren't in the index.
+        """
+        instances = {uid: self.get(uid) for uid in self.study_instances(study)}
+        series, frames, references, missing = defaultdict(list), defaultdict(list), {}, set()
+        for uid, record in instances.items():
+            _, series_uid, frame, _ = _links(record)
+            series[series_uid or "Unknown"].append(uid)
+            if frame:
+                frames[frame].append(uid)
+            referenced = self.referenced(uid)
+            if referenced:
+                references[uid] = referenced
+                missing.update(ref for ref in referenced if self.get(ref) is None)
+        first = next(iter(instances.values()), {})
+        return {
+            "Study Instance": study,
+            "Patient ID": first.get("Patient ID"),
+            "Study Date": first.get("Study Date"),
+            "series": dict(series),
+            "frames of reference": dict(frames),
+            "references": references,
+            "missing references": sorted(missing),
+            "instances": instances,
+        }
+
+    def write_bundles(self, output_folder):
+        """One {Study Instance}.json bundle per study."""
+        if not os.path.exists(output_folder): os.makedirs(output_folder)
+        count = 0
+        for study in self.study_uids():
+            with open(os.path.join(output_folder, f"{study}.json"), "wb") as file:
+                file.write(dumps(self.bundle(study)))
+            count += 1
+        return count
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SQLiteStudyIndex(StudyIndex):
+    """StudyIndex kept in a SQLite file, for corpora that don't fit in memory or to query later.
+
+    Lookups go through the primary key and indexes on study, frame of reference and
+    referenced instance. Reopening the file adds to the same index.
+    """
+
+    def __init__(self, path):
+        folder = os.path.dirname(str(path))
+        if folder and not os.path.exists(folder): os.makedirs(folder)
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS instances (sop TEXT PRIMARY KEY, study TEXT, series TEXT, frame TEXT, record TEXT);
+            CREATE TABLE IF NOT EXISTS refs (sop TEXT, referenced TEXT);
+            CREATE INDEX IF NOT EXISTS instances_study ON instances (study);
+            CREATE INDEX IF NOT EXISTS instances_frame ON instances (frame);
+            CREATE INDEX IF NOT EXISTS refs_sop ON refs (sop);
+            CREATE INDEX IF NOT EXISTS refs_referenced ON refs (referenced);
+        """)
+
+    def _column(self, query, *args):
+        return [row[0] for row in self.db.execute(query, args)]
+
+    def add(self, record, source=None):
+        record = metadata_to_record(record)
+        if source is not None:
+            record["source"] = str(source)
+        sop_instance = record.get("SOP Instance")
+        if not sop_instance or sop_instance == "Unknown" or self.get(sop_instance) is not None:
+            return
+        study, series, frame, referenced = _links(record)
+        self._store(sop_instance, study, series, frame, referenced, record)
+
+    def _store(self, sop_instance, study, series, frame, referenced, record):
+        with self.db:
+            self.db.execute("INSERT INTO instances VALUES (?, ?, ?, ?, ?)",
+                            (sop_instance, study, series, frame, dumps(record).decode('utf-8')))
+            self.db.executemany("INSERT INTO refs VALUES (?, ?)", [(sop_instance, uid) for uid in referenced])
+
+    def get(self, sop_instance):
+        row = self.db.execute("SELECT record FROM instances WHERE sop = ?", (sop_instance,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def referenced(self, sop_instance):
+        return self._column("SELECT referenced FROM refs WHERE sop = ? ORDER BY rowid", sop_instance)
+
+    def referenced_by(self, sop_instance):
+        return self._column("SELECT sop FROM refs WHERE referenced = ? ORDER BY rowid", sop_instance)
+
+    def study_instances(self, study):
+        return self._column("SELECT sop FROM instances WHERE study = ? ORDER BY rowid", study)
+
+    def frame_instances(self, frame):
+        return self._column("SELECT sop FROM instances WHERE frame = ? ORDER BY rowid", frame)
+
+    def study_uids(self):
+        return self._column("SELECT DISTINCT study FROM instances WHERE study IS NOT NULL")
+
+    def close(self):
+        self.db.close()
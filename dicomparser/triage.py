@@ -0,0 +1,140 @@
+import os
+import json
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+from pydicom.filereader import read_partial
+from pydicom.tag import Tag
+
+from dicomparser.archive import input_size, open_input
+from dicomparser.DICOMParser import DICOMParser, OPHTHALMOLOGY_SOP_CLASSES
+
+
+# Everything triage needs sits in groups 0008 and 0028, ahead of any bulk data
+TRIAGE_TAGS = [Tag(keyword) for keyword in ("SpecificCharacterSet", "ManufacturerModelName", "SOPClassUID",
+                                            "SeriesDescription", "NumberOfFrames", "Rows", "Columns")]
+
+
+def _past_image_pixel_module(tag, VR, length):
+    # Stop at the first element after group 0028, so private groups and Pixel Data are never read
+    return tag.group > 0x0028
+
+
+def read_preamble(dicom_path):
+    """Read only the leading elements of one file into a small triage record."""
+    record = {"path": str(dicom_path), "size": None, "model": None, "sop_class": None,
+              "series_description": None, "frames": None, "rows": None, "columns": None, "error": None}
+    try:
+        record["size"] = input_size(dicom_path)
+        with open_input(dicom_path) as file:
+            ds = read_partial(file, stop_when=_past_image_pixel_module, specific_tags=TRIAGE_TAGS)
+        record["model"] = str(ds.get("ManufacturerModelName", "Unknown"))
+        record["sop_class"] = str(ds.get("SOPClassUID", "Unknown"))
+        record["series_description"] = str(ds.get("SeriesDescription", "Unknown"))
+        record["frames"] = int(ds.get("NumberOfFrames", 1) or 1)
+        record["rows"] = ds.get("Rows", None)
+        record["columns"] = ds.get("Columns", None)
+    except Exception as e:
+        record["error"] = repr(e)
+    return record
+
+
+def _read_chunk(paths):
+    return [read_preamble(path) for path in paths]
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def scan(files, workers=None, chunk_size=256):
+    """Yield triage records for files, reading them in chunks across a process pool.
+
+    At most a few chunks per worker are in flight, so the file list can be a lazy walk
+    over millions of paths. Records come back in completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(files, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in islice(chunks, workers * 4):
+            pending.add(executor.submit(_read_chunk, chunk))
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield from future.result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.add(executor.submit(_read_chunk, chunk))
+
+
+class TriageSummary:
+    """Histogram of (Model, SOP Class, Series Description) with byte, frame and shape totals."""
+
+    def __init__(self):
+        self.groups = defaultdict(lambda: {"files": 0, "bytes": 0, "frames": 0, "shapes": Counter()})
+        self.unregistered = defaultdict(list)  # model -> files
+        self.unreadable = []
+
+    def add(self, record):
+        if record["error"] is not None:
+            self.unreadable.append((record["path"], record["error"]))
+            return
+        sop = OPHTHALMOLOGY_SOP_CLASSES.get(record["sop_class"], record["sop_class"])
+        group = self.groups[(record["model"], sop, record["series_description"])]
+        group["files"] += 1
+        group["bytes"] += record["size"] or 0
+        group["frames"] += record["frames"] or 0
+        if record["rows"] is not None:
+            group["shapes"][f"{record['frames']}x{record['rows']}x{record['columns']}"] += 1
+        if record["model"] not in DICOMParser.model_parsers:
+            self.unregistered[record["model"]].append(record["path"])
+
+    def histogram(self):
+        """Rows sorted by file count, largest first."""
+        rows = []
+        for (model, sop, series), group in self.groups.items():
+            rows.append({"Model": model, "SOP Class Description": sop, "Series Description": series,
+                         "files": group["files"], "bytes": group["bytes"], "frames": group["frames"],
+                         "shapes": dict(group["shapes"].most_common(5))})
+        return sorted(rows, key=lambda row: row["files"], reverse=True)
+
+    def to_dict(self):
+        return {
+            "histogram": self.histogram(),
+            "unregistered_models": {model: paths for model, paths in self.unregistered.items()},
+            "unreadable": [{"path": path, "error": error} for path, error in self.unreadable],
+        }
+
+    def print_report(self):
+        print(f"{'files':>9} {'MB':>10} {'frames':>9}  Model | SOP Class | Series Description")
+        for row in self.histogram():
+            print(f"{row['files']:>9} {row['bytes'] / 2**20:>10.1f} {row['frames']:>9}  "
+                  f"{row['Model']} | {row['SOP Class Description']} | {row['Series Description']}")
+        for model, paths in self.unregistered.items():
+            print(f"Unregistered model: {model} ({len(paths)} files)")
+        if self.unreadable:
+            print(f"Unreadable: {len(self.unreadable)} files")
+
+
+def triage(files, workers=None, report=None, unregistered_list=None):
+    """Scan files, print the histogram and optionally write the JSON report and unregistered file list."""
+    summary = TriageSummary()
+    for record in scan(files, workers=workers):
+        summary.add(record)
+    summary.print_report()
+    if report:
+        with open(report, "w") as file:
+            file.write(json.dumps(summary.to_dict(), indent=4))
+    if unregistered_list:
+        with open(unregistered_list, "w") as file:
+            for paths in summary.unregistered.values():
+                for path in paths:
+                    file.write(path + "\n")
+    return summary
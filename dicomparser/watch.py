@@ -0,0 +1,211 @@
+import os
+import json
+import time
+from collections import deque
+
+from dicomparser.batch import _process_task
+from dicomparser.manifest import ManifestWriter, dumps, read_manifest
+from dicomparser.pool import TimeoutPool
+
+# inotify if installed (Linux), polling the spool otherwise
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+
+# Names routers use while a file is still being written
+PARTIAL_SUFFIXES = ('.part', '.partial', '.tmp', '.filepart')
+
+
+def _wanted(name):
+    return not name.startswith('.') and not name.endswith(PARTIAL_SUFFIXES)
+
+
+def _signature(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def scan_folder(folder):
+    """Yield every file under folder."""
+    for root, dirs, files in os.walk(folder):
+        for name in files:
+            if _wanted(name):
+                yield os.path.join(root, name)
+
+
+class PollingSource:
+    """Reports every file under the spool on each scan, at most once per interval seconds."""
+
+    def __init__(self, folder, interval=5.0):
+        self.folder = folder
+        self.interval = interval
+        self.last_scan = None
+
+    def changes(self):
+        now = time.monotonic()
+        if self.last_scan is not None and now - self.last_scan < self.interval:
+            return []
+        self.last_scan = now
+        return scan_folder(self.folder)
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """Reports files closed after writing or moved into the spool (any depth) as they happen."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.inotify = inotify_simple.INotify()
+        self.flags = inotify_simple.flags
+        self.watches = {}  # watch descriptor -> folder
+        self._watch_tree(folder)
+
+    def _watch_tree(self, folder):
+        mask = self.flags.CLOSE_WRITE | self.flags.MOVED_TO | self.flags.CREATE
+        for root, dirs, files in os.walk(folder):
+            try:
+                self.watches[self.inotify.add_watch(root, mask)] = root
+            except OSError as e:
+                print(f"Can't watch {root}: {e!r}")
+
+    def changes(self):
+        changed = []
+        for event in self.inotify.read(timeout=0):
+            folder = self.watches.get(event.wd)
+            if folder is None or not event.name:
+                continue
+            path = os.path.join(folder, event.name)
+            if event.mask & self.flags.ISDIR:
+                if event.mask & (self.flags.CREATE | self.flags.MOVED_TO):
+                    # New sub folder: watch it, and pick up what landed before the watch did
+                    self._watch_tree(path)
+                    changed.extend(scan_folder(path))
+            elif _wanted(event.name):
+                changed.append(path)
+        return changed
+
+    def close(self):
+        self.inotify.close()
+
+
+class SettleTracker:
+    """Hold files until their size and mtime have not changed for settle seconds.
+
+    processed maps path -> (size, mtime) once handed out (None when only the path is
+    known, e.g. from an earlier manifest), so a file is picked up again only if it is
+    rewritten.
+    """
+
+    def __init__(self, settle=2.0, processed=None):
+        self.settle = settle
+        self.processed = processed if processed is not None else {}
+        self.pending = {}  # path -> ((size, mtime), unchanged since)
+
+    def touch(self, path):
+        try:
+            signature = _signature(path)
+        except OSError:
+            return
+        done = self.processed.get(path, False)
+        if done is None or done == signature:
+            return
+        if path not in self.pending or self.pending[path][0] != signature:
+            self.pending[path] = (signature, time.monotonic())
+
+    def ready(self):
+        """Pop and yield the files that have settled."""
+        now = time.monotonic()
+        for path, (signature, since) in list(self.pending.items()):
+            try:
+                current = _signature(path)
+            except OSError:
+                del self.pending[path]
+                continue
+            if current != signature:
+                self.pending[path] = (current, now)
+            elif now - since >= self.settle:
+                del self.pending[path]
+                self.processed[path] = signature
+                yield path
+
+
+def read_jsonl(path):
+    with open(path, 'rb') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def watch(spool, output_folder=None, manifest=None, manifest_gzip=False, write_dicom_header=False,
+          workers=None, timeout=None, quarantine=None, settle=2.0, interval=5.0, poll=None,
+          tick=0.2, stop=None):
+    """Process files as they land in spool until interrupted (or until stop() returns True).
+
+    New files are found with inotify when inotify_simple is installed (poll=True forces
+    rescanning the spool every interval seconds), wait until unchanged for settle
+    seconds, then go to a pool of worker processes started once up front. Each result
+    is appended to the manifest and flushed right away. Files already in the manifest
+    or quarantine are skipped on restart.
+    """
+    manifest_writer = ManifestWriter(manifest, compress=manifest_gzip) if manifest else None
+    processed = {}
+    if manifest:
+        for record in read_manifest(manifest):
+            if record.get("source"):
+                processed[record["source"]] = None
+    if quarantine and os.path.exists(quarantine):
+        # Nor are files that already failed
+        for record in read_jsonl(quarantine):
+            processed[record["source"]] = None
+    use_polling = poll if poll is not None else inotify_simple is None
+    source = PollingSource(spool, interval) if use_polling else InotifySource(spool)
+    tracker = SettleTracker(settle, processed)
+    if not use_polling:
+        # Files already waiting in the spool
+        for path in scan_folder(spool):
+            tracker.touch(path)
+    quarantine_file = open(quarantine, 'ab') if quarantine else None
+    pool = TimeoutPool(_process_task, workers=workers, timeout=timeout)
+    pool.start()
+    queue = deque()
+    summary = {"done": 0, "failed": 0}
+    print(f"Watching {spool} ({'polling' if use_polling else 'inotify'}, {pool.workers} workers)")
+    try:
+        while stop is None or not stop():
+            for path in source.changes():
+                tracker.touch(path)
+            queue.extend(tracker.ready())
+            while queue and pool.free():
+                pool.submit((queue.popleft(), output_folder, write_dicom_header, False, False))
+            if not pool.pending():
+                time.sleep(tick)
+                continue
+            for task, status, result, stage in pool.poll(timeout=tick):
+                dicom_file = task[0]
+                if status != "done":
+                    print(f"Failed ({status} in {stage}): {dicom_file}")
+                    print(result)
+                    if quarantine_file is not None:
+                        quarantine_file.write(dumps({"source": str(dicom_file), "status": status,
+                                                     "stage": stage, "error": result}) + b'\n')
+                        quarantine_file.flush()
+                    summary["failed"] += 1
+                    continue
+                if manifest_writer is not None:
+                    manifest_writer.write_metadata(result, source=str(dicom_file))
+                    manifest_writer.flush()
+                summary["done"] += 1
+    except KeyboardInterrupt:
+        print("Stopping")
+    finally:
+        pool.close()
+        source.close()
+        if manifest_writer is not None:
+            manifest_writer.close()
+        if quarantine_file is not None:
+            quarantine_file.close()
+    return summary
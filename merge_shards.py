@@ -0,0 +1,28 @@
+from dicomparser.shard import merge_shards
+import argparse
+
+
+def parse_args():
+    """Parse command line arguments for merging the outputs of a sharded batch run."""
+    parser = argparse.ArgumentParser(description='Merge per-shard manifests and summaries of batch.py --shard runs.')
+
+    parser.add_argument('--manifest', '-m', required=True,
+                        help='Manifest prefix given to batch.py on every node')
+    parser.add_argument('--shards', '-n', type=int, required=True,
+                        help='Number of shards N used in --shard i/N')
+    parser.add_argument('--output', '-o', required=True,
+                        help='Prefix of the merged manifest (summary goes to {output}.summary.json)')
+    parser.add_argument('--manifest_gzip', action='store_true',
+                        help='Write the merged manifest as .jsonl.gz')
+
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    merged = merge_shards(args.manifest, args.shards, args.output, compress=args.manifest_gzip)
+    if merged["missing_shards"]:
+        print(f"Missing shards: {merged['missing_shards']}")
+    print(f"Done: {merged.get('done', 0)} parsed, {merged.get('failed', 0)} failed")
+
+if __name__ == "__main__":
+    main()
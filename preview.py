@@ -1,4 +1,5 @@
 from dicomparser import DICOMParser
+from dicomparser.manifest import ManifestWriter
 import argparse
 
 
@@ -11,6 +12,14 @@ def parse_args():
     # Add required arguments
     parser.add_argument('--output_folder', '-o', required=True, 
                         help='Path to the output folder')
+    # Optional corpus manifest
+    parser.add_argument('--manifest', '-m', default=None,
+                        help='Prefix of a rotating .jsonl manifest to append a record for this file to')
+    parser.add_argument('--manifest_gzip', action='store_true',
+                        help='Write the manifest as .jsonl.gz')
+    # Full header dump next to the preview
+    parser.add_argument('--write_dicom_header', choices=['text', 'json'], default=None,
+                        help='Also write the whole header as text or as the DICOM JSON model (bulk values referenced, not written)')
 
     return parser.parse_args()
 
@@ -24,7 +33,11 @@ def main():
     dicom_file = args.input_file
     output_folder = args.output_folder
     parser = DICOMParser.create_parser(dicom_file) # Factory method selects subclass
-    parser.preview(output_folder)
+    write_dicom_header = {'text': True, 'json': 'json'}.get(args.write_dicom_header, False)
+    metadata = parser.preview(output_folder, write_dicom_header=write_dicom_header)
+    if args.manifest:
+        with ManifestWriter(args.manifest, compress=args.manifest_gzip) as manifest:
+            manifest.write_metadata(metadata, source=str(dicom_file))
     print('Done')
 
 if __name__ == "__main__":
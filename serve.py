@@ -0,0 +1,30 @@
+from dicomparser.server import serve
+import argparse
+
+
+def parse_args():
+    """Parse command line arguments for the preview server."""
+    parser = argparse.ArgumentParser(description='Serve B-scans, en face images, photos and PDF pages, rendered on first request.')
+
+    parser.add_argument('--root', '-r', required=True,
+                        help='Folder with the DICOM files to serve')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Interface to listen on (default: local only)')
+    parser.add_argument('--port', '-p', type=int, default=8000,
+                        help='Port to listen on')
+    parser.add_argument('--cache_mb', type=int, default=256,
+                        help='Memory budget for rendered images in MB')
+    parser.add_argument('--cache_folder', default=None,
+                        help='Folder to keep rendered images in once out of memory (omit for memory only)')
+    parser.add_argument('--cache_disk_mb', type=int, default=2048,
+                        help='Disk budget for --cache_folder in MB')
+
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    serve(args.root, host=args.host, port=args.port, cache_bytes=args.cache_mb * 2**20,
+          cache_folder=args.cache_folder, cache_disk_bytes=args.cache_disk_mb * 2**20)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import io
+
+import numpy as np
+from pydicom.dataset import Dataset, FileMetaDataset
+from pydicom.sequence import Sequence
+from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+
+from dicomparser.DICOMParser import DICOMParser
+
+
+SPATIAL_REGISTRATION = '1.2.840.10008.5.1.4.1.1.66'
+OCT = '1.2.840.10008.5.1.4.1.1.77.1.5.4'
+SLICES, ROWS, COLUMNS = 3, 64, 256  # 32 KB slices, over the parser's defer_size
+
+
+def raster_bytes():
+    # CIRRUS HD-OCT 5000 'RASTER_21_LINES' with its slices in nested sequences
+    ds = Dataset()
+    ds.file_meta = FileMetaDataset()
+    ds.file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
+    ds.file_meta.MediaStorageSOPClassUID = SPATIAL_REGISTRATION
+    ds.SOPClassUID = SPATIAL_REGISTRATION
+    ds.SOPInstanceUID = ds.file_meta.MediaStorageSOPInstanceUID = generate_uid()
+    ds.Manufacturer = 'Carl Zeiss Meditec'
+    ds.ManufacturerModelName = 'CIRRUS HD-OCT 5000'
+    ds.Modality = 'OPT'
+    ds.PatientID = 'P1'
+    ds.PatientName = 'Test^Patient'
+    ds.StudyDate = '20240101'
+    ds.SeriesDescription = 'RASTER_21_LINES'
+    ds.AcquisitionContextSequence = [Dataset()]
+    ds.add_new((0x2201, 0x0010), 'LO', 'ZEISS')
+    ds.add_new((0x2201, 0x1000), 'LO', 'abc')
+    ds.add_new((0x2201, 0x1002), 'LO', 'def')
+    ds.add_new((0x0407, 0x0010), 'LO', 'ZEISS')
+    for element in (0x10a3, 0x10a5, 0x10a6, 0x10b5):
+        item = Dataset()
+        item.add_new((0x0407, 0x0010), 'LO', 'ZEISS')
+        item.add_new((0x0407, 0x100e), 'LO', f'layer {element:x}')
+        item.add_new((0x0407, 0x101c), 'UI', OCT)
+        slices = []
+        for i in range(SLICES):
+            slice = Dataset()
+            slice.add_new((0x0407, 0x0010), 'LO', 'ZEISS')
+            slice.add_new((0x0407, 0x1006), 'OB', np.full((ROWS, COLUMNS), i, dtype='<u2').tobytes())
+            slices.append(slice)
+        item.add_new((0x0407, 0x1005), 'SQ', Sequence(slices))
+        ds.add_new((0x0407, element), 'SQ', Sequence([item]))
+    buffer = io.BytesIO()
+    ds.save_as(buffer, enforce_file_format=True)
+    return buffer.getvalue()
+
+
+def test_file_object_reread_after_deferred_loads(tmp_path):
+    # Loading the deferred slices must leave the caller's file object where it was,
+    # the header dump and a second create_parser read it again
+    prefix = b'\0' * 100
+    file = io.BytesIO(prefix + raster_bytes())
+    file.seek(len(prefix))
+    parser = DICOMParser.create_parser(file)
+    metadata = parser.parse(private_arrays=True)
+    stack = metadata['private_arrays']['(0x0407, 0x10a3)']
+    assert stack.shape == (SLICES, ROWS * COLUMNS)
+    assert [int(row[0]) for row in stack] == list(range(SLICES))
+    assert file.tell() == len(prefix)
+
+    parser.preview(tmp_path, write_dicom_header=True, private_arrays=True)
+    assert (tmp_path / f"{parser.sop_instance}.txt").exists()
+    assert file.tell() == len(prefix)
+    assert DICOMParser.create_parser(file).sop_instance == parser.sop_instance
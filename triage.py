@@ -0,0 +1,34 @@
+from dicomparser.batch import iter_input_files
+from dicomparser.triage import triage
+import argparse
+
+
+def parse_args():
+    """Parse command line arguments for a header-only scan of an export."""
+    parser = argparse.ArgumentParser(description='Histogram models, SOP classes and sizes of a DICOM export without parsing it.')
+
+    parser.add_argument('--input_folder', '-i', default=None,
+                        help='Folder to walk recursively for input files')
+    parser.add_argument('--input_list', '-l', default=None,
+                        help='Text file with one input path per line')
+    parser.add_argument('--archives', '-a', action='store_true',
+                        help='Read the members of zip/tar files found in the inputs, without extracting them')
+    parser.add_argument('--report', '-r', default=None,
+                        help='Path to write the histogram and file lists as JSON')
+    parser.add_argument('--unregistered', '-u', default=None,
+                        help='Path to write files whose model has no registered parser, one per line')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='Number of worker processes (default: CPU count)')
+
+    args = parser.parse_args()
+    if not args.input_folder and not args.input_list:
+        parser.error('one of --input_folder or --input_list is required')
+    return args
+
+def main():
+    args = parse_args()
+    files = iter_input_files(args.input_folder, args.input_list, archives=args.archives)
+    triage(files, workers=args.workers, report=args.report, unregistered_list=args.unregistered)
+
+if __name__ == "__main__":
+    main()
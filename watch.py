@@ -0,0 +1,44 @@
+from dicomparser.watch import watch
+import argparse
+
+
+def parse_args():
+    """Parse command line arguments for watching a spool folder."""
+    parser = argparse.ArgumentParser(description='Parse and preview DICOM files as they arrive in a spool folder.')
+
+    parser.add_argument('--spool', '-s', required=True,
+                        help='Folder the PACS router writes into (watched recursively)')
+    parser.add_argument('--output_folder', '-o', default=None,
+                        help='Path to the preview output folder (omit to only parse)')
+    parser.add_argument('--manifest', '-m', default=None,
+                        help='Prefix of a rotating .jsonl manifest, also used to skip files already done on restart')
+    parser.add_argument('--manifest_gzip', action='store_true',
+                        help='Write the manifest as .jsonl.gz')
+    parser.add_argument('--write_dicom_header', choices=['text', 'json'], default=None,
+                        help='Also write each whole header as text or as the DICOM JSON model (bulk values referenced, not written)')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='Number of worker processes kept running (default: CPU count)')
+    parser.add_argument('--timeout', '-t', type=float, default=None,
+                        help='Seconds a file may take before its worker is killed and replaced')
+    parser.add_argument('--quarantine', '-q', default=None,
+                        help='JSON Lines file to append failed/timed out files to, with the error and stage')
+    parser.add_argument('--settle', type=float, default=2.0,
+                        help='Seconds a file must stay unchanged before it is processed')
+    parser.add_argument('--poll', action='store_true',
+                        help='Rescan the spool instead of using inotify (network filesystems)')
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help='Seconds between rescans with --poll or without inotify_simple')
+
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    summary = watch(args.spool, output_folder=args.output_folder,
+                    manifest=args.manifest, manifest_gzip=args.manifest_gzip,
+                    write_dicom_header={'text': True, 'json': 'json'}.get(args.write_dicom_header, False),
+                    workers=args.workers, timeout=args.timeout, quarantine=args.quarantine,
+                    settle=args.settle, interval=args.interval, poll=args.poll or None)
+    print(f"Done: {summary['done']} parsed, {summary['failed']} failed")
+
+if __name__ == "__main__":
+    main()